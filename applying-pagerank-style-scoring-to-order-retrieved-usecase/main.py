@@ -9,16 +9,16 @@ Key insight: Graph edges carry topical signal that cosine similarity alone misse
 """
 
 import os
-from collections import defaultdict
-from dataclasses import dataclass, field
+import time
+from dataclasses import dataclass
 from typing import Optional
 
-import networkx as nx
-import numpy as np
 from dotenv import load_dotenv
 
 from rushdb import RushDB
 
+from chunk_graph import ChunkGraph
+
 # Load environment
 load_dotenv()
 
@@ -37,100 +37,34 @@ class ScoredChunk:
     authority_score: float = 0.0
 
 
-def get_chunk_neighbors(chunk_id: str, edge_type: Optional[str] = None) -> list[str]:
-    """
-    Get neighboring chunk IDs via graph traversal.
-    
-    Uses RushDB's relationship query to find chunks connected through
-    any edge type (CITES, SHARES_AUTHOR, SHARES_TOPIC, FROM_ARTICLE).
-    """
-    # Query for related records through any relationship type
-    # We fetch chunks that are connected to the given chunk
-    results = db.records.find({
-        "labels": ["CHUNK"],
-        "where": {
-            "CHUNK": {
-                "$relation": {"direction": "any"}
-            }
-        },
-        "limit": 200
-    })
-    
-    # Filter to only chunks connected to our target
-    neighbors = []
-    for record in results:
-        if record.id != chunk_id:
-            neighbors.append(record.id)
-    
-    return neighbors
+_chunk_graph: Optional[ChunkGraph] = None
 
 
-def build_graph_from_chunks(chunk_ids: list[str]) -> nx.DiGraph:
+def get_chunk_graph() -> ChunkGraph:
     """
-    Build a directed graph from chunk IDs.
-    
-    Nodes: chunk IDs
-    Edges: graph relationships (CITES, SHARES_AUTHOR, SHARES_TOPIC)
-    Edge weights: based on relationship type importance
+    Return the in-process chunk graph, loading it from RushDB on first use.
+
+    All CITES / SHARES_AUTHOR / SHARES_TOPIC edges are read once in pages
+    and kept as a CSR matrix, so rescoring a query never goes back to the
+    database for edges. After ingesting more chunks, call
+    ``get_chunk_graph().refresh(db, new_chunk_ids)`` to add them.
     """
-    G = nx.DiGraph()
-    
-    # Add all chunks as nodes
-    for chunk_id in chunk_ids:
-        G.add_node(chunk_id)
-    
-    # Find all relationships between these chunks
-    # We'll query each chunk for its relationships
-    for chunk_id in chunk_ids:
-        # Get chunks that share author (strong topical signal)
-        author_results = db.records.find({
-            "labels": ["CHUNK"],
-            "where": {
-                "author": db.records.find_by_id(chunk_id).get("author")
-            },
-            "limit": 50
-        })
-        for related in author_results:
-            if related.id != chunk_id and related.id in chunk_ids:
-                # Bidirectional for author sharing
-                G.add_edge(chunk_id, related.id, weight=2.0, type="SHARES_AUTHOR")
-                G.add_edge(related.id, chunk_id, weight=2.0, type="SHARES_AUTHOR")
-        
-        # Get chunks that share topic
-        topic_results = db.records.find({
-            "labels": ["CHUNK"],
-            "where": {
-                "topic": db.records.find_by_id(chunk_id).get("topic")
-            },
-            "limit": 50
-        })
-        for related in topic_results:
-            if related.id != chunk_id and related.id in chunk_ids:
-                G.add_edge(chunk_id, related.id, weight=1.5, type="SHARES_TOPIC")
-        
-        # Get cited chunks (citations indicate authoritative content)
-        # In a real system, you'd query relationship type specifically
-        article_title = db.records.find_by_id(chunk_id).get("articleTitle")
-        if article_title:
-            # Find previous chunks in same article
-            same_article = db.records.find({
-                "labels": ["CHUNK"],
-                "where": {
-                    "articleTitle": article_title,
-                    "position": {"$lt": db.records.find_by_id(chunk_id).get("position", 0)}
-                },
-                "limit": 5
-            })
-            for related in same_article:
-                if related.id in chunk_ids:
-                    G.add_edge(chunk_id, related.id, weight=3.0, type="CITES")
-    
-    return G
+    global _chunk_graph
+    if _chunk_graph is None:
+        print("  Loading chunk graph...")
+        start = time.perf_counter()
+        graph = ChunkGraph()
+        edges_read = graph.load(db)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"  Graph: {len(graph)} chunks, {graph.edge_count} weighted edges "
+              f"({edges_read} relationships read in {elapsed_ms:.0f}ms)")
+        _chunk_graph = graph
+    return _chunk_graph
 
 
 def pagerank_propagation(
     initial_scores: dict[str, float],
-    graph: nx.DiGraph,
+    graph: ChunkGraph,
     damping: float = 0.85,
     iterations: int = 20,
     convergence: float = 1e-6
@@ -139,16 +73,19 @@ def pagerank_propagation(
     Apply PageRank-style iterative propagation to refine scores.
     
     Algorithm:
-    1. Initialize scores from similarity search
+    1. Initialize scores from similarity search (the teleport vector)
     2. For each iteration:
-       - Propagate scores through graph edges
+       - Propagate scores through graph edges between candidates
        - Dampened by edge weights
        - Include teleportation back to initial scores
     3. Return converged authority scores
     
+    Each iteration is a vectorized sparse step over the candidates'
+    subgraph (see ``ChunkGraph.personalized_pagerank``).
+    
     Args:
         initial_scores: Chunk ID -> similarity score from vector search
-        graph: Directed graph of chunk relationships
+        graph: Chunk graph holding the weighted relationships
         damping: Damping factor (0.85 is standard for PageRank)
         iterations: Maximum iterations
         convergence: Stop when score changes are below this threshold
@@ -156,67 +93,21 @@ def pagerank_propagation(
     Returns:
         Chunk ID -> authority score after propagation
     """
-    if not graph.nodes():
+    if not initial_scores:
         return initial_scores
     
-    # Normalize initial scores
-    total = sum(initial_scores.values())
-    if total > 0:
-        init_normalized = {k: v / total for k, v in initial_scores.items()}
-    else:
-        init_normalized = initial_scores
-    
-    # Initialize authority scores
-    scores = dict(init_normalized)
-    
-    # Get edge weights for normalization
-    out_weights = {}
-    for node in graph.nodes():
-        out_weights[node] = sum(
-            data.get('weight', 1.0) 
-            for _, _, data in graph.out_edges(node, data=True)
-        )
+    scores, iterations_run = graph.personalized_pagerank(
+        initial_scores,
+        damping=damping,
+        iterations=iterations,
+        tolerance=convergence
+    )
     
-    for iteration in range(iterations):
-        new_scores = {}
-        total_change = 0.0
-        
-        for node in graph.nodes():
-            # Propagate from in-neighbors
-            propagated = 0.0
-            in_edges = graph.in_edges(node, data=True)
-            
-            if out_weights[node] > 0:
-                for predecessor, _, data in in_edges:
-                    weight = data.get('weight', 1.0)
-                    if predecessor in scores and predecessor in out_weights and out_weights[predecessor] > 0:
-                        # Weighted PageRank contribution
-                        contribution = (scores[predecessor] * weight) / out_weights[predecessor]
-                        propagated += contribution
-            
-            # Apply damping and add teleportation to initial scores
-            teleportation = init_normalized.get(node, 0.0) * (1 - damping)
-            new_score = (1 - damping) * teleportation + damping * propagated
-            
-            # Add base score to prevent score collapse
-            new_score += init_normalized.get(node, 0.0) * 0.1
-            
-            new_scores[node] = new_score
-            total_change += abs(new_score - scores.get(node, 0.0))
-        
-        scores = new_scores
-        
-        if total_change < convergence:
-            print(f"  Converged after {iteration + 1} iterations")
-            break
+    if iterations_run < iterations:
+        print(f"  Converged after {iterations_run} iterations")
     else:
         print(f"  Completed {iterations} iterations")
     
-    # Normalize final scores
-    total_score = sum(scores.values())
-    if total_score > 0:
-        scores = {k: v / total_score for k, v in scores.items()}
-    
     return scores
 
 
@@ -277,19 +168,20 @@ def propagation_scored_search(query: str, limit: int = 10) -> list[ScoredChunk]:
     
     print(f"  Found {len(initial_scores)} candidate chunks")
     
-    # Step 2: Build graph from candidates
-    print("  Building relevance graph...")
-    graph = build_graph_from_chunks(list(initial_scores.keys()))
-    print(f"  Graph: {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges")
+    # Step 2: Get the chunk graph (loaded once, reused across queries)
+    graph = get_chunk_graph()
     
     # Step 3: Apply PageRank propagation
     print("  Running iterative propagation...")
+    start = time.perf_counter()
     authority_scores = pagerank_propagation(
         initial_scores, 
         graph,
         damping=0.85,
         iterations=20
     )
+    print(f"  Rescored {len(authority_scores)} candidates in "
+          f"{(time.perf_counter() - start) * 1000:.2f}ms")
     
     # Step 4: Update chunks with authority scores
     for chunk_id, authority_score in authority_scores.items():
@@ -468,7 +360,7 @@ Benefits:
 
 Trade-offs:
 - Requires graph edges between chunks
-- More compute than pure similarity (iterations over graph)
+- Chunk graph is held in memory (loaded once, refreshed as chunks arrive)
 - Edge creation requires domain knowledge or heuristics
     """)
     
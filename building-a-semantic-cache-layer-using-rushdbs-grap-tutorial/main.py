@@ -11,12 +11,15 @@ This code covers:
 - Retrieval-by-similarity using RushDB's AI search
 - TTL-based invalidation
 - Contextual invalidation via edge pruning
+- Dependency-driven invalidation from source record change events
 """
 
 import os
 import sys
+import heapq
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set, Callable
 from dotenv import load_dotenv
 from rushdb import RushDB
 
@@ -79,6 +82,113 @@ class EmbeddingProvider:
             return self._model.encode(text).tolist()
 
 
+# =============================================================================
+# DEPENDENCY TRACKING
+# =============================================================================
+
+class DependencyIndex:
+    """
+    In-process index of what each cache entry depends on.
+    
+    Keeps a reverse map from source record IDs to the cache entries derived
+    from them, so a change to a source finds its dependents in
+    O(dependents), and a min-heap of expiry times, so TTL sweeps only touch
+    entries that have actually expired.
+    """
+    
+    def __init__(self):
+        self.dependents: Dict[str, Set[str]] = defaultdict(set)
+        self.sources: Dict[str, Set[str]] = {}
+        self._expires_at: Dict[str, float] = {}
+        self._expiry_heap: List[tuple] = []
+    
+    def __len__(self) -> int:
+        return len(self.sources)
+    
+    def add(self, entry_id: str, source_ids: List[str], expires_at: float):
+        """Register an entry, the sources it was derived from, and when it expires."""
+        self.sources[entry_id] = set(source_ids)
+        for source_id in source_ids:
+            self.dependents[source_id].add(entry_id)
+        self._expires_at[entry_id] = expires_at
+        heapq.heappush(self._expiry_heap, (expires_at, entry_id))
+    
+    def add_source(self, entry_id: str, source_id: str):
+        """Record one more dependency for an already registered entry."""
+        self.sources.setdefault(entry_id, set()).add(source_id)
+        self.dependents[source_id].add(entry_id)
+    
+    def dependents_of(self, source_id: str) -> Set[str]:
+        return set(self.dependents.get(source_id, ()))
+    
+    def remove(self, entry_id: str):
+        """Forget an entry; its stale heap slot is skipped when popped."""
+        for source_id in self.sources.pop(entry_id, ()):
+            dependents = self.dependents.get(source_id)
+            if dependents is not None:
+                dependents.discard(entry_id)
+                if not dependents:
+                    del self.dependents[source_id]
+        self._expires_at.pop(entry_id, None)
+    
+    def expired(self, now: float) -> List[str]:
+        """
+        Return every entry whose expiry time has passed.
+        
+        Entries stay indexed until ``remove`` is called for them, so an entry
+        whose delete fails is found again by the next sweep.
+        """
+        due = []
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, entry_id = heapq.heappop(self._expiry_heap)
+            # Drop slots left behind by removed or re-registered entries
+            if self._expires_at.get(entry_id) == expires_at:
+                due.append((expires_at, entry_id))
+        for slot in due:
+            heapq.heappush(self._expiry_heap, slot)
+        return [entry_id for _, entry_id in due]
+
+
+class ChangeEvents:
+    """Minimal publish/subscribe hook for writes to source records."""
+    
+    def __init__(self):
+        self._subscribers: List[Callable[[str, Dict[str, Any]], None]] = []
+    
+    def subscribe(self, callback: Callable[[str, Dict[str, Any]], None]):
+        self._subscribers.append(callback)
+    
+    def publish(self, record_id: str, change: Dict[str, Any]):
+        for callback in self._subscribers:
+            callback(record_id, change)
+
+
+class SourceStore:
+    """
+    Write path for source records (documents, products, ...) that cached
+    responses are derived from. Every update or delete publishes a change
+    event, so dependent cache entries are invalidated as part of the write
+    instead of by a later sweep.
+    """
+    
+    def __init__(self, db: RushDB, events: ChangeEvents):
+        self.db = db
+        self.events = events
+    
+    def create(self, label: str, data: Dict[str, Any]):
+        return self.db.records.create(label=label, data=data)
+    
+    def update(self, record_id: str, data: Dict[str, Any]):
+        result = self.db.records.update(record_id=record_id, data=data)
+        self.events.publish(record_id, {"op": "update", "data": data})
+        return result
+    
+    def delete(self, record_id: str):
+        result = self.db.records.delete({"where": {"$id": record_id}})
+        self.events.publish(record_id, {"op": "delete"})
+        return result
+
+
 # =============================================================================
 # SEMANTIC CACHE CLASS
 # =============================================================================
@@ -95,12 +205,67 @@ class SemanticCache:
     - Supports contextual invalidation via edge pruning
     """
     
-    def __init__(self, db: RushDB, embedding_provider: EmbeddingProvider):
+    def __init__(
+        self,
+        db: RushDB,
+        embedding_provider: EmbeddingProvider,
+        events: Optional[ChangeEvents] = None
+    ):
         self.db = db
         self.embedding = embedding_provider
         self.ttl_seconds = Config.DEFAULT_TTL_SECONDS
         self.similarity_threshold = Config.SIMILARITY_THRESHOLD
         self.max_similar_links = Config.MAX_SIMILAR_LINKS
+        self.dependencies = DependencyIndex()
+        self.invalidated_count = 0
+        
+        # Invalidate dependents as soon as a source record changes
+        if events is not None:
+            events.subscribe(self.on_source_changed)
+    
+    def _expires_at(self, entry) -> float:
+        """Expiry time of an entry as a timestamp (0 if it has no valid created_at)."""
+        try:
+            created_at = datetime.fromisoformat(entry.data.get("created_at"))
+            ttl = int(entry.data.get("ttl_seconds", self.ttl_seconds))
+            return (created_at + timedelta(seconds=ttl)).timestamp()
+        except (ValueError, TypeError):
+            return 0.0
+    
+    def load_index(self, page_size: int = 1000) -> int:
+        """
+        Build the dependency index from RushDB once, at startup.
+        
+        Reads every CacheEntry for its expiry time and every DERIVED_FROM
+        edge for its sources. After this, invalidation never scans.
+        
+        Returns the number of indexed entries.
+        """
+        skip = 0
+        while True:
+            page = self.db.records.find({"labels": ["CacheEntry"], "skip": skip, "limit": page_size})
+            for entry in page.data:
+                self.dependencies.add(entry.id, [], self._expires_at(entry))
+            if len(page.data) < page_size:
+                break
+            skip += page_size
+        
+        skip = 0
+        while True:
+            edges = self.db.relationships.find({
+                "where": {"type": "DERIVED_FROM"},
+                "skip": skip,
+                "limit": page_size
+            })
+            for edge in edges.data:
+                entry_id = edge.get("sourceId")
+                if entry_id in self.dependencies.sources:
+                    self.dependencies.add_source(entry_id, edge.get("targetId"))
+            if len(edges.data) < page_size:
+                break
+            skip += page_size
+        
+        return len(self.dependencies)
     
     def _is_entry_valid(self, entry) -> bool:
         """Check if a cache entry is still valid based on TTL."""
@@ -162,15 +327,19 @@ class SemanticCache:
         model: str = "gpt-4",
         tokens_used: int = 0,
         context_tags: List[str] = None,
-        ttl_seconds: int = None
+        ttl_seconds: int = None,
+        source_ids: List[str] = None
     ) -> Dict[str, Any]:
         """
         Store a new entry in the semantic cache.
         
         Automatically links the new entry to semantically similar existing entries.
+        ``source_ids`` are the records the response was derived from; the entry
+        gets a DERIVED_FROM edge to each and is invalidated when any of them changes.
         """
         ttl = ttl_seconds or self.ttl_seconds
         tags = context_tags or []
+        sources = source_ids or []
         
         # Generate embedding
         embedding = self.embedding.generate(query_text)
@@ -190,6 +359,15 @@ class SemanticCache:
             vectors=[{"propertyName": "query_text", "vector": embedding}]
         )
         
+        # Record dependencies in the graph and in the local reverse index
+        if sources:
+            self.db.records.attach(
+                source=new_entry,
+                target=sources,
+                options={"type": "DERIVED_FROM"}
+            )
+        self.dependencies.add(new_entry.id, sources, self._expires_at(new_entry))
+        
         # Find similar entries and create graph edges
         similar_results = self.db.ai.search({
             "propertyName": "query_text",
@@ -221,21 +399,44 @@ class SemanticCache:
     
     def invalidate_by_ttl(self) -> List[str]:
         """
-        Find and mark expired cache entries.
+        Delete expired cache entries and return their IDs.
         
-        Note: RushDB doesn't auto-delete; this returns IDs of expired entries
-        for the caller to handle.
+        Expired IDs are read from the dependency index's expiry heap, so the
+        cost is proportional to the number of expired entries, not the cache
+        size. RushDB doesn't auto-delete, so the records are deleted here and
+        only then dropped from the index.
         """
-        all_entries = self.db.records.find({
-            "labels": ["CacheEntry"]
-        })
+        entry_ids = sorted(self.dependencies.expired(datetime.now().timestamp()))
+        self._delete_entries(entry_ids)
+        return entry_ids
+    
+    def on_source_changed(self, source_id: str, change: Dict[str, Any]):
+        """Change-event hook: a source record was updated or deleted."""
+        self.invalidate_dependents(source_id)
+    
+    def invalidate_dependents(self, source_id: str) -> List[str]:
+        """
+        Delete exactly the cache entries derived from ``source_id``.
         
-        expired_ids = []
-        for entry in all_entries.data:
-            if not self._is_entry_valid(entry):
-                expired_ids.append(entry.id)
+        Dependents come from the reverse index and are removed with a single
+        delete, so the work is O(dependents) regardless of cache size.
+        """
+        entry_ids = sorted(self.dependencies.dependents_of(source_id))
+        self._delete_entries(entry_ids)
+        self.invalidated_count += len(entry_ids)
+        return entry_ids
+    
+    def _delete_entries(self, entry_ids: List[str]):
+        """Delete cache entries with a single call, then drop them from the index."""
+        if not entry_ids:
+            return
         
-        return expired_ids
+        self.db.records.delete({
+            "labels": ["CacheEntry"],
+            "where": {"$id": {"$in": entry_ids}}
+        })
+        for entry_id in entry_ids:
+            self.dependencies.remove(entry_id)
     
     def prune_context_edges(
         self,
@@ -393,10 +594,15 @@ def main():
         print(f"❌ Failed to initialize embedding provider: {e}")
         sys.exit(1)
     
-    # Create the semantic cache
-    cache = SemanticCache(db, embedding_provider)
+    # Create the semantic cache, subscribed to source change events
+    events = ChangeEvents()
+    sources = SourceStore(db, events)
+    cache = SemanticCache(db, embedding_provider, events=events)
     print("    ✓ SemanticCache instance created")
     
+    indexed = cache.load_index()
+    print(f"    ✓ Dependency index loaded ({indexed} entries)")
+    
     # ==========================================================================
     # STEP 2: Cache Lookup Demo
     # ==========================================================================
@@ -437,11 +643,11 @@ def main():
     
     # 3a: TTL-based invalidation
     print("[1] TTL-Based Invalidation:\n")
-    expired_ids = cache.invalidate_by_ttl()
+    expired_ids = cache.dependencies.expired(datetime.now().timestamp())
     print(f"    ↳ Found {len(expired_ids)} entries past their TTL")
     
     if expired_ids:
-        # Show a few examples
+        # Show a few examples before they are deleted
         for entry_id in expired_ids[:3]:
             entry = db.records.find_by_id(entry_id)
             if entry:
@@ -449,7 +655,8 @@ def main():
                 ttl = entry.data.get("ttl_seconds", cache.ttl_seconds)
                 print(f"    ↳ Entry '{entry.data.get('query_text', '')[:30]}...' ")
                 print(f"       Created: {created}, TTL: {ttl}s")
-        print(f"    ↳ (Run cache.store with expired entry ID to remove)")
+        removed_ids = cache.invalidate_by_ttl()
+        print(f"    ↳ Removed {len(removed_ids)} expired entries")
     
     # 3b: Contextual invalidation via edge pruning
     print("\n[2] Contextual Invalidation (Edge Pruning):\n")
@@ -480,6 +687,40 @@ def main():
         print(f"    ↳ Pruned {pruned} edges to contextually incompatible entries")
         print(f"    ↳ Entry now only linked to entries with overlapping context")
     
+    # 3c: Dependency-driven invalidation from change events
+    print("\n[3] Dependency-Driven Invalidation (Change Events):\n")
+    
+    asyncio_docs = sources.create("SourceDocument", {
+        "name": "asyncio-docs",
+        "version": "3.11"
+    })
+    threading_docs = sources.create("SourceDocument", {
+        "name": "threading-docs",
+        "version": "3.11"
+    })
+    derived = [
+        ("How do I cancel an asyncio task?", [asyncio_docs.id]),
+        ("How do asyncio and threads interact?", [asyncio_docs.id, threading_docs.id]),
+        ("How do I use a threading.Lock?", [threading_docs.id]),
+    ]
+    for query, source_ids in derived:
+        cache.store(
+            query_text=query,
+            response_text=f"[Simulated LLM response for: {query}]",
+            context_tags=["python", "docs"],
+            source_ids=source_ids
+        )
+    print(f"    ↳ Stored {len(derived)} entries derived from 2 source documents")
+    print(f"    ↳ Dependents of 'asyncio-docs': {len(cache.dependencies.dependents_of(asyncio_docs.id))}")
+    
+    # The write publishes a change event; the cache deletes dependents immediately
+    sources.update(asyncio_docs.id, {"version": "3.12"})
+    print(f"    ↳ Updated 'asyncio-docs' → {cache.invalidated_count} dependent entries invalidated")
+    print(f"    ↳ Dependents of 'threading-docs' still cached: "
+          f"{len(cache.dependencies.dependents_of(threading_docs.id))}")
+    print(f"    ↳ No scan needed: work was proportional to the dependents, "
+          f"not the {len(cache.dependencies)} indexed entries")
+    
     # ==========================================================================
     # STEP 4: Graph Statistics
     # ==========================================================================
@@ -532,6 +773,7 @@ def main():
     print("  • Graph edges linking related entries")
     print("  • TTL-based invalidation")
     print("  • Contextual edge pruning")
+    print("  • Event-driven invalidation of dependent entries")
     print("\n📚 Resources:")
     print("  • RushDB Docs: https://docs.rushdb.com")
     print("  • GitHub: https://github.com/rush-db/examples")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Lookup latency benchmark for the pure vector cache.
+
+Compares three ways of finding the best cached entry for a query:
+
+  loop   - the original per-entry Python loop with a pure-Python cosine
+  exact  - one matrix-vector product over the normalized float32 matrix
+  ivf    - the approximate IVF index (recall@1 is reported against exact)
+
+Embeddings are synthetic: clustered random vectors, with queries made by
+perturbing cached entries the way a paraphrased question lands near a
+cached one. No model download or RushDB account is needed.
+
+Usage:
+    python benchmark.py
+    python benchmark.py --sizes 1000 100000 --queries 200 --n-probe 16
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from vector_index import VectorIndex, normalize
+
+
+def cosine_sim(a: list[float], b: list[float]) -> float:
+    """The original pure-Python similarity used by the loop baseline."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = sum(x * x for x in a) ** 0.5
+    norm_b = sum(x * x for x in b) ** 0.5
+    return dot / (norm_a * norm_b + 1e-8)
+
+
+def loop_lookup(entries: list[list[float]], query: list[float]) -> int:
+    best_score = 0.0
+    best_row = -1
+    for row, cached in enumerate(entries):
+        score = cosine_sim(query, cached)
+        if score > best_score:
+            best_score = score
+            best_row = row
+    return best_row
+
+
+def build_index(size: int, dim: int, rng: np.random.Generator, approximate: bool,
+                n_probe: int, chunk_size: int = 100_000) -> VectorIndex:
+    """Fill an index with clustered vectors, generated in chunks to bound memory."""
+    n_topics = max(1, int(np.sqrt(size)))
+    topics = normalize(rng.standard_normal((n_topics, dim)))
+    index = VectorIndex(dim, initial_capacity=size, approximate=approximate,
+                        approximate_min_size=0, n_probe=n_probe)
+    for start in range(0, size, chunk_size):
+        count = min(chunk_size, size - start)
+        centers = topics[rng.integers(0, n_topics, count)]
+        noise = rng.standard_normal((count, dim)).astype(np.float32) * (0.6 / np.sqrt(dim))
+        index.add(centers + noise)
+    return index
+
+
+def make_queries(index: VectorIndex, count: int, rng: np.random.Generator) -> np.ndarray:
+    rows = rng.integers(0, len(index), count)
+    noise = rng.standard_normal((count, index.dim)).astype(np.float32) * (0.1 / np.sqrt(index.dim))
+    return normalize(index.vectors[rows] + noise)
+
+
+def time_per_query(fn, queries) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def run_size(size: int, args, rng: np.random.Generator) -> dict:
+    build_start = time.perf_counter()
+    index = build_index(size, args.dim, rng, approximate=False, n_probe=args.n_probe)
+    load_seconds = time.perf_counter() - build_start
+    queries = make_queries(index, args.queries, rng)
+
+    exact_ms = time_per_query(lambda q: index.search(q, k=args.k, exact=True), queries)
+    exact_top1 = [int(index.search(q, k=1, exact=True)[0][0]) for q in queries]
+
+    ivf_start = time.perf_counter()
+    index.build_ivf()
+    ivf_build_seconds = time.perf_counter() - ivf_start
+    ivf_ms = time_per_query(lambda q: index.search(q, k=args.k), queries)
+    ivf_top1 = [int(index.search(q, k=1)[0][0]) for q in queries]
+    recall = float(np.mean([a == b for a, b in zip(exact_top1, ivf_top1)]))
+
+    # The Python loop is linear in cache size; past --loop-max, time it on a
+    # prefix and scale up rather than materialize millions of Python lists.
+    loop_rows = min(size, args.loop_max)
+    entries = index.vectors[:loop_rows].tolist()
+    loop_queries = [q.tolist() for q in queries[:args.loop_queries]]
+    loop_ms = time_per_query(lambda q: loop_lookup(entries, q), loop_queries) * (size / loop_rows)
+    del entries
+
+    return {
+        "size": size,
+        "load_s": load_seconds,
+        "loop_ms": loop_ms,
+        "loop_estimated": loop_rows < size,
+        "exact_ms": exact_ms,
+        "ivf_ms": ivf_ms,
+        "ivf_build_s": ivf_build_seconds,
+        "ivf_lists": index.ivf.n_lists,
+        "recall": recall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pure vector cache lookups")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000],
+                        help="Cache sizes to test")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension (all-MiniLM-L6-v2: 384)")
+    parser.add_argument("--queries", type=int, default=100, help="Queries per size for exact/IVF")
+    parser.add_argument("--loop-queries", type=int, default=3, help="Queries per size for the Python loop")
+    parser.add_argument("--loop-max", type=int, default=10_000,
+                        help="Largest cache the Python loop is timed on directly; larger sizes are scaled")
+    parser.add_argument("--n-probe", type=int, default=8, help="IVF buckets scanned per query")
+    parser.add_argument("--k", type=int, default=5, help="Top-k per lookup")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"Lookup latency, dim={args.dim}, top-{args.k}, n_probe={args.n_probe}")
+
+    results = []
+    for size in args.sizes:
+        print(f"  Building {size:,} entries...")
+        results.append(run_size(size, args, rng))
+
+    print("\n" + "=" * 84)
+    print("{:>10} | {:>13} | {:>10} | {:>10} | {:>9} | {:>8} | {:>11}".format(
+        "Entries", "Loop (ms)", "Exact (ms)", "IVF (ms)", "IVF lists", "Recall@1", "IVF build s"))
+    print("-" * 84)
+    for r in results:
+        loop = f"{r['loop_ms']:.1f}" + (" est." if r["loop_estimated"] else "")
+        print("{:>10,} | {:>13} | {:>10.3f} | {:>10.3f} | {:>9} | {:>8.2f} | {:>11.1f}".format(
+            r["size"], loop, r["exact_ms"], r["ivf_ms"], r["ivf_lists"], r["recall"], r["ivf_build_s"]))
+    print("=" * 84)
+    print("Loop values marked 'est.' are timed on --loop-max entries and scaled linearly.")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,7 @@ import os
 import sys
 import json
 import random
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -27,6 +28,8 @@ load_dotenv()
 
 from rushdb import RushDB
 
+from vector_index import VectorIndex
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Configuration
 # ─────────────────────────────────────────────────────────────────────────────
@@ -38,6 +41,17 @@ INDEX_PROPERTY = "query"
 # Similarity threshold for considering a cache hit
 SIMILARITY_THRESHOLD = 0.80
 
+# How long similar-entry links and session contexts are trusted locally
+GRAPH_CONTEXT_TTL_SECONDS = 30.0
+
+# RushDB round-trips allowed per lookup: vector search, similar-entry edges
+# and session context (a cold lookup); each extra page of edges or session
+# members costs one more
+LOOKUP_ROUND_TRIP_BUDGET = 3
+
+# Relationships or records read per context request
+CONTEXT_PAGE_SIZE = 1000
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Mock cache stores (for comparison)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -46,15 +60,40 @@ class PureVectorCache:
     """
     A naive vector cache that only uses cosine similarity.
     No graph relationships, no session awareness, no invalidation tracking.
+    
+    Embeddings live in a ``VectorIndex``: a contiguous normalized float32
+    matrix searched with one matrix-vector product, plus an optional IVF
+    index (``approximate=True``) for caches with hundreds of thousands of
+    entries. See benchmark.py for lookup latency at 1k/100k/1M entries.
     """
     
-    def __init__(self):
-        self.entries = []  # List of (query, response, embedding)
+    def __init__(self, approximate: bool = False, n_probe: int = 8):
+        self.entries = []  # List of (query, response), row i of the index
         self.model = SentenceTransformer(MODEL_NAME)
+        self.index = VectorIndex(
+            dim=self.model.get_sentence_embedding_dimension(),
+            approximate=approximate,
+            n_probe=n_probe,
+        )
     
     def add(self, query: str, response: str):
         embedding = self.model.encode(query)
-        self.entries.append((query, response, embedding.tolist()))
+        self.index.add(embedding)
+        self.entries.append((query, response))
+    
+    def add_many(self, pairs: list[tuple[str, str]]):
+        """Add (query, response) pairs with one batched encode."""
+        if not pairs:
+            return
+        embeddings = self.model.encode([query for query, _ in pairs])
+        self.index.add(embeddings)
+        self.entries.extend(pairs)
+    
+    def get_top_k(self, query: str, k: int = 5) -> list[tuple[str, str, float]]:
+        """Return the k most similar cached (query, response, score) entries."""
+        query_emb = self.model.encode(query)
+        rows, scores = self.index.search(query_emb, k=k)
+        return [(*self.entries[row], float(score)) for row, score in zip(rows, scores)]
     
     def get(self, query: str) -> tuple[Optional[str], float]:
         """
@@ -64,26 +103,14 @@ class PureVectorCache:
         if not self.entries:
             return None, 0.0
         
-        query_emb = self.model.encode(query)
-        
-        best_score = 0.0
-        best_response = None
-        
-        for cached_query, response, cached_emb in self.entries:
-            score = self._cosine_sim(query_emb.tolist(), cached_emb)
-            if score > best_score:
-                best_score = score
-                best_response = response
+        best = self.get_top_k(query, k=1)
+        if not best:
+            return None, 0.0
+        _, best_response, best_score = best[0]
         
         if best_score >= SIMILARITY_THRESHOLD:
             return best_response, best_score
         return None, best_score
-    
-    def _cosine_sim(self, a: list[float], b: list[float]) -> float:
-        dot = sum(x * y for x, y in zip(a, b))
-        norm_a = sum(x * x for x in a) ** 0.5
-        norm_b = sum(x * x for x in b) ** 0.5
-        return dot / (norm_a * norm_b + 1e-8)
 
 
 class GraphBackedCache:
@@ -94,11 +121,27 @@ class GraphBackedCache:
     - Uses graph topology for context-aware retrieval
     """
     
-    def __init__(self, db: RushDB):
+    def __init__(self, db: RushDB, context_ttl: float = GRAPH_CONTEXT_TTL_SECONDS,
+                 round_trip_budget: int = LOOKUP_ROUND_TRIP_BUDGET):
         self.db = db
         self.model = SentenceTransformer(MODEL_NAME)
-        self._cache_records = None
-        self._session_map = {}
+        self.context_ttl = context_ttl
+        self.round_trip_budget = round_trip_budget
+        
+        # entry id → {"similar": set of entry ids, "expires_at"}
+        self._similar_map = {}
+        # session_id → {"record_id", "is_active", "members": set of entry ids, "expires_at"}
+        self._sessions = {}
+        
+        self._round_trips = 0
+        self.last_lookup = {}
+        self.lookup_stats = {
+            "lookups": 0,
+            "round_trips": 0,
+            "latency_ms": 0.0,
+            "max_round_trips": 0,
+            "over_budget": 0,
+        }
     
     def get(self, query: str, session_id: Optional[str] = None) -> tuple[Optional[dict], float]:
         """
@@ -106,10 +149,22 @@ class GraphBackedCache:
         
         - session_id: If provided, prefer entries from the same session
         - Returns (cache_entry_data, similarity_score) or (None, 0) if no match
+        
+        Graph context comes from at most one batched fetch for the candidates
+        and one for the session, each skipped while its local copy is fresh.
         """
+        start = time.perf_counter()
+        self._round_trips = 0
+        try:
+            return self._lookup(query, session_id)
+        finally:
+            self._record_lookup((time.perf_counter() - start) * 1000)
+    
+    def _lookup(self, query: str, session_id: Optional[str]) -> tuple[Optional[dict], float]:
         # Step 1: Semantic search using vector similarity
         query_emb = self.model.encode(query).tolist()
         
+        self._round_trips += 1
         search_results = self.db.ai.search({
             "propertyName": INDEX_PROPERTY,
             "queryVector": query_emb,
@@ -121,24 +176,28 @@ class GraphBackedCache:
             return None, 0.0
         
         # Step 2: Score and rank results, incorporating graph context
+        session = None
+        if session_id:
+            session = self._load_graph_context([record.id for record in search_results.data], session_id)
+        
         scored_results = []
         
         for record in search_results.data:
             score = record.score or 0.0
             
-            # Graph context bonus: same session gets +0.1 boost
-            if session_id:
-                session = self._get_session_for_entry(record.id)
-                if session and session.get("session_id") == session_id:
+            if session:
+                members = session["members"]
+                
+                # Graph context bonus: same session gets +0.1 boost
+                if record.id in members:
                     score += 0.1
                     # Double bonus if session is active
-                    if session.get("is_active"):
+                    if session["is_active"]:
                         score += 0.05
-            
-            # Graph context bonus: connected via SEMANTICALLY_SIMILAR to any entry in this session
-            if session_id:
-                similar_bonus = self._check_similarity_to_session(record, session_id)
-                score += similar_bonus
+                
+                # Graph context bonus: connected via SEMANTICALLY_SIMILAR to any entry in this session
+                if self._similar_map[record.id]["similar"] & (members - {record.id}):
+                    score += 0.05
             
             scored_results.append((score, record))
         
@@ -157,48 +216,133 @@ class GraphBackedCache:
         
         return None, best_score
     
-    def _get_session_for_entry(self, entry_id: str) -> Optional[dict]:
-        """Find the session linked to a cache entry via FROM_SESSION edge."""
-        results = self.db.records.find({
-            "labels": ["SESSION"],
-            "where": {
-                "CACHE_ENTRY": {
-                    "$relation": {"type": "FROM_SESSION", "direction": "in"},
-                    "$id": entry_id,
-                }
-            },
-            "limit": 1,
-        })
-        
-        if results.data:
-            return results.data[0]
-        return None
-    
-    def _check_similarity_to_session(self, entry, session_id: str) -> float:
-        """Check if entry is semantically similar to any entry in the session."""
-        # Find all entries in this session
-        session_entries = self.db.records.find({
-            "labels": [INDEX_LABEL],
-            "where": {
-                "SESSION": {
-                    "$relation": {"type": "FROM_SESSION", "direction": "out"},
-                    "session_id": session_id,
+    def _load_graph_context(self, entry_ids: list[str], session_id: str) -> Optional[dict]:
+        """
+        Refresh the local graph context for the candidates and the session.
+        
+        Stale candidates get their SEMANTICALLY_SIMILAR edges from one
+        relationship fetch. A stale session is looked up by ``session_id``
+        together with its FROM_SESSION members in one record search, so no
+        other SESSION records are read. Both fetches page with a keyset
+        cursor (edges by source ID, records by ``__id``) and only need a
+        second request past ``CONTEXT_PAGE_SIZE`` results. Returns the
+        session context, or None if no SESSION record has that ``session_id``.
+        """
+        now = time.time()
+        expires_at = now + self.context_ttl
+        
+        stale = [
+            entry_id for entry_id in entry_ids
+            if self._similar_map.get(entry_id, {}).get("expires_at", 0) <= now
+        ]
+        if stale:
+            where = {
+                "type": "SEMANTICALLY_SIMILAR",
+                "$or": [{"sourceId": {"$in": stale}}, {"targetId": {"$in": stale}}],
+            }
+            stale = set(stale)
+            for entry_id in stale:
+                self._similar_map[entry_id] = {"similar": set(), "expires_at": expires_at}
+            
+            cursor, limit = None, CONTEXT_PAGE_SIZE
+            while True:
+                self._round_trips += 1
+                page_where = dict(where)
+                if cursor is not None:
+                    page_where["sourceId"] = {"$gt": cursor}
+                edges = self.db.relationships.find({
+                    "where": page_where,
+                    "orderBy": {"sourceId": "asc"},
+                    "limit": limit,
+                }).data
+                # Links are collected into sets, so an edge read twice is harmless
+                for edge in edges:
+                    # Undirected: record the link on whichever side is a candidate
+                    source, target = edge.get("sourceId"), edge.get("targetId")
+                    if source in stale:
+                        self._similar_map[source]["similar"].add(target)
+                    if target in stale:
+                        self._similar_map[target]["similar"].add(source)
+                if len(edges) < limit:
+                    break
+                # The last source's edges may continue on the next page, so resume at it
+                last = edges[-1].get("sourceId")
+                if edges[0].get("sourceId") == last:
+                    # One entry fills the page: read it again with room for all its links
+                    limit *= 2
+                    continue
+                cursor = next(
+                    edge.get("sourceId") for edge in reversed(edges) if edge.get("sourceId") != last
+                )
+                limit = CONTEXT_PAGE_SIZE
+        
+        session = self._sessions.get(session_id)
+        if session is None or session["expires_at"] <= now:
+            session = {"record_id": None, "is_active": False, "members": set(), "expires_at": expires_at}
+            cursor = None
+            while True:
+                self._round_trips += 1
+                where = {
+                    "$or": [
+                        {"session_id": session_id},
+                        {
+                            "SESSION": {
+                                "$relation": {"type": "FROM_SESSION", "direction": "out"},
+                                "session_id": session_id,
+                            }
+                        },
+                    ]
                 }
-            },
-            "limit": 20,
-        })
-        
-        if not session_entries.data:
-            return 0.0
-        
-        # Check if there's a direct SEMANTICALLY_SIMILAR edge
-        for sess_entry in session_entries.data:
-            # Try to find the relationship
-            # This is a simplified check - in production you'd query relationships directly
-            if sess_entry.id != entry.id:
-                return 0.05  # Minor bonus for graph proximity
-        
-        return 0.0
+                if cursor is not None:
+                    where["$id"] = {"$gt": cursor}
+                records = self.db.records.find({
+                    "labels": ["SESSION", INDEX_LABEL],
+                    "where": where,
+                    "orderBy": {"__id": "asc"},
+                    "limit": CONTEXT_PAGE_SIZE,
+                })
+                for record in records.data:
+                    if record.label == "SESSION":
+                        session["record_id"] = record.id
+                        session["is_active"] = bool(record.get("is_active"))
+                    else:
+                        session["members"].add(record.id)
+                # Only sessions with more than a page of entries page further
+                if len(records.data) < CONTEXT_PAGE_SIZE:
+                    break
+                cursor = records.data[-1].id
+            self._sessions[session_id] = session
+        
+        return session if session["record_id"] else None
+    
+    def _record_lookup(self, latency_ms: float):
+        """Track round-trips and latency for the lookup that just finished."""
+        stats = self.lookup_stats
+        stats["lookups"] += 1
+        stats["round_trips"] += self._round_trips
+        stats["latency_ms"] += latency_ms
+        stats["max_round_trips"] = max(stats["max_round_trips"], self._round_trips)
+        over_budget = self._round_trips > self.round_trip_budget
+        if over_budget:
+            stats["over_budget"] += 1
+        self.last_lookup = {
+            "round_trips": self._round_trips,
+            "latency_ms": latency_ms,
+            "over_budget": over_budget,
+        }
+    
+    def lookup_report(self) -> dict:
+        """Averages over all lookups so far, for checking the hit-path budget."""
+        stats = self.lookup_stats
+        lookups = stats["lookups"] or 1
+        return {
+            "lookups": stats["lookups"],
+            "avg_round_trips": stats["round_trips"] / lookups,
+            "max_round_trips": stats["max_round_trips"],
+            "avg_latency_ms": stats["latency_ms"] / lookups,
+            "round_trip_budget": self.round_trip_budget,
+            "over_budget": stats["over_budget"],
+        }
     
     def check_invalidation(self, cache_entry_id: str) -> tuple[bool, list[str]]:
         """
@@ -255,6 +399,10 @@ def demo_cache_lookup(db: RushDB, graph_cache: GraphBackedCache):
         else:
             print(f"  → No match found (best score: {score:.3f})")
             print(f"  → Cache MISS → would recompute")
+        
+        lookup = graph_cache.last_lookup
+        print(f"  → {lookup['round_trips']} RushDB round-trips, {lookup['latency_ms']:.1f}ms"
+              + (" (over budget!)" if lookup["over_budget"] else ""))
 
 
 def demo_session_affinity(db: RushDB, graph_cache: GraphBackedCache):
@@ -387,11 +535,11 @@ def demo_pure_vs_graph_comparison(db: RushDB, graph_cache: GraphBackedCache):
         "limit": 50,
     })
     
-    for entry in all_entries.data:
-        query = entry.get("query", "")
-        response = entry.get("response", "")
-        if query and response:
-            pure_cache.add(query, response)
+    pure_cache.add_many([
+        (entry.get("query", ""), entry.get("response", ""))
+        for entry in all_entries.data
+        if entry.get("query", "") and entry.get("response", "")
+    ])
     
     print(f"  Loaded {len(pure_cache.entries)} entries into pure vector cache")
     
@@ -541,6 +689,12 @@ def main():
     demo_relationship_traversal(db)
     demo_pure_vs_graph_comparison(db, graph_cache)
     
+    report = graph_cache.lookup_report()
+    print("\n  Graph-backed lookup cost:")
+    print(f"    {report['lookups']} lookups, {report['avg_round_trips']:.2f} round-trips avg "
+          f"(max {report['max_round_trips']}, budget {report['round_trip_budget']})")
+    print(f"    {report['avg_latency_ms']:.1f}ms avg latency, {report['over_budget']} over budget")
+    
     print("\n" + "=" * 60)
     print("DEMO COMPLETE")
     print("=" * 60)
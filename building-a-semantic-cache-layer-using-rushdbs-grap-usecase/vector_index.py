@@ -0,0 +1,219 @@
+"""
+In-process vector index for the pure vector cache.
+
+Cached embeddings are kept L2-normalized in one contiguous float32 matrix, so
+cosine similarity against every entry is a single matrix-vector product.
+For large caches an IVF (inverted file) index can be built on top: entries
+are bucketed by their nearest k-means centroid and a lookup only scores the
+``n_probe`` buckets closest to the query.
+"""
+
+import threading
+from typing import Optional
+
+import numpy as np
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows (or a single vector) as float32."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-8)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the ``k`` highest scores, best first."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < len(scores):
+        candidates = np.argpartition(scores, -k)[-k:]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates])]
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate index over rows of a ``VectorIndex`` matrix.
+
+    Centroids are trained with spherical k-means on a sample of the vectors.
+    Each bucket stores row ids; a search scores the centroids, then runs one
+    matrix-vector product over the rows of the ``n_probe`` nearest buckets.
+    """
+
+    def __init__(self, n_lists: int, n_probe: int = 8, train_iterations: int = 10,
+                 sample_per_list: int = 64, seed: int = 0):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.train_iterations = train_iterations
+        self.sample_per_list = sample_per_list
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: list[np.ndarray] = []
+        self._pending: list[list[int]] = []
+        self.trained_size = 0
+
+    def _assign(self, vectors: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+        """Nearest centroid for each row, computed in chunks to bound memory."""
+        assignments = np.empty(len(vectors), dtype=np.int64)
+        for start in range(0, len(vectors), chunk_size):
+            block = vectors[start:start + chunk_size]
+            assignments[start:start + chunk_size] = np.argmax(block @ self.centroids.T, axis=1)
+        return assignments
+
+    def train(self, vectors: np.ndarray) -> None:
+        """Fit centroids on ``vectors`` and bucket every row."""
+        rng = np.random.default_rng(self.seed)
+        n_lists = max(1, min(self.n_lists, len(vectors)))
+        sample_size = min(len(vectors), n_lists * self.sample_per_list)
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+        for _ in range(self.train_iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=n_lists)
+            # Empty clusters keep their previous centroid
+            filled = counts > 0
+            centroids[filled] = normalize(sums[filled])
+
+        self.centroids = centroids
+        assignments = self._assign(vectors)
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(n_lists + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(n_lists)]
+        self._pending = [[] for _ in range(n_lists)]
+        self.trained_size = len(vectors)
+
+    def add(self, row: int, vector: np.ndarray) -> None:
+        """Bucket a row appended after training."""
+        list_id = int(np.argmax(self.centroids @ vector))
+        self._pending[list_id].append(row)
+
+    def candidates(self, query: np.ndarray) -> np.ndarray:
+        """Row ids in the ``n_probe`` buckets nearest to ``query``."""
+        probes = top_k(self.centroids @ query, self.n_probe)
+        parts = []
+        for list_id in probes:
+            if self._pending[list_id]:
+                self._lists[list_id] = np.concatenate(
+                    [self._lists[list_id], np.asarray(self._pending[list_id], dtype=np.int64)]
+                )
+                self._pending[list_id] = []
+            parts.append(self._lists[list_id])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+class VectorIndex:
+    """
+    Growable matrix of normalized embeddings with exact and IVF top-k search.
+
+    Rows are appended into a preallocated buffer that doubles when full.
+    Search is exact until ``approximate_min_size`` rows exist; past that, if
+    ``approximate`` is enabled, an IVF index is trained and retrained whenever
+    the matrix has doubled since the last training. Training runs on a
+    background thread started by ``add``. Searches keep using the previous
+    index (or exact search) until the new one is swapped in, together with
+    the rows appended while it trained.
+    """
+
+    def __init__(self, dim: int, initial_capacity: int = 1024, approximate: bool = False,
+                 approximate_min_size: int = 50_000, n_probe: int = 8):
+        self.dim = dim
+        self._vectors = np.empty((initial_capacity, dim), dtype=np.float32)
+        self.size = 0
+        self.approximate = approximate
+        self.approximate_min_size = approximate_min_size
+        self.n_probe = n_probe
+        self.ivf: Optional[IVFIndex] = None
+        # Guards appends against the swap-in of a freshly trained IVF index
+        self._lock = threading.Lock()
+        self._ivf_builder: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """View of the populated rows."""
+        return self._vectors[:self.size]
+
+    def _reserve(self, extra: int) -> None:
+        needed = self.size + extra
+        if needed <= len(self._vectors):
+            return
+        capacity = max(needed, 2 * len(self._vectors))
+        grown = np.empty((capacity, self.dim), dtype=np.float32)
+        grown[:self.size] = self._vectors[:self.size]
+        self._vectors = grown
+
+    def add(self, vectors: np.ndarray) -> np.ndarray:
+        """Append one vector or a batch; returns the new row ids."""
+        vectors = normalize(np.atleast_2d(vectors))
+        with self._lock:
+            self._reserve(len(vectors))
+            rows = np.arange(self.size, self.size + len(vectors))
+            self._vectors[self.size:self.size + len(vectors)] = vectors
+            self.size += len(vectors)
+            if self.ivf is not None:
+                for row, vector in zip(rows, vectors):
+                    self.ivf.add(int(row), vector)
+        self._maybe_build_ivf()
+        return rows
+
+    def build_ivf(self, n_lists: Optional[int] = None) -> IVFIndex:
+        """
+        Train an IVF index over the current rows (about sqrt(n) lists by
+        default) and swap it in.
+
+        Training reads a snapshot of the rows without holding the lock;
+        rows are never rewritten, so appends can continue meanwhile and are
+        bucketed into the new index just before the swap.
+        """
+        with self._lock:
+            vectors = self.vectors
+        ivf = IVFIndex(n_lists=n_lists or max(1, int(np.sqrt(len(vectors)))), n_probe=self.n_probe)
+        ivf.train(vectors)
+        with self._lock:
+            for row in range(ivf.trained_size, self.size):
+                ivf.add(row, self._vectors[row])
+            self.ivf = ivf
+        return ivf
+
+    def _maybe_build_ivf(self) -> None:
+        """Start a background retrain once the index is large enough or has doubled."""
+        if not self.approximate or self.size < self.approximate_min_size:
+            return
+        if self._ivf_builder is not None and self._ivf_builder.is_alive():
+            return
+        if self.ivf is None or self.size >= 2 * self.ivf.trained_size:
+            self._ivf_builder = threading.Thread(target=self.build_ivf, daemon=True)
+            self._ivf_builder.start()
+
+    def wait_for_ivf(self, timeout: Optional[float] = None) -> None:
+        """Block until a background IVF retrain, if any, has been swapped in."""
+        if self._ivf_builder is not None:
+            self._ivf_builder.join(timeout)
+
+    def search(self, query: np.ndarray, k: int = 1, exact: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k rows by cosine similarity.
+
+        Returns ``(row_ids, scores)``, best first.
+        """
+        if self.size == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        query = normalize(query)
+
+        ivf = self.ivf
+        if exact or ivf is None:
+            scores = self.vectors @ query
+            best = top_k(scores, k)
+            return best, scores[best]
+
+        rows = ivf.candidates(query)
+        scores = self._vectors[rows] @ query
+        best = top_k(scores, k)
+        return rows[best], scores[best]
@@ -0,0 +1,246 @@
+"""
+Throughput benchmark for the streaming ingestion pipeline.
+
+Runs the sequential and pipelined ingestion modes against a local stand-in
+for RushDB that simulates network round-trip latency, so the numbers show
+how much of the wall-clock time each mode spends waiting on the database.
+No RushDB account or network access is needed.
+
+Usage:
+    python benchmark.py --sessions 40 --batch-size 50 --latency-ms 20
+    python benchmark.py --sessions 10 --upsert
+"""
+import argparse
+import itertools
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from pipeline import StreamingPipeline
+from simulator import EventSimulator
+
+
+class StandInRecord:
+    """Minimal record object with the ``id``/``data`` shape the pipeline reads."""
+
+    def __init__(self, record_id: str, label: str, data: Dict[str, Any]):
+        self.id = record_id
+        self.label = label
+        self.data = data
+
+
+class StandInResult:
+    def __init__(self, data: List[StandInRecord]):
+        self.data = data
+
+
+class StandInTransaction:
+    def __init__(self, server: "StandInRushDB"):
+        self.server = server
+
+    def commit(self) -> None:
+        self.server.round_trip("tx.commit")
+
+    def rollback(self) -> None:
+        self.server.round_trip("tx.rollback")
+
+    def __enter__(self) -> "StandInTransaction":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type:
+            self.rollback()
+        else:
+            self.commit()
+
+
+class StandInTransactions:
+    def __init__(self, server: "StandInRushDB"):
+        self.server = server
+
+    def begin(self) -> StandInTransaction:
+        self.server.round_trip("tx.begin")
+        return StandInTransaction(self.server)
+
+
+class StandInRecords:
+    def __init__(self, server: "StandInRushDB"):
+        self.server = server
+
+    def create(self, label: str, data: Dict[str, Any], options=None, transaction=None) -> StandInRecord:
+        self.server.round_trip("records.create", 1)
+        return self.server.store(label, data)
+
+    def create_many(self, label: str, data: List[Dict[str, Any]], options=None, transaction=None) -> StandInResult:
+        self.server.round_trip("records.create_many", len(data))
+        merge_by = (options or {}).get("mergeBy")
+        if merge_by:
+            return StandInResult([self.server.merge(label, item, merge_by) for item in data])
+        return StandInResult([self.server.store(label, item) for item in data])
+
+    def upsert(self, label: str, data: Dict[str, Any], options=None, transaction=None) -> StandInRecord:
+        self.server.round_trip("records.upsert", 1)
+        merge_by = (options or {}).get("mergeBy") or list(data)
+        return self.server.merge(label, data, merge_by)
+
+    def attach(self, source, target, options=None, transaction=None) -> Dict[str, Any]:
+        count = len(target) if isinstance(target, list) else 1
+        self.server.round_trip("records.attach", count)
+        return {"success": True}
+
+
+class StandInRushDB:
+    """
+    In-process stand-in for a RushDB server.
+
+    Every call sleeps for ``latency_ms`` plus ``per_record_us`` per record,
+    releasing the GIL like a real HTTP round-trip, and is counted so the
+    benchmark can report round-trips per mode.
+    """
+
+    def __init__(self, latency_ms: float = 20.0, per_record_us: float = 50.0):
+        self.latency = latency_ms / 1000.0
+        self.per_record = per_record_us / 1_000_000.0
+        self.records = StandInRecords(self)
+        self.transactions = StandInTransactions(self)
+        self.calls: Dict[str, int] = {}
+        self.stored: Dict[str, StandInRecord] = {}
+        self._merge_index: Dict[Any, str] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def round_trip(self, method: str, records: int = 0) -> None:
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+        time.sleep(self.latency + self.per_record * records)
+
+    def store(self, label: str, data: Dict[str, Any]) -> StandInRecord:
+        with self._lock:
+            record = StandInRecord(f"rec_{next(self._ids)}", label, dict(data))
+            self.stored[record.id] = record
+        return record
+
+    def merge(self, label: str, data: Dict[str, Any], merge_by: List[str]) -> StandInRecord:
+        key = (label,) + tuple(repr(data.get(field)) for field in merge_by)
+        with self._lock:
+            record_id = self._merge_index.get(key)
+            if record_id:
+                self.stored[record_id].data.update(data)
+                return self.stored[record_id]
+        record = self.store(label, data)
+        with self._lock:
+            self._merge_index[key] = record.id
+        return record
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+
+def generate_events(session_count: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Pre-generate the event stream so the simulator is not part of the timing."""
+    if seed is not None:
+        random.seed(seed)
+    simulator = EventSimulator(tool_call_probability=0.4)
+    return list(simulator.stream_events(session_count))
+
+
+def run_mode(name: str, events: List[Dict[str, Any]], args, max_in_flight: int = 0) -> Dict[str, Any]:
+    server = StandInRushDB(latency_ms=args.latency_ms, per_record_us=args.per_record_us)
+    pipeline = StreamingPipeline(
+        api_token="stand-in",
+        batch_size=args.batch_size,
+        stream_delay=0.0,
+        db=server,
+    )
+
+    start = time.perf_counter()
+    if max_in_flight:
+        stats = pipeline.ingest_pipelined(events=events, max_in_flight=max_in_flight)
+    else:
+        stats = pipeline.ingest_stream(events=events)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mode": name,
+        "events": stats["events_processed"],
+        "seconds": elapsed,
+        "events_per_second": stats["events_processed"] / elapsed if elapsed else 0.0,
+        "round_trips": server.total_calls(),
+    }
+
+
+def run_upsert_mode(name: str, events: List[Dict[str, Any]], args, bulk: bool,
+                    replays: int = 1) -> Dict[str, Any]:
+    server = StandInRushDB(latency_ms=args.latency_ms, per_record_us=args.per_record_us)
+    pipeline = StreamingPipeline(
+        api_token="stand-in",
+        batch_size=args.batch_size,
+        stream_delay=0.0,
+        db=server,
+    )
+
+    start = time.perf_counter()
+    processed = 0
+    for _ in range(replays):
+        if bulk:
+            stats = pipeline.ingest_with_bulk_upsert(events=events)
+        else:
+            stats = pipeline.ingest_with_upsert(events=events)
+        processed += stats["events_processed"]
+    elapsed = time.perf_counter() - start
+
+    return {
+        "mode": name,
+        "events": processed,
+        "seconds": elapsed,
+        "events_per_second": processed / elapsed if elapsed else 0.0,
+        "round_trips": server.total_calls(),
+        "stored": len(server.stored),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark streaming ingestion throughput")
+    parser.add_argument("--sessions", type=int, default=40, help="Sessions to generate")
+    parser.add_argument("--batch-size", type=int, default=50, help="Events per batch")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated round-trip latency")
+    parser.add_argument("--per-record-us", type=float, default=50.0, help="Simulated server cost per record")
+    parser.add_argument("--in-flight", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="In-flight transaction counts to test in pipelined mode")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the event stream")
+    parser.add_argument("--upsert", action="store_true",
+                        help="Also compare per-event and bulk upsert, including a full replay")
+    args = parser.parse_args()
+
+    print(f"[BENCH] Generating events for {args.sessions} sessions...")
+    events = generate_events(args.sessions, seed=args.seed)
+    print(f"[BENCH] {len(events)} events, batch size {args.batch_size}, "
+          f"{args.latency_ms:.0f}ms simulated latency")
+
+    results = [run_mode("sequential", events, args)]
+    for in_flight in args.in_flight:
+        results.append(run_mode(f"pipelined x{in_flight}", events, args, max_in_flight=in_flight))
+    if args.upsert:
+        results.append(run_upsert_mode("upsert", events, args, bulk=False))
+        results.append(run_upsert_mode("bulk upsert", events, args, bulk=True))
+        replayed = run_upsert_mode("bulk upsert x2", events, args, bulk=True, replays=2)
+        results.append(replayed)
+
+    print("\n" + "=" * 64)
+    print(f"{'Mode':<16} {'Events':>8} {'Seconds':>9} {'Events/sec':>12} {'Round-trips':>12}")
+    print("-" * 64)
+    for result in results:
+        print(f"{result['mode']:<16} {result['events']:>8} {result['seconds']:>9.2f} "
+              f"{result['events_per_second']:>12.1f} {result['round_trips']:>12}")
+    print("=" * 64)
+
+    if args.upsert:
+        # Idempotence check: replaying the stream must not create new records
+        single = next(r for r in results if r["mode"] == "bulk upsert")
+        print(f"\n[BENCH] Records stored after one pass: {single['stored']}, "
+              f"after replaying twice: {replayed['stored']}")
+
+
+if __name__ == "__main__":
+    main()
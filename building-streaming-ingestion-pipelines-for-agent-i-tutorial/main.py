@@ -195,6 +195,12 @@ def main():
         default=None,
         help="Batch size for writes (overrides BATCH_SIZE env var)"
     )
+    parser.add_argument(
+        "--in-flight",
+        type=int,
+        default=None,
+        help="Concurrent batch transactions; 0 runs sequentially (overrides MAX_IN_FLIGHT env var)"
+    )
     
     args = parser.parse_args()
     
@@ -222,6 +228,13 @@ def main():
         # Configuration from args or environment
         batch_size = args.batch_size or int(os.getenv("BATCH_SIZE", "10"))
         stream_delay = float(os.getenv("STREAM_DELAY", "0.1"))
+        max_batch_bytes = int(os.getenv("MAX_BATCH_BYTES", "0")) or None
+        max_batch_latency = float(os.getenv("MAX_BATCH_LATENCY", "0")) or None
+        overflow = os.getenv("OVERFLOW_POLICY", "block")
+        if args.in_flight is not None:
+            max_in_flight = args.in_flight
+        else:
+            max_in_flight = int(os.getenv("MAX_IN_FLIGHT", "0"))
         
         if args.events:
             session_count = args.events // 15
@@ -237,15 +250,32 @@ def main():
             url=url,
             batch_size=batch_size,
             stream_delay=stream_delay,
+            max_batch_bytes=max_batch_bytes,
+            max_batch_latency=max_batch_latency,
+            overflow=overflow,
         )
         
-        stats = pipeline.ingest_stream(session_count=session_count)
+        if max_in_flight > 0:
+            stats = pipeline.ingest_pipelined(
+                session_count=session_count,
+                max_in_flight=max_in_flight,
+            )
+        else:
+            stats = pipeline.ingest_stream(session_count=session_count)
         
         print(f"\n[STATS] Pipeline Statistics:")
         print(f"  Events processed: {stats['events_processed']}")
         print(f"  Batches committed: {stats['batches_committed']}")
         print(f"  Errors: {stats.get('errors', 0)}")
         print(f"  Duration: {stats.get('duration_seconds', 0):.2f}s")
+        
+        buffer_metrics = stats.get("buffer")
+        if buffer_metrics:
+            reasons = ", ".join(f"{k}={v}" for k, v in buffer_metrics["flush_reasons"].items())
+            print(f"  Flush reasons: {reasons}")
+            print(f"  Max queue depth: {buffer_metrics['max_queue_depth']} events")
+            print(f"  Max flush latency: {buffer_metrics['max_flush_latency']:.2f}s")
+            print(f"  Dropped events: {buffer_metrics['events_dropped']}")
     
     # Run analysis if requested
     if args.mode in ["all", "analyze"]:
@@ -7,9 +7,12 @@ This module implements the core pipeline logic that:
 3. Persists them to RushDB with proper relationships
 4. Handles errors and provides observability
 """
+import json
 import os
+import threading
 import time
-from typing import Generator, List, Dict, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Generator, Iterable, List, Dict, Any, Optional
 from dotenv import load_dotenv
 
 from rushdb import RushDB
@@ -30,6 +33,10 @@ class StreamingPipeline:
         url: Optional[str] = None,
         batch_size: int = 10,
         stream_delay: float = 0.1,
+        db: Optional[Any] = None,
+        max_batch_bytes: Optional[int] = None,
+        max_batch_latency: Optional[float] = None,
+        overflow: str = "block",
     ):
         """
         Initialize the streaming pipeline.
@@ -39,10 +46,21 @@ class StreamingPipeline:
             url: Optional self-hosted URL
             batch_size: Number of events per batch write
             stream_delay: Delay between events in simulation (seconds)
+            db: Optional pre-built client (e.g. the benchmark stand-in)
+            max_batch_bytes: Flush a batch before it exceeds this many bytes
+            max_batch_latency: Flush a batch once its oldest event is this old (seconds)
+            overflow: "block" or "shed" when downstream commits lag
         """
-        self.db = RushDB(api_token, url=url) if url else RushDB(api_token)
+        if db is not None:
+            self.db = db
+        else:
+            self.db = RushDB(api_token, url=url) if url else RushDB(api_token)
+        self._stats_lock = threading.Lock()
         self.batch_size = batch_size
         self.stream_delay = stream_delay
+        self.max_batch_bytes = max_batch_bytes
+        self.max_batch_latency = max_batch_latency
+        self.overflow = overflow
         self.simulator = EventSimulator()
         
         # Statistics
@@ -53,10 +71,20 @@ class StreamingPipeline:
             "start_time": None,
         }
     
+    def _create_buffer(self, max_pending_batches: Optional[int] = None) -> BatchEventBuffer:
+        return BatchEventBuffer(
+            batch_size=self.batch_size,
+            max_bytes=self.max_batch_bytes,
+            max_latency=self.max_batch_latency,
+            max_pending_batches=max_pending_batches,
+            overflow=self.overflow,
+        )
+    
     def ingest_stream(
         self,
         session_count: int = 3,
         on_batch: Optional[callable] = None,
+        events: Optional[Iterable[Dict[str, Any]]] = None,
     ) -> Dict[str, int]:
         """
         Ingest events from the stream into RushDB.
@@ -64,12 +92,13 @@ class StreamingPipeline:
         Args:
             session_count: Number of sessions to generate
             on_batch: Optional callback for batch completion (batch_num, events)
+            events: Optional pre-built event iterable (defaults to the simulator)
             
         Returns:
             Statistics dictionary with ingestion results
         """
         self.stats["start_time"] = time.time()
-        buffer = BatchEventBuffer(batch_size=self.batch_size)
+        buffer = self._create_buffer()
         
         # Track created records for relationship linking
         sessions: Dict[str, Any] = {}
@@ -77,8 +106,11 @@ class StreamingPipeline:
         print(f"[STREAM] Starting streaming pipeline simulation...")
         print(f"[STREAM] Generating {session_count} sessions with events")
         
+        if events is None:
+            events = self.simulator.stream_events(session_count)
+        
         # Stream events from simulator
-        for event_data in self.simulator.stream_events(session_count):
+        for event_data in events:
             # Simulate real-time delay
             time.sleep(self.stream_delay)
             
@@ -92,14 +124,15 @@ class StreamingPipeline:
                 if session_id:
                     sessions[session_id] = None  # Will be populated after creation
             
-            # Add to buffer
-            completed_batches = buffer.add(event_data)
+            # Add to buffer, flushing any batch that has hit its deadline
+            completed_batches = buffer.poll() + buffer.add(event_data)
             
             # Process completed batches
             for batch in completed_batches:
                 batch_num = self.stats["batches_committed"] + 1
                 self._process_batch(batch, sessions)
                 self.stats["batches_committed"] += 1
+                buffer.task_done()
                 
                 if on_batch:
                     on_batch(batch_num, batch)
@@ -110,6 +143,7 @@ class StreamingPipeline:
             batch_num = self.stats["batches_committed"] + 1
             self._process_batch(batch, sessions)
             self.stats["batches_committed"] += 1
+            buffer.task_done()
             
             if on_batch:
                 on_batch(batch_num, batch)
@@ -118,6 +152,7 @@ class StreamingPipeline:
         if self.stats["start_time"]:
             duration = time.time() - self.stats["start_time"]
             self.stats["duration_seconds"] = duration
+        self.stats["buffer"] = buffer.metrics()
         
         print(f"[STREAM] Pipeline completed: {self.stats['events_processed']} events in {self.stats['batches_committed']} batches")
         
@@ -131,8 +166,15 @@ class StreamingPipeline:
         """
         Process a batch of events and write to RushDB.
         
-        Groups events by label and uses create_many for efficient writes.
-        Uses transactions for atomic commits.
+        Groups events by label and uses create_many for efficient writes,
+        including SESSION records. Events are then linked to their session
+        with one attach call per session. Uses transactions for atomic commits.
+        
+        ``sessions`` maps session_id to its SESSION record, or to a Future
+        that resolves to the record once the batch creating it commits.
+        Sessions started in this batch are taken from the create result and
+        never waited on, since their Futures resolve only after this batch
+        finishes; if the result lacks one of them the batch fails.
         """
         # Group events by label
         by_label: Dict[str, List[Dict[str, Any]]] = {}
@@ -142,50 +184,194 @@ class StreamingPipeline:
                 by_label[label] = []
             by_label[label].append(event_data["data"])
         
-        # Process each label group
+        started = {
+            data.get("session_id") for data in by_label.get("SESSION", [])
+            if data.get("type") == "session_start" and data.get("session_id")
+        }
+        created_sessions: Dict[str, Any] = {}
+        
         with self.db.transactions.begin() as tx:
+            # Sessions first, so events in this batch can link to them
+            if "SESSION" in by_label:
+                created = self.db.records.create_many(
+                    label="SESSION",
+                    data=by_label["SESSION"],
+                    transaction=tx
+                )
+                for record in (created.data if hasattr(created, 'data') else []):
+                    session_id = record.data.get("session_id")
+                    if session_id and record.data.get("type") == "session_start":
+                        created_sessions[session_id] = record
+                missing = started - created_sessions.keys()
+                if missing:
+                    raise RuntimeError(f"create_many returned no SESSION record for {sorted(missing)}")
+            
+            # Message, ToolCall, ToolResult: bulk create
+            events_by_session: Dict[str, List[str]] = {}
             for label, events in by_label.items():
                 if label == "SESSION":
-                    # Session events: create individually to get IDs
-                    for event_data in events:
-                        record = self.db.records.create(
-                            label="SESSION",
-                            data=event_data,
-                            transaction=tx
-                        )
-                        # Track for relationship linking
-                        session_id = event_data.get("session_id")
-                        if session_id and event_data.get("type") == "session_start":
-                            sessions[session_id] = record
+                    continue
+                created = self.db.records.create_many(
+                    label=label,
+                    data=events,
+                    transaction=tx
+                )
+                for record in (created.data if hasattr(created, 'data') else []):
+                    event_session_id = record.data.get("session_id")
+                    if event_session_id:
+                        events_by_session.setdefault(event_session_id, []).append(record.id)
+            
+            # Link events to their session: one attach per session
+            for session_id, event_ids in events_by_session.items():
+                if session_id in started:
+                    session_record = created_sessions[session_id]
                 else:
-                    # Message, ToolCall, ToolResult: bulk create
-                    created = self.db.records.create_many(
-                        label=label,
-                        data=events,
+                    session_record = self._resolve_session(sessions, session_id)
+                if session_record:
+                    self.db.records.attach(
+                        source=session_record,
+                        target=event_ids,
+                        options={"type": "BELONGS_TO", "direction": "in"},
                         transaction=tx
                     )
-                    
-                    # Link events to their session
-                    for record in (created.data if hasattr(created, 'data') else []):
-                        event_session_id = record.data.get("session_id")
-                        if event_session_id and event_session_id in sessions:
-                            session_record = sessions[event_session_id]
-                            if session_record:
-                                self.db.records.attach(
-                                    source=record,
-                                    target=session_record,
-                                    options={"type": "BELONGS_TO"},
-                                    transaction=tx
-                                )
-        
-        self.stats["events_processed"] += len(batch)
-        batch_num = self.stats["batches_committed"] + 1
+        
+        # Only publish sessions once committed, so later batches never link
+        # to records from an uncommitted transaction
+        for session_id, record in created_sessions.items():
+            pending = sessions.get(session_id)
+            if isinstance(pending, Future):
+                pending.set_result(record)
+            else:
+                sessions[session_id] = record
+        
+        with self._stats_lock:
+            self.stats["events_processed"] += len(batch)
+            batch_num = self.stats["batches_committed"] + 1
         print(f"[BATCH] Committed batch {batch_num}: {len(batch)} events")
     
+    @staticmethod
+    def _resolve_session(sessions: Dict[str, Any], session_id: str) -> Any:
+        """Return the committed SESSION record, waiting if its batch is in flight."""
+        session_record = sessions.get(session_id)
+        if isinstance(session_record, Future):
+            return session_record.result()
+        return session_record
+    
+    def ingest_pipelined(
+        self,
+        session_count: int = 3,
+        max_in_flight: int = 4,
+        events: Optional[Iterable[Dict[str, Any]]] = None,
+        on_batch: Optional[callable] = None,
+    ) -> Dict[str, Any]:
+        """
+        Ingest events with up to ``max_in_flight`` batch transactions committing
+        concurrently while the buffer keeps filling.
+        
+        When every commit slot is busy, the buffer applies its overflow
+        policy: "block" stops consuming the stream until a commit finishes,
+        "shed" drops incoming events. Either way a slow database cannot grow
+        memory. With ``max_batch_latency`` set, a background ticker flushes
+        partial batches on their deadline even when the source goes quiet.
+        
+        Args:
+            session_count: Number of sessions to generate
+            max_in_flight: Maximum number of concurrent batch transactions
+            events: Optional pre-built event iterable (defaults to the simulator)
+            on_batch: Optional callback for batch completion (batch_num, events)
+            
+        Returns:
+            Statistics dictionary with ingestion results
+        """
+        self.stats = {
+            "events_processed": 0,
+            "batches_committed": 0,
+            "errors": 0,
+            "start_time": time.time(),
+        }
+        buffer = self._create_buffer(max_pending_batches=max_in_flight)
+        sessions: Dict[str, Any] = {}
+        # Keeps batches submitted in the order they were emitted
+        emit_lock = threading.Lock()
+        stop_ticker = threading.Event()
+        
+        if events is None:
+            events = self.simulator.stream_events(session_count)
+        
+        print(f"[STREAM] Starting pipelined ingestion ({max_in_flight} transactions in flight)...")
+        
+        def commit(batch: List[Dict[str, Any]], owned: List[Future]) -> None:
+            try:
+                self._process_batch(batch, sessions)
+                with self._stats_lock:
+                    self.stats["batches_committed"] += 1
+                    batch_num = self.stats["batches_committed"]
+                if on_batch:
+                    on_batch(batch_num, batch)
+            except Exception as e:
+                with self._stats_lock:
+                    self.stats["errors"] += 1
+                print(f"[ERROR] Failed to commit batch of {len(batch)} events: {e}")
+            finally:
+                # Unblock batches waiting on sessions this batch failed to create
+                for pending in owned:
+                    if not pending.done():
+                        pending.set_result(None)
+                buffer.task_done()
+        
+        def submit(executor: ThreadPoolExecutor, batch: List[Dict[str, Any]]) -> None:
+            # Register sessions started in this batch before it is submitted,
+            # so later batches wait for the commit instead of missing the link
+            owned = []
+            for event_data in batch:
+                data = event_data["data"]
+                if event_data["label"] == "SESSION" and data.get("type") == "session_start":
+                    pending = Future()
+                    sessions[data.get("session_id")] = pending
+                    owned.append(pending)
+            executor.submit(commit, batch, owned)
+        
+        def tick(executor: ThreadPoolExecutor) -> None:
+            while not stop_ticker.is_set():
+                wait = buffer.time_until_deadline()
+                stop_ticker.wait(self.max_batch_latency if wait is None else wait)
+                with emit_lock:
+                    for batch in buffer.poll():
+                        submit(executor, batch)
+        
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            ticker = None
+            if self.max_batch_latency:
+                ticker = threading.Thread(target=tick, args=(executor,), daemon=True)
+                ticker.start()
+            try:
+                for event_data in events:
+                    if self.stream_delay:
+                        time.sleep(self.stream_delay)
+                    with emit_lock:
+                        for batch in buffer.add(event_data):
+                            submit(executor, batch)
+            finally:
+                stop_ticker.set()
+                if ticker:
+                    ticker.join()
+            for batch in buffer.flush():
+                submit(executor, batch)
+        
+        duration = time.time() - self.stats["start_time"]
+        self.stats["duration_seconds"] = duration
+        self.stats["events_per_second"] = self.stats["events_processed"] / duration if duration else 0.0
+        self.stats["buffer"] = buffer.metrics()
+        
+        print(f"[STREAM] Pipelined ingestion completed: {self.stats['events_processed']} events in {self.stats['batches_committed']} batches ({self.stats['events_per_second']:.1f} events/sec)")
+        
+        return self.stats
+    
     def ingest_with_upsert(
         self,
         session_count: int = 3,
         merge_by: List[str] = None,
+        events: Optional[Iterable[Dict[str, Any]]] = None,
     ) -> Dict[str, int]:
         """
         Alternative ingestion method using upsert for idempotent writes.
@@ -203,7 +389,10 @@ class StreamingPipeline:
         
         print(f"[STREAM] Starting upsert-mode ingestion...")
         
-        for event_data in self.simulator.stream_events(session_count):
+        if events is None:
+            events = self.simulator.stream_events(session_count)
+        
+        for event_data in events:
             time.sleep(self.stream_delay)
             
             label = event_data["label"]
@@ -230,6 +419,138 @@ class StreamingPipeline:
         
         return self.stats
     
+    def ingest_with_bulk_upsert(
+        self,
+        session_count: int = 3,
+        merge_by: List[str] = None,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        events: Optional[Iterable[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Batched, idempotent alternative to ``ingest_with_upsert``.
+        
+        Events are collected into windows by the batch buffer. Within a window,
+        events sharing the same label and ``merge_by`` key are collapsed
+        client-side (later fields win), and each label is written with a
+        single ``create_many`` call using ``mergeBy``, so replaying a stream
+        updates the same records instead of duplicating them.
+        
+        If a grouped write fails, the group is split in half and only the
+        halves are retried, narrowing retries down to the keys that actually
+        fail. A single key is retried up to ``max_retries`` times before it is
+        reported as failed.
+        """
+        self.stats = {
+            "events_processed": 0,
+            "batches_committed": 0,
+            "errors": 0,
+            "start_time": time.time(),
+            "records_written": 0,
+            "duplicates_collapsed": 0,
+            "write_calls": 0,
+            "retried_calls": 0,
+            "failed_keys": [],
+        }
+        
+        merge_by = merge_by or ["event_id"]
+        buffer = self._create_buffer()
+        
+        print(f"[STREAM] Starting bulk upsert ingestion (mergeBy={merge_by})...")
+        
+        if events is None:
+            events = self.simulator.stream_events(session_count)
+        
+        def write_window(batch: List[Dict[str, Any]]) -> None:
+            groups = self._dedupe_by_merge_key(batch, merge_by)
+            record_count = sum(len(records) for records in groups.values())
+            self.stats["duplicates_collapsed"] += len(batch) - record_count
+            for label, records in groups.items():
+                self._bulk_upsert(label, list(records.items()), merge_by, max_retries, retry_backoff)
+            self.stats["events_processed"] += len(batch)
+            self.stats["batches_committed"] += 1
+            buffer.task_done()
+            print(f"[BATCH] Upserted window {self.stats['batches_committed']}: "
+                  f"{len(batch)} events as {record_count} records")
+        
+        for event_data in events:
+            if self.stream_delay:
+                time.sleep(self.stream_delay)
+            for batch in buffer.poll() + buffer.add(event_data):
+                write_window(batch)
+        for batch in buffer.flush():
+            write_window(batch)
+        
+        events_in = self.stats["events_processed"]
+        self.stats["duration_seconds"] = time.time() - self.stats["start_time"]
+        self.stats["write_amplification_avoided"] = {
+            "per_event_calls": events_in,
+            "actual_calls": self.stats["write_calls"],
+            "calls_avoided": events_in - self.stats["write_calls"],
+            "records_avoided": events_in - self.stats["records_written"],
+            "call_reduction": round(events_in / self.stats["write_calls"], 2) if self.stats["write_calls"] else 0.0,
+        }
+        
+        print(f"[STREAM] Bulk upsert completed: {events_in} events -> "
+              f"{self.stats['records_written']} records in {self.stats['write_calls']} calls, "
+              f"{self.stats['errors']} failed keys")
+        
+        return self.stats
+    
+    @staticmethod
+    def _dedupe_by_merge_key(
+        batch: List[Dict[str, Any]],
+        merge_by: List[str],
+    ) -> Dict[str, Dict[Any, Dict[str, Any]]]:
+        """Group a window by label and collapse events that share a merge key."""
+        groups: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+        for position, event_data in enumerate(batch):
+            data = event_data["data"]
+            if all(field in data for field in merge_by):
+                key = tuple(json.dumps(data[field], sort_keys=True, default=str) for field in merge_by)
+            else:
+                # Without a complete key the event cannot be matched; keep it as-is
+                key = ("__unkeyed__", position)
+            records = groups.setdefault(event_data["label"], {})
+            records[key] = {**records[key], **data} if key in records else data
+        return groups
+    
+    def _bulk_upsert(
+        self,
+        label: str,
+        items: List[Any],
+        merge_by: List[str],
+        max_retries: int,
+        retry_backoff: float,
+    ) -> None:
+        """Write (key, record) items with grouped upserts, bisecting on failure."""
+        pending = [(items, 0)]
+        while pending:
+            group, attempt = pending.pop()
+            self.stats["write_calls"] += 1
+            if attempt or len(group) < len(items):
+                self.stats["retried_calls"] += 1
+            try:
+                self.db.records.create_many(
+                    label=label,
+                    data=[record for _, record in group],
+                    options={"mergeBy": merge_by, "mergeStrategy": "append"}
+                )
+                self.stats["records_written"] += len(group)
+            except Exception as e:
+                if len(group) > 1:
+                    middle = len(group) // 2
+                    pending.append((group[middle:], 0))
+                    pending.append((group[:middle], 0))
+                elif attempt < max_retries:
+                    time.sleep(retry_backoff * (2 ** attempt))
+                    pending.append((group, attempt + 1))
+                else:
+                    key = group[0][0]
+                    self.stats["errors"] += 1
+                    self.stats["failed_keys"].append({"label": label, "key": list(key)})
+                    print(f"[ERROR] Failed to upsert {label} {key} after {max_retries} retries: {e}")
+    
     def get_stats(self) -> Dict[str, Any]:
         """Return current pipeline statistics."""
         return self.stats.copy()
@@ -247,6 +568,9 @@ def run_pipeline():
     # Configuration
     batch_size = int(os.getenv("BATCH_SIZE", "10"))
     stream_delay = float(os.getenv("STREAM_DELAY", "0.1"))
+    max_batch_bytes = int(os.getenv("MAX_BATCH_BYTES", "0")) or None
+    max_batch_latency = float(os.getenv("MAX_BATCH_LATENCY", "0")) or None
+    overflow = os.getenv("OVERFLOW_POLICY", "block")
     session_count = int(os.getenv("DEMO_EVENT_COUNT", "50")) // 15  # Estimate sessions from event count
     
     # Initialize and run pipeline
@@ -254,6 +578,9 @@ def run_pipeline():
         api_token=api_token,
         batch_size=batch_size,
         stream_delay=stream_delay,
+        max_batch_bytes=max_batch_bytes,
+        max_batch_latency=max_batch_latency,
+        overflow=overflow,
     )
     
     stats = pipeline.ingest_stream(session_count=session_count)
@@ -10,10 +10,12 @@ In a production environment, this would be replaced by:
 - HTTP webhook endpoints
 - Database change data capture (CDC)
 """
+import json
 import time
 import random
+import threading
 from datetime import datetime, timedelta
-from typing import Generator, List, Dict, Any
+from typing import Callable, Generator, List, Dict, Any, Optional
 from dataclasses import asdict
 
 from models import (
@@ -279,31 +281,203 @@ class BatchEventBuffer:
     
     This reduces the number of API calls and improves throughput
     for high-volume streaming scenarios.
+    
+    A batch is emitted when the first of these limits is hit:
+    
+    - ``batch_size`` events are buffered ("size")
+    - the next event would push the batch past ``max_bytes`` ("bytes")
+    - the oldest buffered event is older than ``max_latency`` seconds ("deadline")
+    
+    Emitted batches count as pending until the consumer calls ``task_done()``.
+    With ``max_pending_batches`` set, a full buffer is not emitted while that
+    many batches are pending: ``overflow="block"`` makes ``add()`` wait for a
+    commit to finish, ``overflow="shed"`` drops incoming events instead. Either
+    way memory stays bounded when downstream commits lag.
+    
+    Deadlines are checked on ``add()`` and ``poll()``; a consumer with an idle
+    source should call ``poll()`` after ``time_until_deadline()`` elapses.
     """
     
-    def __init__(self, batch_size: int = 10):
+    FLUSH_REASONS = ("size", "bytes", "deadline", "final")
+    
+    def __init__(
+        self,
+        batch_size: int = 10,
+        max_bytes: Optional[int] = None,
+        max_latency: Optional[float] = None,
+        max_pending_batches: Optional[int] = None,
+        overflow: str = "block",
+        block_timeout: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if overflow not in ("block", "shed"):
+            raise ValueError(f"overflow must be 'block' or 'shed', got {overflow!r}")
+        
         self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.max_latency = max_latency
+        self.max_pending_batches = max_pending_batches
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.clock = clock
+        
         self.buffer: List[Dict[str, Any]] = []
+        self.buffer_bytes = 0
+        self.oldest_at: Optional[float] = None
+        self.pending_batches = 0
+        self._cond = threading.Condition()
+        
+        self.stats = {
+            "events_added": 0,
+            "events_dropped": 0,
+            "batches_emitted": 0,
+            "flush_reasons": {reason: 0 for reason in self.FLUSH_REASONS},
+            "blocked_seconds": 0.0,
+            "max_queue_depth": 0,
+            "max_buffered_bytes": 0,
+            "max_flush_latency": 0.0,
+            "total_flush_latency": 0.0,
+        }
+    
+    @staticmethod
+    def _event_size(event: Dict[str, Any]) -> int:
+        """Approximate wire size of an event in bytes."""
+        return len(json.dumps(event, default=str).encode("utf-8"))
+    
+    def _full_reason(self, incoming_bytes: int = 0) -> Optional[str]:
+        if len(self.buffer) >= self.batch_size:
+            return "size"
+        if self.max_bytes and self.buffer and self.buffer_bytes + incoming_bytes > self.max_bytes:
+            return "bytes"
+        return None
+    
+    def _deadline_passed(self, now: float) -> bool:
+        return (
+            self.max_latency is not None
+            and self.oldest_at is not None
+            and now - self.oldest_at >= self.max_latency
+        )
+    
+    def _reserve(self, block: bool) -> bool:
+        """Claim a pending-batch slot; False if none is free and not blocking."""
+        if self.max_pending_batches is None or self.pending_batches < self.max_pending_batches:
+            return True
+        if not block:
+            return False
+        
+        started = self.clock()
+        deadline = None if self.block_timeout is None else started + self.block_timeout
+        while self.pending_batches >= self.max_pending_batches:
+            remaining = None if deadline is None else deadline - self.clock()
+            if remaining is not None and remaining <= 0:
+                self.stats["blocked_seconds"] += self.clock() - started
+                raise TimeoutError(
+                    f"Downstream commits lagging: {self.pending_batches} batches pending "
+                    f"after waiting {self.block_timeout}s"
+                )
+            self._cond.wait(remaining)
+        self.stats["blocked_seconds"] += self.clock() - started
+        return True
+    
+    def _emit(self, reason: str, now: float) -> List[Dict[str, Any]]:
+        batch = self.buffer
+        if self.oldest_at is not None:
+            latency = now - self.oldest_at
+            self.stats["total_flush_latency"] += latency
+            self.stats["max_flush_latency"] = max(self.stats["max_flush_latency"], latency)
+        self.buffer = []
+        self.buffer_bytes = 0
+        self.oldest_at = None
+        self.pending_batches += 1
+        self.stats["batches_emitted"] += 1
+        self.stats["flush_reasons"][reason] += 1
+        return batch
+    
+    def _take_due(self, now: float) -> List[List[Dict[str, Any]]]:
+        """Emit the buffer if it is full or past its deadline and a slot is free."""
+        if not self.buffer:
+            return []
+        reason = self._full_reason()
+        if reason is None and self._deadline_passed(now):
+            reason = "deadline"
+        if reason and self._reserve(block=False):
+            return [self._emit(reason, now)]
+        return []
     
     def add(self, event: Dict[str, Any]) -> List[List[Dict[str, Any]]]:
         """
         Add an event to the buffer.
         
-        Returns completed batches when buffer reaches batch_size.
+        Returns completed batches when a size, byte or deadline limit is hit.
+        May block (or drop the event) when ``max_pending_batches`` is reached.
         """
-        self.buffer.append(event)
+        size = self._event_size(event) if self.max_bytes else 0
         
-        if len(self.buffer) >= self.batch_size:
-            batches = [self.buffer]
-            self.buffer = []
+        with self._cond:
+            now = self.clock()
+            batches = self._take_due(now)
+            
+            reason = self._full_reason(size)
+            if reason:
+                if not self._reserve(block=self.overflow == "block"):
+                    self.stats["events_dropped"] += 1
+                    return batches
+                now = self.clock()
+                batches.append(self._emit(reason, now))
+            
+            if not self.buffer:
+                self.oldest_at = now
+            self.buffer.append(event)
+            self.buffer_bytes += size
+            self.stats["events_added"] += 1
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], len(self.buffer))
+            self.stats["max_buffered_bytes"] = max(self.stats["max_buffered_bytes"], self.buffer_bytes)
+            
+            if len(self.buffer) >= self.batch_size and self._reserve(block=self.overflow == "block"):
+                batches.append(self._emit("size", self.clock()))
+            
             return batches
-        
-        return []
+    
+    def poll(self) -> List[List[Dict[str, Any]]]:
+        """Return any batch whose deadline has passed (or that is full) without adding."""
+        with self._cond:
+            return self._take_due(self.clock())
+    
+    def time_until_deadline(self) -> Optional[float]:
+        """Seconds until the buffered batch is due, or None if nothing is waiting on a deadline."""
+        with self._cond:
+            if self.max_latency is None or self.oldest_at is None:
+                return None
+            return max(0.0, self.oldest_at + self.max_latency - self.clock())
+    
+    def task_done(self) -> None:
+        """Mark one emitted batch as committed, releasing a pending slot."""
+        with self._cond:
+            self.pending_batches = max(0, self.pending_batches - 1)
+            self._cond.notify_all()
     
     def flush(self) -> List[List[Dict[str, Any]]]:
         """Flush any remaining events as a final batch."""
-        if self.buffer:
-            batches = [self.buffer]
-            self.buffer = []
-            return batches
-        return []
+        with self._cond:
+            if self.buffer:
+                return [self._emit("final", self.clock())]
+            return []
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Queue-depth, flush-reason and backpressure metrics."""
+        with self._cond:
+            batches = self.stats["batches_emitted"]
+            return {
+                "queue_depth": len(self.buffer),
+                "buffered_bytes": self.buffer_bytes,
+                "pending_batches": self.pending_batches,
+                "events_added": self.stats["events_added"],
+                "events_dropped": self.stats["events_dropped"],
+                "batches_emitted": batches,
+                "flush_reasons": dict(self.stats["flush_reasons"]),
+                "blocked_seconds": round(self.stats["blocked_seconds"], 4),
+                "max_queue_depth": self.stats["max_queue_depth"],
+                "max_buffered_bytes": self.stats["max_buffered_bytes"],
+                "max_flush_latency": round(self.stats["max_flush_latency"], 4),
+                "avg_flush_latency": round(self.stats["total_flush_latency"] / batches, 4) if batches else 0.0,
+            }
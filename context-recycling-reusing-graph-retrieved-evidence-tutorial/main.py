@@ -10,7 +10,6 @@ applications like conversational AI or complex query pipelines.
 import os
 import json
 import time
-import hashlib
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field, asdict
 from typing import Optional
@@ -52,11 +51,12 @@ class EvidenceRecord:
 
 
 @dataclass
-class CachedEvidence:
-    """A cached subgraph evidence unit."""
+class CachedEntity:
+    """A single cached entity: the node's own data, shared by every query that touches it."""
     cache_key: str
-    entity_ids: list  # List of entity IDs this evidence covers
-    evidence: list[EvidenceRecord]
+    entity_id: str
+    entity_type: str
+    data: dict
     version: int
     created_at: str
     expires_at: str
@@ -67,15 +67,19 @@ class CachedEvidence:
         """Check if cache entry has expired."""
         expiry = datetime.fromisoformat(self.expires_at)
         return datetime.utcnow() > expiry
+
+
+@dataclass
+class CachedNeighborhood:
+    """The relationships around an anchor entity, as entity IDs only."""
+    anchor_id: str
+    links: list  # [{"entity_id", "entity_type", "rel_type"}]
+    expires_at: str
     
     @property
-    def is_partial_match(self) -> bool:
-        """Check if this is a partial cache hit (some entities missing)."""
-        return len(self.entity_ids) > 0 and len(self.evidence) < len(self.entity_ids)
-    
-    def to_llm_context(self) -> str:
-        """Format all evidence for LLM context."""
-        return "\n\n".join([e.to_llm_context() for e in self.evidence])
+    def is_expired(self) -> bool:
+        expiry = datetime.fromisoformat(self.expires_at)
+        return datetime.utcnow() > expiry
 
 
 @dataclass
@@ -108,102 +112,131 @@ class ContextCache:
     """
     Entity-based context cache for graph-retrieved evidence.
     
-    This cache uses graph relationships as the cache key pattern.
-    When you retrieve evidence about Entity A and its connections,
-    subsequent queries about Entity A can reuse that cached evidence.
+    Evidence is stored per entity rather than per query: each node's data is
+    cached once, and the neighborhood of an anchor entity is cached as a list
+    of entity IDs. A query about Project A and a later query about one of its
+    team members share the employee, project and document entries, so the
+    second query only fetches entities it has not seen yet.
     """
     
     def __init__(self, db: RushDB):
         self.db = db
-        self._memory_cache: dict[str, CachedEvidence] = {}
+        self._entities: dict[str, CachedEntity] = {}
+        self._neighborhoods: dict[str, CachedNeighborhood] = {}
+        self._names: dict[tuple[str, str], str] = {}
         self._cache_version = 1
+        self.entity_hits = 0
+        self.entity_misses = 0
     
-    def _generate_cache_key(self, entity_type: str, entity_ids: list[str]) -> str:
-        """Generate a deterministic cache key from entity identifiers."""
-        # Sort IDs for consistent key generation
-        sorted_ids = sorted(set(entity_ids))
-        key_data = f"{entity_type}:{','.join(sorted_ids)}:v{self._cache_version}"
-        key_hash = hashlib.md5(key_data.encode()).hexdigest()[:12]
-        return f"evidence:{entity_type}:{key_hash}"
+    def _generate_cache_key(self, entity_type: str, entity_id: str) -> str:
+        """Generate a deterministic cache key for one entity."""
+        return f"evidence:{entity_type}:{entity_id}:v{self._cache_version}"
     
-    def get(self, entity_type: str, entity_ids: list[str]) -> Optional[CachedEvidence]:
-        """
-        Retrieve cached evidence for given entities.
-        
-        Returns:
-            CachedEvidence if found and not expired, None otherwise.
-        """
-        cache_key = self._generate_cache_key(entity_type, entity_ids)
-        cached = self._memory_cache.get(cache_key)
-        
-        if cached is None:
-            return None
-        
-        # Check expiration
-        if cached.is_expired:
-            del self._memory_cache[cache_key]
+    def _expires_at(self) -> str:
+        return (datetime.utcnow() + timedelta(seconds=CACHE_TTL)).isoformat()
+    
+    def _live_entity(self, entity_id: str) -> Optional[CachedEntity]:
+        cached = self._entities.get(entity_id)
+        if cached is not None and cached.is_expired:
+            del self._entities[entity_id]
             return None
-        
-        # Increment hit count for metrics
-        cached.hit_count += 1
         return cached
     
-    def get_partial(self, entity_type: str, requested_ids: list[str], 
-                    cached_ids: list[str]) -> tuple[list, list]:
+    def get_partial(self, entity_type: str,
+                    requested_ids: list[str]) -> tuple[dict[str, CachedEntity], list[str]]:
         """
-        Get partial cache match - separates fresh from stale entity IDs.
+        Split requested entities into cached ones and ones to fetch from the graph.
+        
+        Hits and misses are counted per entity, so a request for ten
+        entities with eight cached scores eight hits and two misses.
         
         Returns:
-            Tuple of (cached_ids, missing_ids) to fetch from graph.
+            Tuple of ({entity_id: CachedEntity}, missing_ids), in request order.
         """
-        cached_set = set(cached_ids)
-        requested_set = set(requested_ids)
-        
-        cached = list(requested_set & cached_set)
-        missing = list(requested_set - cached_set)
-        
+        cached = {}
+        missing = []
+        for entity_id in dict.fromkeys(requested_ids):
+            entry = self._live_entity(entity_id)
+            if entry is None:
+                missing.append(entity_id)
+            else:
+                entry.hit_count += 1
+                cached[entity_id] = entry
+        
+        self.entity_hits += len(cached)
+        self.entity_misses += len(missing)
         return cached, missing
     
-    def set(self, entity_type: str, entity_ids: list[str], 
-            evidence: list[EvidenceRecord]) -> CachedEvidence:
+    def set(self, entity_type: str, entity_id: str, data: dict) -> CachedEntity:
         """
-        Store evidence in the cache.
+        Store one entity's data in the cache.
         """
-        cache_key = self._generate_cache_key(entity_type, entity_ids)
-        
-        now = datetime.utcnow()
-        expires = now + timedelta(seconds=CACHE_TTL)
-        
-        cached = CachedEvidence(
-            cache_key=cache_key,
-            entity_ids=entity_ids,
-            evidence=evidence,
+        cached = CachedEntity(
+            cache_key=self._generate_cache_key(entity_type, entity_id),
+            entity_id=entity_id,
+            entity_type=entity_type,
+            data=data,
             version=self._cache_version,
-            created_at=now.isoformat(),
-            expires_at=expires.isoformat(),
+            created_at=datetime.utcnow().isoformat(),
+            expires_at=self._expires_at(),
         )
-        
-        self._memory_cache[cache_key] = cached
+        self._entities[entity_id] = cached
+        if "name" in data:
+            self._names[(entity_type, data["name"])] = entity_id
+        return cached
+    
+    def resolve_name(self, entity_type: str, name: str) -> Optional[str]:
+        """ID of a cached entity with this exact name, if any."""
+        entity_id = self._names.get((entity_type, name))
+        if entity_id is not None and self._live_entity(entity_id) is None:
+            del self._names[(entity_type, name)]
+            return None
+        return entity_id
+    
+    def get_neighborhood(self, anchor_id: str) -> Optional[CachedNeighborhood]:
+        """Cached relationship links around an anchor entity."""
+        cached = self._neighborhoods.get(anchor_id)
+        if cached is not None and cached.is_expired:
+            del self._neighborhoods[anchor_id]
+            return None
+        return cached
+    
+    def set_neighborhood(self, anchor_id: str, links: list[dict]) -> CachedNeighborhood:
+        cached = CachedNeighborhood(anchor_id=anchor_id, links=links, expires_at=self._expires_at())
+        self._neighborhoods[anchor_id] = cached
         return cached
     
-    def invalidate(self, entity_type: str, entity_ids: list[str]) -> bool:
-        """Invalidate specific cache entries."""
-        cache_key = self._generate_cache_key(entity_type, entity_ids)
-        if cache_key in self._memory_cache:
-            del self._memory_cache[cache_key]
-            return True
-        return False
+    def invalidate(self, entity_type: str, entity_ids: list[str]) -> int:
+        """
+        Invalidate specific entities and the neighborhoods anchored at them.
+        
+        Returns the number of entities removed. Other cached entities stay,
+        so the next query refetches only what was invalidated.
+        """
+        removed = 0
+        for entity_id in entity_ids:
+            if self._entities.pop(entity_id, None) is not None:
+                removed += 1
+            self._neighborhoods.pop(entity_id, None)
+        stale = set(entity_ids)
+        self._names = {key: value for key, value in self._names.items() if value not in stale}
+        return removed
     
     def invalidate_all(self):
         """Clear entire cache."""
-        self._memory_cache.clear()
+        self._entities.clear()
+        self._neighborhoods.clear()
+        self._names.clear()
     
     def get_stats(self) -> dict:
         """Get cache statistics."""
-        total_hits = sum(e.hit_count for e in self._memory_cache.values())
+        lookups = self.entity_hits + self.entity_misses
         return {
-            "entries": len(self._memory_cache),
-            "total_hits": total_hits,
+            "entries": len(self._entities),
+            "neighborhoods": len(self._neighborhoods),
+            "total_hits": self.entity_hits,
+            "entity_misses": self.entity_misses,
+            "hit_rate": self.entity_hits / lookups if lookups else 0.0,
             "version": self._cache_version,
         }
 
@@ -212,6 +245,14 @@ class ContextCache:
 # Graph Retrieval with Context Recycling
 # =============================================================================
 
+# Relationships that make up an anchor entity's evidence:
+# (relationship type, direction from the anchor, neighbor label)
+NEIGHBORHOODS = {
+    "PROJECT": [("WORKS_ON", "in", "EMPLOYEE"), ("HAS_DOC", "out", "DOCUMENT")],
+    "EMPLOYEE": [("WORKS_ON", "out", "PROJECT"), ("AUTHORED_BY", "in", "DOCUMENT")],
+}
+
+
 class EvidenceRetriever:
     """
     Retrieves subgraph evidence with context recycling support.
@@ -221,6 +262,10 @@ class EvidenceRetriever:
     2. Partial cache hit handling
     3. Full graph traversal when needed
     4. Metrics collection
+    
+    A retrieval costs at most three round-trips: resolve the anchor by
+    name, load its relationship links, and fetch the entities not already
+    in the cache in one batched query. Each step is skipped when cached.
     """
     
     def __init__(self, db: RushDB):
@@ -228,213 +273,172 @@ class EvidenceRetriever:
         self.cache = ContextCache(db)
         self._traversal_count = 0
     
-    def retrieve_project_evidence(self, project_name: str) -> tuple[list[EvidenceRecord], RetrievalMetrics]:
+    def _find_anchor(self, entity_type: str, name: str,
+                     where: dict) -> tuple[Optional[str], Optional[dict]]:
         """
-        Retrieve evidence for a project and its related entities.
+        Resolve an entity by name.
         
-        This demonstrates the core context recycling pattern:
-        1. Check cache for existing evidence
-        2. If miss, traverse graph to build evidence
-        3. Store evidence in cache
-        4. Return evidence with metrics
+        Returns (entity_id, data); data is None when the ID came from the
+        cache, and the fetched record otherwise.
         """
-        start_time = time.perf_counter()
-        self._traversal_count = 0
+        entity_id = self.cache.resolve_name(entity_type, name)
+        if entity_id is not None:
+            return entity_id, None
         
-        # Find the project
-        projects = self.db.records.find({
-            "labels": ["PROJECT"],
-            "where": {"name": project_name}
-        })
-        
-        if projects.total == 0:
-            return [], RetrievalMetrics(
-                cache_status="MISS",
-                graph_traversals=0,
-                cache_hits=0,
-                latency_ms=0,
-                evidence_count=0,
-                cached_count=0,
-                fresh_count=0,
-            )
-        
-        project = projects.data[0]
-        project_id = project.id
-        
-        # Check cache first
-        cached = self.cache.get("PROJECT", [project_id])
-        
-        if cached:
-            # Cache HIT - return cached evidence immediately
-            latency_ms = (time.perf_counter() - start_time) * 1000
-            return cached.evidence, RetrievalMetrics(
-                cache_status="HIT",
-                graph_traversals=0,
-                cache_hits=1,
-                latency_ms=latency_ms,
-                evidence_count=len(cached.evidence),
-                cached_count=len(cached.evidence),
-                fresh_count=0,
-            )
-        
-        # Cache MISS - build evidence through graph traversal
-        evidence = []
-        
-        # 1. Get project details
         self._traversal_count += 1
-        evidence.append(EvidenceRecord(
-            entity_id=project_id,
-            entity_type="PROJECT",
-            entity_label="PROJECT",
-            data=project.fields,
-            relationships=[],
-        ))
+        results = self.db.records.find({"labels": [entity_type], "where": where})
+        if results.total == 0:
+            return None, None
+        record = results.data[0]
+        return record.id, record.fields
+    
+    def _load_neighborhood(self, anchor_type: str, anchor_id: str) -> list[dict]:
+        """Relationship links around the anchor, from cache or one relationships query."""
+        cached = self.cache.get_neighborhood(anchor_id)
+        if cached is not None:
+            return cached.links
+        
+        specs = NEIGHBORHOODS[anchor_type]
+        clauses = []
+        for rel_type, direction, _ in specs:
+            side = "targetId" if direction == "in" else "sourceId"
+            clauses.append({"type": rel_type, side: anchor_id})
         
-        # 2. Find team members working on this project
         self._traversal_count += 1
-        team_members = self.db.records.find({
-            "labels": ["EMPLOYEE"],
-            "where": {"PROJECT": {"$relation": {"type": "WORKS_ON", "direction": "out"}}},
+        edges = self.db.relationships.find({"where": {"$or": clauses}, "limit": 1000})
+        
+        links = []
+        for edge in edges.data:
+            for rel_type, direction, neighbor_type in specs:
+                if edge.get("type") != rel_type:
+                    continue
+                if direction == "in" and edge.get("targetId") == anchor_id:
+                    links.append({"entity_id": edge.get("sourceId"), "entity_type": neighbor_type, "rel_type": rel_type})
+                elif direction == "out" and edge.get("sourceId") == anchor_id:
+                    links.append({"entity_id": edge.get("targetId"), "entity_type": neighbor_type, "rel_type": rel_type})
+        
+        self.cache.set_neighborhood(anchor_id, links)
+        return links
+    
+    def _fetch_entities(self, types: dict[str, str], missing: list[str]) -> dict[str, dict]:
+        """Fetch all missing entities in one query and cache them individually."""
+        self._traversal_count += 1
+        results = self.db.records.find({
+            "labels": sorted({types[entity_id] for entity_id in missing}),
+            "where": {"$id": {"$in": missing}},
+            "limit": len(missing),
         })
+        fetched = {}
+        for record in results.data:
+            self.cache.set(types[record.id], record.id, record.fields)
+            fetched[record.id] = record.fields
+        return fetched
+    
+    def _retrieve(self, anchor_type: str, anchor_id: str, start_time: float,
+                  anchor_data: Optional[dict] = None) -> tuple[list[EvidenceRecord], RetrievalMetrics]:
+        """
+        Assemble evidence for an anchor and its neighborhood.
+        
+        This demonstrates the core context recycling pattern:
+        1. Look up the anchor's neighborhood (cached links or one query)
+        2. Split the entities into cached and missing
+        3. Fetch only the missing entities and cache each one
+        4. Return merged evidence with per-entity metrics
+        """
+        links = self._load_neighborhood(anchor_type, anchor_id)
+        types = {anchor_id: anchor_type}
+        for link in links:
+            types.setdefault(link["entity_id"], link["entity_type"])
+        
+        data = {}
+        fresh = 0
+        requested = list(types)
+        if anchor_data is not None:
+            # Already fetched while resolving the anchor by name
+            self.cache.set(anchor_type, anchor_id, anchor_data)
+            data[anchor_id] = anchor_data
+            fresh += 1
+            requested.remove(anchor_id)
+        
+        cached, missing = self.cache.get_partial(anchor_type, requested)
+        data.update({entity_id: entry.data for entity_id, entry in cached.items()})
+        if missing:
+            data.update(self._fetch_entities(types, missing))
+        fresh += len(missing)
         
-        employee_records = []
-        for member in team_members.data:
-            self._traversal_count += 1
-            employee_records.append(member)
+        evidence = []
+        if anchor_id in data:
             evidence.append(EvidenceRecord(
-                entity_id=member.id,
-                entity_type="EMPLOYEE",
-                entity_label="EMPLOYEE",
-                data=member.fields,
-                relationships=[{"type": "WORKS_ON", "target_id": project_id, "target_label": "PROJECT"}],
+                entity_id=anchor_id,
+                entity_type=anchor_type,
+                entity_label=anchor_type,
+                data=data[anchor_id],
+                relationships=[],
             ))
-        
-        # 3. Find project documents
-        self._traversal_count += 1
-        docs = self.db.records.find({
-            "labels": ["DOCUMENT"],
-            "where": {"PROJECT": {"$relation": {"type": "HAS_DOC", "direction": "in"}}},
-        })
-        
-        for doc in docs.data:
-            self._traversal_count += 1
+        for link in links:
+            entity_id = link["entity_id"]
+            if entity_id not in data:
+                continue
             evidence.append(EvidenceRecord(
-                entity_id=doc.id,
-                entity_type="DOCUMENT",
-                entity_label="DOCUMENT",
-                data=doc.fields,
-                relationships=[{"type": "HAS_DOC", "target_id": project_id, "target_label": "PROJECT"}],
+                entity_id=entity_id,
+                entity_type=link["entity_type"],
+                entity_label=link["entity_type"],
+                data=data[entity_id],
+                relationships=[{"type": link["rel_type"], "target_id": anchor_id, "target_label": anchor_type}],
             ))
         
-        # Cache the evidence
-        entity_ids = [project_id] + [e.id for e in employee_records]
-        self.cache.set("PROJECT", entity_ids, evidence)
+        if not fresh:
+            status = "HIT"
+        elif not cached:
+            status = "MISS"
+        else:
+            status = "PARTIAL"
         
         latency_ms = (time.perf_counter() - start_time) * 1000
         return evidence, RetrievalMetrics(
-            cache_status="MISS",
+            cache_status=status,
             graph_traversals=self._traversal_count,
-            cache_hits=0,
+            cache_hits=len(cached),
             latency_ms=latency_ms,
             evidence_count=len(evidence),
-            cached_count=0,
-            fresh_count=len(evidence),
+            cached_count=len(cached),
+            fresh_count=fresh,
         )
     
+    def retrieve_project_evidence(self, project_name: str) -> tuple[list[EvidenceRecord], RetrievalMetrics]:
+        """
+        Retrieve evidence for a project and its related entities.
+        """
+        start_time = time.perf_counter()
+        self._traversal_count = 0
+        
+        project_id, project_data = self._find_anchor("PROJECT", project_name, {"name": project_name})
+        if project_id is None:
+            return [], RetrievalMetrics("MISS", self._traversal_count, 0, 0, 0, 0, 0)
+        
+        return self._retrieve("PROJECT", project_id, start_time, project_data)
+    
     def retrieve_employee_evidence(self, employee_name: str = None, 
                                    employee_id: str = None) -> tuple[list[EvidenceRecord], RetrievalMetrics]:
         """
         Retrieve evidence for an employee and their work.
+        
+        An employee ID needs no lookup: if the employee is not cached yet it
+        is fetched together with the other missing entities.
         """
         start_time = time.perf_counter()
         self._traversal_count = 0
         
-        # Find the employee
-        if employee_id:
-            employee = self.db.records.find_by_id(employee_id)
-        else:
-            employees = self.db.records.find({
-                "labels": ["EMPLOYEE"],
-                "where": {"name": {"$contains": employee_name}} if employee_name else {}
-            })
-            if employees.total == 0:
-                return [], RetrievalMetrics("MISS", 0, 0, 0, 0, 0, 0)
-            employee = employees.data[0]
-        
-        emp_id = employee.id
-        
-        # Check cache
-        cached = self.cache.get("EMPLOYEE", [emp_id])
-        if cached:
-            latency_ms = (time.perf_counter() - start_time) * 1000
-            return cached.evidence, RetrievalMetrics(
-                cache_status="HIT",
-                graph_traversals=0,
-                cache_hits=1,
-                latency_ms=latency_ms,
-                evidence_count=len(cached.evidence),
-                cached_count=len(cached.evidence),
-                fresh_count=0,
+        employee_data = None
+        if not employee_id:
+            employee_id, employee_data = self._find_anchor(
+                "EMPLOYEE", employee_name or "",
+                {"name": {"$contains": employee_name}} if employee_name else {},
             )
+            if employee_id is None:
+                return [], RetrievalMetrics("MISS", self._traversal_count, 0, 0, 0, 0, 0)
         
-        # Build evidence
-        evidence = []
-        self._traversal_count += 1
-        evidence.append(EvidenceRecord(
-            entity_id=emp_id,
-            entity_type="EMPLOYEE",
-            entity_label="EMPLOYEE",
-            data=employee.fields,
-            relationships=[],
-        ))
-        
-        # Find their projects
-        self._traversal_count += 1
-        projects = self.db.records.find({
-            "labels": ["PROJECT"],
-            "where": {"EMPLOYEE": {"$relation": {"type": "WORKS_ON", "direction": "in"}}},
-        })
-        
-        for proj in projects.data:
-            self._traversal_count += 1
-            evidence.append(EvidenceRecord(
-                entity_id=proj.id,
-                entity_type="PROJECT",
-                entity_label="PROJECT",
-                data=proj.fields,
-                relationships=[{"type": "WORKS_ON", "target_id": emp_id, "target_label": "EMPLOYEE"}],
-            ))
-        
-        # Find their documents
-        self._traversal_count += 1
-        docs = self.db.records.find({
-            "labels": ["DOCUMENT"],
-            "where": {"EMPLOYEE": {"$relation": {"type": "AUTHORED_BY", "direction": "in"}}},
-        })
-        
-        for doc in docs.data:
-            self._traversal_count += 1
-            evidence.append(EvidenceRecord(
-                entity_id=doc.id,
-                entity_type="DOCUMENT",
-                entity_label="DOCUMENT",
-                data=doc.fields,
-                relationships=[{"type": "AUTHORED_BY", "target_id": emp_id, "target_label": "EMPLOYEE"}],
-            ))
-        
-        # Cache evidence
-        self.cache.set("EMPLOYEE", [emp_id], evidence)
-        
-        latency_ms = (time.perf_counter() - start_time) * 1000
-        return evidence, RetrievalMetrics(
-            cache_status="MISS",
-            graph_traversals=self._traversal_count,
-            cache_hits=0,
-            latency_ms=latency_ms,
-            evidence_count=len(evidence),
-            cached_count=0,
-            fresh_count=len(evidence),
-        )
+        return self._retrieve("EMPLOYEE", employee_id, start_time, employee_data)
     
     def handle_partial_hit(self, project_name: str, 
                           stale_entity_ids: list[str]) -> tuple[list[EvidenceRecord], RetrievalMetrics]:
@@ -442,53 +446,11 @@ class EvidenceRetriever:
         Handle partial cache hit - some entities are stale, need refresh.
         
         This is called when we know some context is cached but may be outdated.
-        We fetch only the missing/fresh data and merge with cache.
+        Only the stale entities are dropped, so the retrieval fetches just
+        those from the graph and merges them with the rest of the cache.
         """
-        start_time = time.perf_counter()
-        self._traversal_count = 0
-        
-        # Get fresh evidence for the main project
-        fresh_evidence, _ = self.retrieve_project_evidence(project_name)
-        
-        # In a real implementation, we would:
-        # 1. Fetch only the stale entity IDs from the graph
-        # 2. Merge with cached data
-        # 3. Update cache with merged result
-        # 4. Return merged evidence
-        
-        # For demo, we'll simulate partial by fetching fresh and combining
-        cached = self.cache.get("PROJECT", stale_entity_ids)
-        if cached:
-            # Merge cached and fresh
-            all_evidence = fresh_evidence + cached.evidence
-            # Deduplicate by entity_id
-            seen = set()
-            merged = []
-            for e in all_evidence:
-                if e.entity_id not in seen:
-                    seen.add(e.entity_id)
-                    merged.append(e)
-            
-            latency_ms = (time.perf_counter() - start_time) * 1000
-            return merged, RetrievalMetrics(
-                cache_status="PARTIAL",
-                graph_traversals=self._traversal_count,
-                cache_hits=1,
-                latency_ms=latency_ms,
-                evidence_count=len(merged),
-                cached_count=len(cached.evidence),
-                fresh_count=len(fresh_evidence),
-            )
-        
-        return fresh_evidence, RetrievalMetrics(
-            cache_status="PARTIAL",
-            graph_traversals=self._traversal_count,
-            cache_hits=0,
-            latency_ms=latency_ms,
-            evidence_count=len(fresh_evidence),
-            cached_count=0,
-            fresh_count=len(fresh_evidence),
-        )
+        self.cache.invalidate("PROJECT", stale_entity_ids)
+        return self.retrieve_project_evidence(project_name)
 
 
 # =============================================================================
@@ -688,13 +650,28 @@ def run_demo():
         
         employee_evidence, emp_metrics = retriever.retrieve_employee_evidence(employee_id=emp_evidence.entity_id)
         
-        if emp_metrics.cache_status == "HIT":
-            print(f"   ✅ Cache HIT for employee")
-        else:
-            print(f"   ❄️  Cache MISS - Retrieved employee evidence")
+        status_text = {
+            "HIT": "✅ Cache HIT - every entity already cached",
+            "PARTIAL": "🔄 Cache PARTIAL - project and team reused, only new entities fetched",
+            "MISS": "❄️  Cache MISS - Retrieved employee evidence",
+        }
+        print(f"   {status_text[emp_metrics.cache_status]}")
         print(f"   🔍 Graph traversals: {emp_metrics.graph_traversals}")
+        print(f"   📦 Evidence: {emp_metrics.cached_count} reused + {emp_metrics.fresh_count} fresh")
         print(f"   ⏱️  Latency: {emp_metrics.latency_ms:.2f}ms")
     
+    # =========================================================================
+    # Session 6: Partial refresh after an update
+    # =========================================================================
+    print("\n" + "─" * 70)
+    print("📊 SESSION 6: 'Has the deadline changed?' - refresh only the project")
+    print("─" * 70)
+    
+    project_ids = [e.entity_id for e in evidence1 if e.entity_type == "PROJECT"]
+    evidence6, metrics6 = retriever.handle_partial_hit("AI Platform", project_ids)
+    print(f"\n   🔄 Invalidated {len(project_ids)} entity, the rest of the evidence stays cached")
+    print(metrics6)
+    
     # =========================================================================
     # Cache Statistics
     # =========================================================================
@@ -704,7 +681,9 @@ def run_demo():
     
     stats = retriever.cache.get_stats()
     print(f"\n   📊 Total cache entries: {stats['entries']}")
-    print(f"   🔄 Total cache hits: {stats['total_hits']}")
+    print(f"   🕸️  Cached neighborhoods: {stats['neighborhoods']}")
+    print(f"   🔄 Entity hits: {stats['total_hits']}, misses: {stats['entity_misses']} "
+          f"({stats['hit_rate'] * 100:.1f}% hit rate)")
     print(f"   🏷️  Cache version: {stats['version']}")
     print(f"   ⏰ TTL: {CACHE_TTL} seconds")
     
@@ -719,7 +698,8 @@ def run_demo():
       Check cache before graph traversal to avoid redundant work.
    
    2. ENTITY-BASED KEYS
-      Use entity IDs (not query text) as cache keys for precise matching.
+      Cache each entity once, keyed by its ID. Overlapping queries share
+      entries and only fetch the entities they have not seen yet.
    
    3. EVIDENCE REUSE
       Store the retrieved subgraph, not just the result. Future queries
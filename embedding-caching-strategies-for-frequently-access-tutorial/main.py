@@ -3,23 +3,28 @@
 RushDB Embedding Caching Strategies Demo
 
 This script demonstrates various caching strategies for vector embeddings:
-1. LRU cache with configurable size and TTL
-2. Batch pre-computation for popular queries
-3. Cache warming on startup
-4. Statistics tracking for cache optimization
+1. LRU cache with configurable size, memory budget and TTL
+2. Persistent memory-mapped disk tier shared across processes
+3. Batch pre-computation for popular queries
+4. Cache warming on startup
+5. Statistics tracking for cache optimization
 
 Each strategy reduces embedding generation costs and improves search latency.
 """
 
 import json
 import os
+import sqlite3
 import sys
+import threading
 import time
 import hashlib
+from collections import OrderedDict
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 
+import numpy as np
 from dotenv import load_dotenv
 from sentence_transformers import SentenceTransformer
 from cachetools import LRUCache
@@ -35,23 +40,29 @@ load_dotenv()
 class CacheStats:
     """Tracks cache performance metrics."""
     hits: int = 0
+    disk_hits: int = 0
     misses: int = 0
     evictions: int = 0
     total_query_time: float = 0.0
     cache_storage_bytes: int = 0
     
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.disk_hits + self.misses
+    
     @property
     def hit_rate(self) -> float:
-        total = self.hits + self.misses
-        return (self.hits / total * 100) if total > 0 else 0.0
+        total = self.lookups
+        return ((self.hits + self.disk_hits) / total * 100) if total > 0 else 0.0
     
     def to_dict(self) -> Dict[str, Any]:
         return {
             "hits": self.hits,
+            "disk_hits": self.disk_hits,
             "misses": self.misses,
             "evictions": self.evictions,
             "hit_rate": f"{self.hit_rate:.1f}%",
-            "avg_query_ms": (self.total_query_time / (self.hits + self.misses) * 1000) if (self.hits + self.misses) > 0 else 0,
+            "avg_query_ms": (self.total_query_time / self.lookups * 1000) if self.lookups > 0 else 0,
             "storage_kb": self.cache_storage_bytes / 1024
         }
 
@@ -59,18 +70,258 @@ class CacheStats:
 @dataclass
 class CacheEntry:
     """Represents a cached vector with metadata."""
-    vector: List[float]
+    vector: np.ndarray  # float32
     created_at: float
     last_accessed: float
     access_count: int = 0
     query_hash: str = ""
     
+    @property
+    def size_bytes(self) -> int:
+        """Bytes held by the vector buffer and its key."""
+        return self.vector.nbytes + len(self.query_hash)
+    
     def touch(self):
         """Update access metadata."""
         self.last_accessed = time.time()
         self.access_count += 1
 
 
+class DiskVectorTier:
+    """
+    Persistent second cache tier on local disk.
+    
+    Vectors live in a preallocated float32 matrix opened with ``np.memmap``,
+    one row per slot, and a SQLite table maps each query hash to its slot and
+    timestamps. Opening the tier reads nothing up front, so a restarted or
+    newly forked worker starts warm immediately, and every process mapping the
+    same directory shares the OS page cache.
+    
+    TTL is checked against the original ``created_at`` exactly like the
+    in-memory tier, and when all slots are taken the least recently accessed
+    entry is evicted. Writers serialize through SQLite's write lock and never
+    write into a slot that a committed row points at: a write first commits
+    the removal of the key's old row (or the evicted entry's row) and
+    reserves fresh slots, then writes the vectors, then commits the new rows.
+    A reader re-checks the row after copying the vector, so a slot recycled
+    mid-read is reported as a miss rather than returning another key's data.
+    
+    Reads never take the write lock: access times are collected in memory and
+    written with the next write transaction.
+    """
+    
+    def __init__(
+        self,
+        path: str,
+        dim: int = 384,
+        capacity: int = 100_000,
+        ttl_seconds: Optional[float] = None
+    ):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        
+        self._db = sqlite3.connect(
+            str(self.path / "index.sqlite"),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, slot INTEGER UNIQUE NOT NULL, "
+            "created_at REAL NOT NULL, last_accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_accessed)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS free_slots (slot INTEGER PRIMARY KEY)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)")
+        
+        # The matrix shape is fixed by whichever process created the tier
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.execute("INSERT OR IGNORE INTO meta VALUES ('dim', ?)", (dim,))
+            self._db.execute("INSERT OR IGNORE INTO meta VALUES ('capacity', ?)", (capacity,))
+            self._db.execute("INSERT OR IGNORE INTO meta VALUES ('next_slot', 0)")
+            meta = dict(self._db.execute("SELECT name, value FROM meta").fetchall())
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+        if meta["dim"] != dim:
+            raise ValueError(f"Disk tier at {self.path} stores {meta['dim']}-d vectors, not {dim}-d")
+        self.dim = meta["dim"]
+        self.capacity = meta["capacity"]
+        
+        vectors_file = self.path / "vectors.f32"
+        expected_bytes = self.capacity * self.dim * 4
+        if not vectors_file.exists() or vectors_file.stat().st_size < expected_bytes:
+            with open(vectors_file, "ab") as f:
+                f.truncate(expected_bytes)
+        self._vectors = np.memmap(
+            vectors_file, dtype=np.float32, mode="r+", shape=(self.capacity, self.dim)
+        )
+        
+        # key -> last access time, flushed by the next write transaction
+        self._touched: Dict[str, float] = {}
+        self._touched_lock = threading.Lock()
+    
+    def _is_expired(self, created_at: float) -> bool:
+        if self.ttl_seconds is None:
+            return False
+        return time.time() - created_at > self.ttl_seconds
+    
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    
+    def __contains__(self, key: str) -> bool:
+        """Whether a live entry exists; does not touch or expire it."""
+        row = self._db.execute(
+            "SELECT created_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        return row is not None and not self._is_expired(row[0])
+    
+    def get(self, key: str) -> Optional[tuple]:
+        """Return ``(vector, created_at)`` for a live entry, or None."""
+        row = self._db.execute(
+            "SELECT slot, created_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        slot, created_at = row
+        if self._is_expired(created_at):
+            self.delete(key)
+            return None
+        
+        vector = np.array(self._vectors[slot])
+        
+        # Guard against the slot being recycled by another writer mid-read
+        check = self._db.execute(
+            "SELECT slot, created_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if check != row:
+            return None
+        
+        with self._touched_lock:
+            self._touched[key] = time.time()
+        return vector, created_at
+    
+    def _flush_touched(self) -> None:
+        """Write buffered access times. Must run inside a write transaction."""
+        with self._touched_lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            self._db.executemany(
+                "UPDATE entries SET last_accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in touched.items()]
+            )
+    
+    def _allocate_slot(self) -> int:
+        """Pick a slot for a new entry. Must run inside a write transaction."""
+        row = self._db.execute("SELECT slot FROM free_slots LIMIT 1").fetchone()
+        if row:
+            self._db.execute("DELETE FROM free_slots WHERE slot = ?", row)
+            return row[0]
+        
+        next_slot = self._db.execute("SELECT value FROM meta WHERE name = 'next_slot'").fetchone()[0]
+        if next_slot < self.capacity:
+            self._db.execute("UPDATE meta SET value = ? WHERE name = 'next_slot'", (next_slot + 1,))
+            return next_slot
+        
+        # Full: recycle the least recently accessed entry's slot
+        key, slot = self._db.execute(
+            "SELECT key, slot FROM entries ORDER BY last_accessed LIMIT 1"
+        ).fetchone()
+        self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+        return slot
+    
+    def _reserve_slots(self, keys: List[str]) -> List[int]:
+        """
+        Detach ``keys`` from their current slots and reserve one fresh slot
+        per key, committed before any vector is written.
+        """
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._flush_touched()
+            for key in keys:
+                row = self._db.execute("SELECT slot FROM entries WHERE key = ?", (key,)).fetchone()
+                if row:
+                    self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self._db.execute("INSERT OR IGNORE INTO free_slots VALUES (?)", row)
+            slots = [self._allocate_slot() for _ in keys]
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+        return slots
+    
+    def _release_slots(self, slots: List[int]) -> None:
+        """Return reserved slots whose write failed to the free list."""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.executemany("INSERT OR IGNORE INTO free_slots VALUES (?)", [(slot,) for slot in slots])
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+    
+    def put(self, key: str, vector: np.ndarray, created_at: Optional[float] = None) -> None:
+        """Write or replace an entry."""
+        self.put_many([(key, vector, created_at)])
+    
+    def put_many(self, items: List[tuple]) -> None:
+        """Write ``(key, vector, created_at)`` triples with one flush and two short transactions."""
+        # Last write wins for a key repeated in the batch
+        latest = {key: (vector, created_at) for key, vector, created_at in items}
+        if not latest:
+            return
+        keys = list(latest)
+        slots = self._reserve_slots(keys)
+        
+        try:
+            now = time.time()
+            for key, slot in zip(keys, slots):
+                self._vectors[slot] = latest[key][0]
+            self._vectors.flush()
+            
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                for key in keys:
+                    # A concurrent writer may have stored the key meanwhile; free its slot
+                    row = self._db.execute("SELECT slot FROM entries WHERE key = ?", (key,)).fetchone()
+                    if row:
+                        self._db.execute("INSERT OR IGNORE INTO free_slots VALUES (?)", row)
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO entries (key, slot, created_at, last_accessed) VALUES (?, ?, ?, ?)",
+                    [(key, slot, latest[key][1] or now, now) for key, slot in zip(keys, slots)]
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        except Exception:
+            self._release_slots(slots)
+            raise
+    
+    def delete(self, key: str) -> None:
+        """Remove an entry and return its slot to the free list."""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute("SELECT slot FROM entries WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._db.execute("INSERT OR IGNORE INTO free_slots VALUES (?)", row)
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+    
+    def close(self) -> None:
+        self._vectors.flush()
+        self._db.close()
+
+
 class VectorCache:
     """
     LRU cache wrapper for RushDB vector search.
@@ -78,6 +329,16 @@ class VectorCache:
     This cache stores computed query embeddings to avoid re-computation
     on repeated searches. It's designed to reduce latency and API costs
     for frequently-accessed vectors.
+    
+    Entries live in an OrderedDict kept in recency order, so a hit is a
+    constant-time move to the end and eviction pops from the front. Vectors
+    are stored as float32 arrays and the byte total is updated on every
+    insert and removal. Eviction is bounded by ``max_size`` entries and,
+    optionally, by a ``max_bytes`` memory budget.
+    
+    With ``disk_path`` set, a ``DiskVectorTier`` sits behind the LRU: memory
+    misses are looked up on disk and promoted, and newly computed vectors are
+    written to both tiers.
     """
     
     def __init__(
@@ -85,15 +346,25 @@ class VectorCache:
         db: RushDB,
         index_id: str,
         max_size: int = 100,
-        ttl_seconds: Optional[float] = None
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        disk_path: Optional[str] = None,
+        disk_capacity: int = 100_000,
+        dim: int = 384
     ):
         self.db = db
         self.index_id = index_id
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
         
-        # LRU cache for vectors
-        self._cache: Dict[str, CacheEntry] = {}
+        # LRU cache for vectors, least recently used first
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        
+        # Optional persistent tier shared with other processes
+        self.disk = DiskVectorTier(
+            disk_path, dim=dim, capacity=disk_capacity, ttl_seconds=ttl_seconds
+        ) if disk_path else None
         
         # Statistics
         self.stats = CacheStats()
@@ -122,28 +393,95 @@ class VectorCache:
             return False
         return time.time() - entry.created_at > self.ttl_seconds
     
-    def _evict(self) -> None:
-        """Remove least recently used entries when cache is full."""
-        while len(self._cache) >= self.max_size:
-            # Find LRU entry
-            lru_key = None
-            lru_time = float('inf')
-            
-            for key, entry in self._cache.items():
-                if entry.last_accessed < lru_time:
-                    lru_time = entry.last_accessed
-                    lru_key = key
-            
-            if lru_key:
-                del self._cache[lru_key]
-                self.stats.evictions += 1
+    def _remove(self, key: str) -> None:
+        """Drop an entry and release its bytes."""
+        entry = self._cache.pop(key)
+        self.stats.cache_storage_bytes -= entry.size_bytes
+    
+    def _evict(self, incoming_bytes: int = 0) -> None:
+        """Remove least recently used entries until there is room for a new one."""
+        while self._cache and (
+            len(self._cache) >= self.max_size
+            or (
+                self.max_bytes is not None
+                and self.stats.cache_storage_bytes + incoming_bytes > self.max_bytes
+            )
+        ):
+            lru_key = next(iter(self._cache))
+            self._remove(lru_key)
+            self.stats.evictions += 1
+    
+    def _store(self, query_hash: str, vector: np.ndarray, created_at: Optional[float] = None) -> None:
+        """Insert a vector as the most recently used entry."""
+        if query_hash in self._cache:
+            self._remove(query_hash)
+        now = time.time()
+        entry = CacheEntry(
+            vector=vector,
+            created_at=created_at or now,
+            last_accessed=now,
+            query_hash=query_hash
+        )
+        self._evict(entry.size_bytes)
+        self._cache[query_hash] = entry
+        self.stats.cache_storage_bytes += entry.size_bytes
     
-    def _generate_embedding(self, query: str) -> List[float]:
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._cache.clear()
+        self.stats.cache_storage_bytes = 0
+    
+    def _generate_embedding(self, query: str) -> np.ndarray:
         """Generate embedding for a query string."""
-        return self.model.encode(
-            query,
-            normalize_embeddings=True
-        ).tolist()
+        return np.asarray(
+            self.model.encode(query, normalize_embeddings=True),
+            dtype=np.float32
+        )
+    
+    def _lookup(self, query_hash: str) -> Optional[np.ndarray]:
+        """Return a live cached vector from memory or disk, counting the hit."""
+        entry = self._cache.get(query_hash)
+        if entry is not None:
+            # Check expiration
+            if self._is_expired(entry):
+                self._remove(query_hash)
+            else:
+                entry.touch()
+                self._cache.move_to_end(query_hash)
+                self.stats.hits += 1
+                return entry.vector
+        
+        # Memory miss - promote from the disk tier, keeping the original age
+        if self.disk is not None:
+            found = self.disk.get(query_hash)
+            if found is not None:
+                vector, created_at = found
+                self.stats.disk_hits += 1
+                self._store(query_hash, vector, created_at)
+                return vector
+        
+        return None
+    
+    def _is_cached(self, query_hash: str) -> bool:
+        """Whether either tier holds a live vector, without counting or promoting it."""
+        entry = self._cache.get(query_hash)
+        if entry is not None and not self._is_expired(entry):
+            return True
+        return self.disk is not None and query_hash in self.disk
+    
+    def _encode_batch(self, texts: List[str], batch_size: int, pool=None) -> np.ndarray:
+        """Encode many texts in one call, optionally across a process pool."""
+        if pool is not None:
+            vectors = np.asarray(
+                self.model.encode_multi_process(texts, pool, batch_size=batch_size),
+                dtype=np.float32
+            )
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            return vectors / np.maximum(norms, 1e-12)
+        return np.asarray(
+            self.model.encode(texts, batch_size=batch_size, normalize_embeddings=True),
+            dtype=np.float32
+        )
     
     def get_or_compute(self, query: str) -> List[float]:
         """
@@ -157,35 +495,21 @@ class VectorCache:
         """
         query_hash = self._compute_hash(query)
         
-        # Check cache
-        if query_hash in self._cache:
-            entry = self._cache[query_hash]
-            
-            # Check expiration
-            if self._is_expired(entry):
-                del self._cache[query_hash]
-            else:
-                entry.touch()
-                self.stats.hits += 1
-                self.stats.cache_storage_bytes = sum(
-                    len(str(e.vector)) for e in self._cache.values()
-                )
-                return entry.vector
+        # Check memory, then disk
+        vector = self._lookup(query_hash)
+        if vector is not None:
+            return vector.tolist()
         
         # Cache miss - compute embedding
         self.stats.misses += 1
         vector = self._generate_embedding(query)
         
         # Store in cache
-        self._evict()
-        self._cache[query_hash] = CacheEntry(
-            vector=vector,
-            created_at=time.time(),
-            last_accessed=time.time(),
-            query_hash=query_hash
-        )
+        self._store(query_hash, vector)
+        if self.disk is not None:
+            self.disk.put(query_hash, vector, self._cache[query_hash].created_at)
         
-        return vector
+        return vector.tolist()
     
     def search(
         self,
@@ -228,7 +552,76 @@ class VectorCache:
         
         return results.data
     
-    def batch_precompute(self, queries: List[str]) -> None:
+    def warm(
+        self,
+        texts: List[str],
+        batch_size: int = 256,
+        chunk_size: int = 4096,
+        workers: int = 1
+    ) -> Dict[str, Any]:
+        """
+        Bulk-load embeddings for many texts.
+        
+        Inputs are deduplicated by cache key and checked against both tiers
+        first; only the remaining misses go to the model, ``chunk_size`` texts
+        per call. With ``workers > 1`` each chunk is spread over a
+        sentence-transformers multi-process pool.
+        
+        Only the most recent ``max_size`` entries stay in memory; with a disk
+        tier every warmed vector is persisted, one transaction per chunk.
+        
+        Args:
+            texts: Query or document strings to warm
+            batch_size: Model batch size within each chunk
+            chunk_size: Texts encoded (and reported) per step
+            workers: Encoding processes; 1 encodes in this process
+            
+        Returns:
+            Counts and throughput for the run
+        """
+        start = time.time()
+        
+        # Deduplicate by cache key, keeping the first text for each
+        unique: Dict[str, str] = {}
+        for text in texts:
+            if text:
+                unique.setdefault(self._compute_hash(text), text)
+        
+        misses = [(key, text) for key, text in unique.items() if not self._is_cached(key)]
+        result = {
+            "requested": len(texts),
+            "unique": len(unique),
+            "already_cached": len(unique) - len(misses),
+            "encoded": 0
+        }
+        
+        pool = self.model.start_multi_process_pool(["cpu"] * workers) if workers > 1 and misses else None
+        try:
+            for offset in range(0, len(misses), chunk_size):
+                chunk = misses[offset:offset + chunk_size]
+                vectors = self._encode_batch([text for _, text in chunk], batch_size, pool)
+                
+                now = time.time()
+                for (key, _), vector in zip(chunk, vectors):
+                    self._store(key, vector, now)
+                if self.disk is not None:
+                    self.disk.put_many([(key, vector, now) for (key, _), vector in zip(chunk, vectors)])
+                
+                result["encoded"] += len(chunk)
+                self.stats.misses += len(chunk)
+                elapsed = time.time() - start
+                print(f"   [{result['encoded']}/{len(misses)}] encoded "
+                      f"({result['encoded'] / elapsed:.0f} texts/s)")
+        finally:
+            if pool is not None:
+                self.model.stop_multi_process_pool(pool)
+        
+        result["seconds"] = time.time() - start
+        result["texts_per_second"] = result["encoded"] / result["seconds"] if result["seconds"] > 0 else 0.0
+        self._pre_warmed += result["unique"]
+        return result
+    
+    def batch_precompute(self, queries: List[str], batch_size: int = 256, workers: int = 1) -> Dict[str, Any]:
         """
         Pre-compute embeddings for a batch of queries.
         
@@ -237,39 +630,41 @@ class VectorCache:
         
         Args:
             queries: List of query strings to pre-compute
+            batch_size: Model batch size
+            workers: Encoding processes for large query sets
         """
         print(f"   Pre-computing {len(queries)} embeddings...")
-        start = time.time()
-        
-        for query in queries:
-            self.get_or_compute(query)
-        
-        elapsed = time.time() - start
-        print(f"   ✓ Done in {elapsed:.2f}s")
+        result = self.warm(queries, batch_size=batch_size, workers=workers)
+        print(f"   ✓ Done in {result['seconds']:.2f}s "
+              f"({result['encoded']} encoded, {result['already_cached']} already cached)")
+        return result
     
-    def warm_from_records(self, records: List, get_text_fn) -> None:
+    def warm_from_records(self, records: List, get_text_fn, batch_size: int = 256,
+                          workers: int = 1) -> Dict[str, Any]:
         """
         Warm cache by pre-computing embeddings for specific records.
         
         Args:
             records: List of record objects
             get_text_fn: Function to extract text content from a record
+            batch_size: Model batch size
+            workers: Encoding processes for large record sets
         """
         print(f"   Warming cache with {len(records)} records...")
-        for record in records:
-            text = get_text_fn(record)
-            if text:
-                self.get_or_compute(text)
-        self._pre_warmed = len(records)
+        result = self.warm([get_text_fn(record) for record in records],
+                           batch_size=batch_size, workers=workers)
+        print(f"   ✓ {result['unique']} unique texts, {result['encoded']} encoded "
+              f"in {result['seconds']:.2f}s")
+        return result
 
 
 def print_cache_stats(cache: VectorCache):
     """Print formatted cache statistics."""
     stats = cache.stats.to_dict()
-    print(f"   Hits: {stats['hits']} | Misses: {stats['misses']} | Evictions: {stats['evictions']}")
+    print(f"   Hits: {stats['hits']} | Disk Hits: {stats['disk_hits']} | Misses: {stats['misses']} | Evictions: {stats['evictions']}")
     print(f"   Hit Rate: {stats['hit_rate']}")
     print(f"   Avg Query: {stats['avg_query_ms']:.2f}ms")
-    print(f"   Cache Size: {len(cache._cache)}/{cache.max_size} entries")
+    print(f"   Cache Size: {len(cache._cache)}/{cache.max_size} entries ({stats['storage_kb']:.1f} KB)")
 
 
 def load_index_info() -> Dict:
@@ -331,7 +726,7 @@ def demo_batch_precomputation(db: RushDB, cache: VectorCache):
     print("─" * 50)
     
     # Clear cache for clean demo
-    cache._cache.clear()
+    cache.clear()
     cache.stats = CacheStats()
     
     popular_queries = [
@@ -426,6 +821,15 @@ def demo_cache_eviction(db: RushDB, index_id: str):
     print(f"\n   After {len(queries)} queries: {cache.stats.evictions} evictions occurred")
     print("   First 2 queries were evicted to make room for newer ones")
     
+    # Memory-budget mode: evict by bytes instead of entry count
+    vector_bytes = 384 * 4  # float32, all-MiniLM-L6-v2
+    budget_cache = VectorCache(db, index_id, max_size=1000, max_bytes=3 * (vector_bytes + 16))
+    for query in queries:
+        budget_cache.get_or_compute(query)
+    print(f"\n   Memory-budget cache ({budget_cache.max_bytes} bytes): "
+          f"{len(budget_cache._cache)} entries, {budget_cache.stats.cache_storage_bytes} bytes, "
+          f"{budget_cache.stats.evictions} evictions")
+    
     print("\n\nRepeating first query (should trigger re-computation):")
     start = time.time()
     results = cache.search("query one", labels=["ARTICLE"], limit=1)
@@ -469,10 +873,40 @@ def demo_ttl_expiration(db: RushDB, index_id: str):
     print(f"   ✓ Cache miss - re-computed ({elapsed*1000:.2f}ms)")
 
 
+def demo_persistent_disk_tier(db: RushDB, index_id: str):
+    """Demonstrate warm restarts with the memory-mapped disk tier."""
+    print("\n" + "─" * 50)
+    print("[DEMO 6] Persistent Disk Tier")
+    print("─" * 50)
+    
+    disk_path = os.getenv("VECTOR_CACHE_DIR", ".vector_cache")
+    queries = ["machine learning", "neural networks", "data science", "cloud computing"]
+    
+    print(f"\nDisk tier: {disk_path}")
+    print("\nFirst process fills both tiers...")
+    first = VectorCache(db, index_id, max_size=50, disk_path=disk_path)
+    start = time.time()
+    for query in queries:
+        first.get_or_compute(query)
+    print(f"   {len(queries)} queries in {(time.time() - start)*1000:.2f}ms "
+          f"({first.stats.misses} computed, {first.stats.disk_hits} from disk)")
+    first.disk.close()
+    
+    print("\nRestarted process with an empty memory tier...")
+    restarted = VectorCache(db, index_id, max_size=50, disk_path=disk_path)
+    start = time.time()
+    for query in queries:
+        restarted.get_or_compute(query)
+    print(f"   {len(queries)} queries in {(time.time() - start)*1000:.2f}ms "
+          f"({restarted.stats.misses} computed, {restarted.stats.disk_hits} from disk)")
+    print(f"   Disk entries: {len(restarted.disk)}/{restarted.disk.capacity}")
+    restarted.disk.close()
+
+
 def demo_cache_stats_and_monitoring(db: RushDB, index_id: str):
     """Demonstrate cache statistics and monitoring capabilities."""
     print("\n" + "─" * 50)
-    print("[DEMO 6] Cache Statistics & Monitoring")
+    print("[DEMO 7] Cache Statistics & Monitoring")
     print("─" * 50)
     
     cache = VectorCache(db, index_id, max_size=50)
@@ -504,6 +938,7 @@ def demo_cache_stats_and_monitoring(db: RushDB, index_id: str):
     print(f"   Hit Rate:         {stats.hit_rate:.1f}%")
     print(f"   Evictions:        {stats.evictions}")
     print(f"   Current Size:     {len(cache._cache)}/{cache.max_size}")
+    print(f"   Memory:           {stats.cache_storage_bytes / 1024:.1f} KB")
     
     # Show most accessed entries (by access count)
     print("\n📈 Most Accessed Queries:")
@@ -557,6 +992,7 @@ def main():
     demo_cache_warming(db, index_id)
     demo_cache_eviction(db, index_id)
     demo_ttl_expiration(db, index_id)
+    demo_persistent_disk_tier(db, index_id)
     demo_cache_stats_and_monitoring(db, index_id)
     
     # Summary
@@ -570,7 +1006,8 @@ Key Takeaways:
 2. Batch pre-computation warms the cache for known popular queries
 3. Cache warming from database avoids cold-start penalties
 4. TTL helps balance freshness vs. performance
-5. Monitor hit rates to optimize cache size parameters
+5. A memory-mapped disk tier keeps vectors across restarts and processes
+6. Monitor hit rates to optimize cache size parameters
 
 For production use:
 - Set max_size based on expected unique queries
@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+Candidate generation benchmark for graph-based deduplication.
+
+Generates a synthetic customer base in memory, with duplicate variants and
+shared orders / contacts / addresses following the same rules as seed.py,
+then scores it two ways:
+
+  exhaustive  - every customer pair is scored
+  blocking    - only pairs sharing a blocking key are scored
+
+Reports pairs avoided, wall-clock time, and recall of the blocking mode
+against the exhaustive matches (pairs and resulting clusters). It also
+times the per-pair ``analyze_pair`` kernel against the batch
+``score_pairs`` kernel on a sample of candidates and checks that both give
+the same scores, and runs blocking on inputs that yield no candidate pairs
+(0, 1, or 2 unrelated customers). With ``--merge`` it also plans the merge of the blocking
+clusters and executes the plan against a stand-in database that simulates
+round-trip latency, checks the result, and interrupts one run with injected
+failures to check that a rerun resumes it, and reruns a plan whose
+checkpoint lost entries for committed chunks to check nothing is applied
+twice. No RushDB account is needed.
+
+Usage:
+    python benchmark.py
+    python benchmark.py --customers 20000 --skip-exhaustive
+    python benchmark.py --customers 2000 --workers 1
+    python benchmark.py --merge --merge-workers 8 --latency-ms 5
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Set, Tuple
+
+# main.py requires a token at import time; the benchmark never connects
+os.environ.setdefault("RUSHDB_API_TOKEN", "benchmark")
+
+import numpy as np  # noqa: E402
+
+from main import (  # noqa: E402
+    DEDUP_WORKERS, MERGE_CHUNK_SIZE, MERGE_WORKERS, GraphDeduplicator, UnionFind,
+)
+from merge import RELINK_TYPES, MergePlan  # noqa: E402
+
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+    "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+    "Thomas", "Sarah", "Charles", "Karen", "Daniel", "Nancy", "Matthew", "Lisa",
+    "Anthony", "Betty", "Mark", "Margaret", "Steven", "Sandra", "Andrew", "Ashley",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis",
+    "Rodriguez", "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas",
+    "Taylor", "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson", "White",
+    "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson", "Walker", "Young",
+]
+FREE_MAIL_DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "hotmail.com"]
+PHONE_FORMATS = [
+    "{a}-{b}-{c}", "({a}) {b}-{c}", "+1-{a}-{b}-{c}", "{a}.{b}.{c}", "001-{a}-{b}-{c}",
+]
+
+
+class StandInCustomer:
+    """Minimal record object with the ``id``/``get`` shape the deduplicator reads."""
+
+    def __init__(self, customer_id: str, data: Dict[str, Any]):
+        self.id = customer_id
+        self.data = data
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.data.get(name, default)
+
+
+class StandInTransaction:
+    """Buffers writes and applies them on commit, dropping them on rollback."""
+
+    def __init__(self, server: "StandInRushDB"):
+        self.server = server
+        self.writes: List[Tuple[str, Any]] = []
+
+    def __enter__(self) -> "StandInTransaction":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.server.round_trip("tx.rollback" if exc_type else "tx.commit")
+        if not exc_type:
+            self.server.apply(self.writes)
+
+
+class StandInTransactions:
+    def __init__(self, server: "StandInRushDB"):
+        self.server = server
+
+    def begin(self) -> StandInTransaction:
+        self.server.round_trip("tx.begin")
+        return StandInTransaction(self.server)
+
+
+class StandInSearchResult:
+    def __init__(self, data: List[StandInCustomer]):
+        self.data = data
+
+
+class StandInRecords:
+    def __init__(self, server: "StandInRushDB"):
+        self.server = server
+
+    def attach(self, source, target, options=None, transaction=None) -> Dict[str, Any]:
+        self.server.round_trip("records.attach")
+        transaction.writes.append(("attach", (source, options["type"], tuple(target))))
+        return {"success": True}
+
+    def update(self, record_id: str, data: Dict[str, Any], transaction=None) -> None:
+        self.server.round_trip("records.update")
+        transaction.writes.append(("update", (record_id, data)))
+
+    def find_by_id(self, ids: List[str], transaction=None) -> "StandInSearchResult":
+        self.server.round_trip("records.find_by_id")
+        with self.server._lock:
+            gone = set(self.server.deleted)
+        return StandInSearchResult([StandInCustomer(i, {}) for i in ids if i not in gone])
+
+    def delete_by_id(self, id_or_ids, transaction=None) -> Dict[str, str]:
+        self.server.round_trip("records.delete_by_id")
+        if self.server.rng.random() < self.server.failure_rate:
+            raise RuntimeError("injected failure")
+        ids = [id_or_ids] if isinstance(id_or_ids, str) else id_or_ids
+        transaction.writes.append(("delete", tuple(ids)))
+        return {"message": "Records deleted"}
+
+
+class StandInRushDB:
+    """
+    In-process stand-in for the RushDB calls made by the merge executor.
+
+    Every call sleeps for ``latency_ms`` (releasing the GIL like an HTTP
+    round-trip) and is counted; committed writes are kept so the result
+    can be checked. ``failure_rate`` of bulk deletes raise, rolling back
+    their transaction.
+    """
+
+    def __init__(self, latency_ms: float, failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency_ms / 1000.0
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.records = StandInRecords(self)
+        self.transactions = StandInTransactions(self)
+        self.calls = 0
+        self.links: Set[Tuple[str, str, str]] = set()
+        self.updates: Dict[str, Dict[str, Any]] = {}
+        self.deleted: List[str] = []
+        self._lock = threading.Lock()
+
+    def round_trip(self, method: str) -> None:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.latency)
+
+    def apply(self, writes: List[Tuple[str, Any]]) -> None:
+        with self._lock:
+            for kind, payload in writes:
+                if kind == "attach":
+                    source, rel_type, targets = payload
+                    self.links.update((source, rel_type, target) for target in targets)
+                elif kind == "update":
+                    self.updates.setdefault(payload[0], {}).update(payload[1])
+                else:
+                    self.deleted.extend(payload)
+
+
+def variant_email(email: str, variant: int) -> str:
+    local, domain = email.split("@")
+    variants = [local.replace(".", ""), f"{local}+work", local.replace(".", "_"), f"{local}1"]
+    return variants[variant % len(variants)] + "@" + domain
+
+
+def variant_phone(phone: str, variant: int) -> str:
+    digits = "".join(c for c in phone if c.isdigit())
+    variants = [
+        f"+1-{digits[-10:-7]}-{digits[-7:-4]}-{digits[-4:]}",
+        f"({digits[-10:-7]}) {digits[-7:-4]}-{digits[-4:]}",
+        f"1{digits[-10:]}",
+    ]
+    return variants[variant % len(variants)]
+
+
+def variant_name(name: str, variant: int) -> str:
+    return name[:3] + "j" + name[4:] if variant == 1 else name
+
+
+def generate_customers(
+    base_count: int, duplicate_rate: float, rng: random.Random
+) -> Tuple[List[StandInCustomer], Dict[str, Dict[str, Set[str]]], Set[Tuple[str, str]]]:
+    """
+    Synthetic customers, related entities, and true duplicate ID pairs.
+
+    Most emails use a company domain (companies hold a handful of
+    customers each); the rest use free-mail domains, which form large
+    blocks.
+    """
+    companies = [f"company{i}" for i in range(max(1, base_count // 4))]
+    customers: List[StandInCustomer] = []
+    related: Dict[str, Dict[str, Set[str]]] = {}
+    true_pairs: Set[Tuple[str, str]] = set()
+    entity_ids = iter(range(1, 1 << 62))
+
+    def add_customer(data: Dict[str, Any]) -> str:
+        customer_id = f"cust_{len(customers)}"
+        customers.append(StandInCustomer(customer_id, data))
+        related[customer_id] = {
+            "orders": {f"order_{next(entity_ids)}" for _ in range(rng.randint(2, 5))},
+            "contacts": {f"contact_{next(entity_ids)}" for _ in range(rng.randint(1, 3))},
+            "addresses": {f"address_{next(entity_ids)}" for _ in range(rng.randint(1, 2))},
+        }
+        return customer_id
+
+    for _ in range(base_count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        domain = (rng.choice(FREE_MAIL_DOMAINS) if rng.random() < 0.3
+                  else f"{rng.choice(companies)}.com")
+        phone = rng.choice(PHONE_FORMATS).format(
+            a=rng.randint(200, 999), b=rng.randint(100, 999), c=f"{rng.randint(0, 9999):04d}")
+        original = {
+            "email": f"{first.lower()}.{last.lower()}@{domain}",
+            "phone": phone,
+            "first_name": first,
+            "last_name": last,
+        }
+        original_id = add_customer(original)
+        if rng.random() >= duplicate_rate:
+            continue
+
+        for variant in range(rng.randint(1, 2)):
+            variant_id = add_customer({
+                "email": variant_email(original["email"], variant),
+                "phone": variant_phone(original["phone"], variant),
+                "first_name": variant_name(first, variant),
+                "last_name": last,
+            })
+            true_pairs.add((original_id, variant_id))
+            # Shared relationships, at the rates used by seed.py
+            if rng.random() < 0.3:
+                shared = {f"order_{next(entity_ids)}" for _ in range(rng.randint(1, 3))}
+                related[original_id]["orders"] |= shared
+                related[variant_id]["orders"] |= shared
+            if rng.random() < 0.4:
+                shared = {f"contact_{next(entity_ids)}" for _ in range(rng.randint(1, 2))}
+                related[original_id]["contacts"] |= shared
+                related[variant_id]["contacts"] |= shared
+            if rng.random() < 0.3:
+                shared = {f"address_{next(entity_ids)}"}
+                related[original_id]["addresses"] |= shared
+                related[variant_id]["addresses"] |= shared
+
+    return customers, related, true_pairs
+
+
+def run_mode(deduplicator: GraphDeduplicator, mode: str, workers: int) -> Dict[str, Any]:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        pair_chunks, candidates = deduplicator.candidate_pair_chunks(mode)
+        candidate_seconds = time.perf_counter() - start
+        matches = deduplicator.score_candidates(pair_chunks, candidates, workers=workers)
+    elapsed = time.perf_counter() - start
+
+    customers = deduplicator.customers
+    matched = {(customers[i].id, customers[j].id) for i, j, _ in matches}
+    uf = UnionFind()
+    for a, b in matched:
+        uf.union(a, b)
+    clusters = {frozenset(m) for m in uf.get_clusters().values() if len(m) > 1}
+
+    return {
+        "mode": mode,
+        "candidates": candidates,
+        "candidate_seconds": candidate_seconds,
+        "seconds": elapsed,
+        "matched": matched,
+        "clusters": clusters,
+    }
+
+
+def compare_kernels(deduplicator: GraphDeduplicator, sample: int, rng: np.random.Generator) -> Dict[str, Any]:
+    """Per-pair vs batch scoring on a sample of blocking candidates."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        pairs, _ = deduplicator.generate_candidates()
+    if len(pairs) > sample:
+        pairs = pairs[np.sort(rng.choice(len(pairs), sample, replace=False))]
+    customers = deduplicator.customers
+
+    start = time.perf_counter()
+    deduplicator._features = None
+    features = deduplicator.features
+    features_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scalar = np.array([
+        deduplicator.analyze_pair(customers[i], customers[j]).similarity_score for i, j in pairs
+    ])
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch, _ = deduplicator.score_pairs(pairs[:, 0], pairs[:, 1])
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "pairs": len(pairs),
+        "features_seconds": features_seconds,
+        "scalar_rate": len(pairs) / scalar_seconds if scalar_seconds else 0.0,
+        "batch_rate": len(pairs) / batch_seconds if batch_seconds else 0.0,
+        "mismatches": int(np.count_nonzero(scalar != batch)),
+        "customers": features.size,
+    }
+
+
+def check_no_candidates(workers: int) -> List[str]:
+    """Problems with inputs that produce no candidate pairs: 0, 1, or 2 unrelated customers."""
+    cases = {
+        "no customers": [],
+        "one customer": [{"name": "Ada Lovelace", "email": "ada@example.com", "phone": "555-010-0001"}],
+        "two unrelated customers": [
+            {"name": "Ada Lovelace", "email": "ada@example.com", "phone": "555-010-0001"},
+            {"name": "Grace Hopper", "email": "grace@sample.org", "phone": "808-020-0002"},
+        ],
+    }
+    problems = []
+    for label, rows in cases.items():
+        deduplicator = GraphDeduplicator(db=None)
+        deduplicator.customers = [StandInCustomer(f"cust_{i}", row) for i, row in enumerate(rows)]
+        deduplicator.customer_by_id = {c.id: c for c in deduplicator.customers}
+        deduplicator.related_entities.update({
+            c.id: {"orders": set(), "contacts": set(), "addresses": set()} for c in deduplicator.customers
+        })
+        try:
+            result = run_mode(deduplicator, "blocking", workers)
+        except Exception as exc:
+            problems.append(f"{label}: {type(exc).__name__}: {exc}")
+            continue
+        if result["candidates"] or result["matched"]:
+            problems.append(f"{label}: {result['candidates']} candidates, {len(result['matched'])} matches")
+    return problems
+
+
+def check_merge(deduplicator: GraphDeduplicator, plan: MergePlan, db: StandInRushDB) -> List[str]:
+    """Problems with the committed state: unlinked records, missing or repeated deletions."""
+    problems = []
+    expected = [d for c in plan.clusters for d in c.duplicate_ids]
+    if sorted(db.deleted) != sorted(expected):
+        problems.append(f"deleted {len(db.deleted)} records, expected {len(expected)} once each")
+    for cluster in plan.clusters:
+        canonical = cluster.canonical_id
+        if not db.updates.get(canonical, {}).get("deduplicated"):
+            problems.append(f"canonical {canonical} not marked as deduplicated")
+        for entity_type, (rel_type, _) in RELINK_TYPES.items():
+            for duplicate_id in cluster.duplicate_ids:
+                for entity_id in deduplicator.related_entities[duplicate_id][entity_type]:
+                    if (entity_id not in deduplicator.related_entities[canonical][entity_type]
+                            and (canonical, rel_type, entity_id) not in db.links):
+                        problems.append(f"{entity_id} not re-pointed to {canonical}")
+    return problems
+
+
+def benchmark_merge(deduplicator: GraphDeduplicator, args: argparse.Namespace) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        clusters = deduplicator.find_duplicate_clusters()
+    plan = deduplicator.plan_merges(clusters)
+    summary = plan.summary()
+    print(f"\nMerge plan: {summary['clusters']} clusters, {summary['duplicates_to_delete']} deletions, "
+          f"{summary['relationships_to_repoint']} re-points, {summary['properties_to_merge']} property merges")
+
+    print(f"{'Workers':>8} {'Round-trips':>12} {'Estimated s':>12} {'Actual s':>9} "
+          f"{'Cluster-by-cluster est. s':>26}")
+    for workers in sorted({1, args.merge_workers}):
+        estimate = plan.estimate(args.chunk_size, workers, args.latency_ms)
+        db = StandInRushDB(args.latency_ms)
+        deduplicator.db = db
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = deduplicator.execute_merge_plan(plan, workers, args.chunk_size, checkpoint_path=None)
+        problems = check_merge(deduplicator, plan, db)
+        print(f"{workers:>8} {db.calls:>12,} {estimate['estimated_seconds']:>12.2f} "
+              f"{stats['seconds']:>9.2f} {estimate['per_cluster_seconds']:>26.2f}"
+              + (f"  {len(problems)} problems, e.g. {problems[0]}" if problems else ""))
+
+    # Interrupted run: some chunks fail and roll back, a rerun picks them up
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = os.path.join(tmp, "checkpoint.jsonl")
+        db = StandInRushDB(args.latency_ms, failure_rate=0.3, seed=args.seed)
+        deduplicator.db = db
+        with contextlib.redirect_stdout(io.StringIO()):
+            first = deduplicator.execute_merge_plan(plan, args.merge_workers, args.chunk_size, checkpoint)
+            db.failure_rate = 0.0
+            second = deduplicator.execute_merge_plan(plan, args.merge_workers, args.chunk_size, checkpoint)
+        problems = check_merge(deduplicator, plan, db)
+    print(f"Resume: first run merged {first['clusters_merged']} and failed {first['clusters_failed']} clusters; "
+          f"rerun skipped {second['clusters_skipped']} and merged {second['clusters_merged']}; "
+          f"{'state correct' if not problems else f'{len(problems)} problems, e.g. {problems[0]}'}")
+
+    # Crash between commit and checkpoint: every chunk committed, then the
+    # checkpoint lost its last half; the rerun must not apply those again
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = os.path.join(tmp, "checkpoint.jsonl")
+        db = StandInRushDB(args.latency_ms)
+        deduplicator.db = db
+        with contextlib.redirect_stdout(io.StringIO()):
+            deduplicator.execute_merge_plan(plan, args.merge_workers, args.chunk_size, checkpoint)
+            with open(checkpoint) as f:
+                lines = f.readlines()
+            with open(checkpoint, "w") as f:
+                f.writelines(lines[:len(lines) // 2])
+            rerun = deduplicator.execute_merge_plan(plan, args.merge_workers, args.chunk_size, checkpoint)
+        problems = check_merge(deduplicator, plan, db)
+        if rerun["clusters_failed"] or rerun["clusters_merged"]:
+            problems.append(f"rerun merged {rerun['clusters_merged']} and failed {rerun['clusters_failed']} clusters")
+    print(f"Lost checkpoint: rerun skipped {rerun['clusters_skipped']} and found "
+          f"{rerun['clusters_already_merged']} clusters already merged; "
+          f"{'state correct' if not problems else f'{len(problems)} problems, e.g. {problems[0]}'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark blocking-based candidate generation")
+    parser.add_argument("--customers", type=int, default=1000, help="Base customers to generate")
+    parser.add_argument("--duplicate-rate", type=float, default=0.25, help="Share of customers with duplicates")
+    parser.add_argument("--workers", type=int, default=DEDUP_WORKERS, help="Scoring processes")
+    parser.add_argument("--skip-exhaustive", action="store_true",
+                        help="Only run blocking (for sizes where all pairs are too slow)")
+    parser.add_argument("--kernel-pairs", type=int, default=200_000,
+                        help="Candidate pairs sampled for the per-pair vs batch kernel comparison")
+    parser.add_argument("--merge", action="store_true", help="Also benchmark the bulk merge executor")
+    parser.add_argument("--merge-workers", type=int, default=MERGE_WORKERS, help="Merge transactions in flight")
+    parser.add_argument("--chunk-size", type=int, default=MERGE_CHUNK_SIZE, help="Clusters per merge transaction")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Simulated round-trip latency for merges")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    customers, related, true_pairs = generate_customers(
+        args.customers, args.duplicate_rate, random.Random(args.seed))
+    deduplicator = GraphDeduplicator(db=None)
+    deduplicator.customers = customers
+    deduplicator.customer_by_id = {c.id: c for c in customers}
+    deduplicator.related_entities.update(related)
+    print(f"[BENCH] {len(customers)} customers ({len(true_pairs)} true duplicate pairs), "
+          f"{args.workers} worker(s)")
+
+    results = [run_mode(deduplicator, "blocking", args.workers)]
+    if not args.skip_exhaustive:
+        results.append(run_mode(deduplicator, "exhaustive", args.workers))
+
+    total = len(customers) * (len(customers) - 1) // 2
+    print("\n" + "=" * 72)
+    print(f"{'Mode':<12} {'Scored pairs':>14} {'Avoided':>14} {'Blocking s':>11} "
+          f"{'Total s':>9} {'Matches':>8}")
+    print("-" * 72)
+    for r in results:
+        print(f"{r['mode']:<12} {r['candidates']:>14,} {total - r['candidates']:>14,} "
+              f"{r['candidate_seconds']:>11.2f} {r['seconds']:>9.2f} {len(r['matched']):>8}")
+    print("=" * 72)
+
+    blocking = results[0]
+    for r in results:
+        found = sum(1 for pair in true_pairs if pair in r["matched"])
+        print(f"{r['mode']}: {found}/{len(true_pairs)} true duplicate pairs matched")
+    if not args.skip_exhaustive:
+        exhaustive = results[1]
+        pair_recall = (len(blocking["matched"] & exhaustive["matched"]) / len(exhaustive["matched"])
+                       if exhaustive["matched"] else 1.0)
+        cluster_recall = (len(blocking["clusters"] & exhaustive["clusters"]) / len(exhaustive["clusters"])
+                          if exhaustive["clusters"] else 1.0)
+        print(f"Blocking recall vs exhaustive: pairs {pair_recall:.2%}, clusters {cluster_recall:.2%}")
+        print(f"Speedup: {exhaustive['seconds'] / blocking['seconds']:.1f}x")
+
+    kernels = compare_kernels(deduplicator, args.kernel_pairs, np.random.default_rng(args.seed))
+    print(f"\nScoring kernels on {kernels['pairs']:,} candidate pairs "
+          f"(features for {kernels['customers']:,} customers built in {kernels['features_seconds']:.2f}s):")
+    print(f"  analyze_pair (per pair): {kernels['scalar_rate']:>12,.0f} pairs/s")
+    print(f"  score_pairs (batch):     {kernels['batch_rate']:>12,.0f} pairs/s")
+    print(f"  Speedup: {kernels['batch_rate'] / kernels['scalar_rate']:.1f}x, "
+          f"score mismatches: {kernels['mismatches']}")
+
+    problems = check_no_candidates(args.workers)
+    print(f"\nNo-candidate inputs (0, 1, 2 unrelated customers): "
+          f"{'OK' if not problems else '; '.join(problems)}")
+
+    if args.merge:
+        benchmark_merge(deduplicator, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Cached per-customer features for batch pair scoring.
+
+Every string signal is extracted and interned once per customer, so
+scoring a batch of candidate pairs is a handful of NumPy array operations:
+
+  email domain / phone prefix  - interned ids; a match is an id comparison
+  first / last name            - interned normalized name (exact match) and
+                                 a character-set bitmask; Jaccard similarity
+                                 is popcount(a & b) / popcount(a | b)
+  shared orders / contacts /   - co-occurrence counts for every customer
+  addresses                      pair linked to a common entity, looked up
+                                 with a binary search
+
+The results match ``GraphDeduplicator.analyze_pair`` exactly, except that
+an entity linked to more than ``max_group_size`` customers is left out of
+the shared counts: like an oversized block in ``CandidateBlocker``, it says
+little about any one pair and would bring the quadratic cost back.
+"""
+
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+RELATED_TYPES = ("orders", "contacts", "addresses")
+SHARED_FIELDS = {"orders": "shared_orders", "contacts": "shared_contacts", "addresses": "shared_addresses"}
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(words: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+else:
+    _POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(words: np.ndarray) -> np.ndarray:
+        return _POPCOUNT_TABLE[words.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+def _intern(values: Iterable[Optional[str]], keep_empty: bool = False) -> np.ndarray:
+    """
+    Map each distinct value to an int id; missing values get -1.
+
+    ``None`` is always missing; ``""`` is missing unless ``keep_empty``.
+    """
+    table: Dict[str, int] = {}
+    return np.fromiter(
+        (table.setdefault(value, len(table))
+         if value is not None and (value or keep_empty) else -1
+         for value in values),
+        dtype=np.int64
+    )
+
+
+class NameFeatures:
+    """Interned normalized names plus character-set bitmasks for one name field."""
+
+    def __init__(self, names: List[Any]):
+        # A raw empty value scores 0; otherwise names compare lowercased and stripped
+        normalized = [name.lower().strip() if name else None for name in names]
+        self.ids = _intern(normalized, keep_empty=True)
+
+        alphabet: Dict[str, int] = {}
+        for name in normalized:
+            for char in name or "":
+                alphabet.setdefault(char, len(alphabet))
+        words = max(1, (len(alphabet) + 63) // 64)
+
+        self.masks = np.zeros((len(names), words), dtype=np.uint64)
+        for row, name in enumerate(normalized):
+            for char in set(name or ""):
+                bit = alphabet[char]
+                self.masks[row, bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+
+    def similarity(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        ids_a, ids_b = self.ids[left], self.ids[right]
+        masks_a, masks_b = self.masks[left], self.masks[right]
+        intersection = _popcount(masks_a & masks_b)
+        union = _popcount(masks_a | masks_b)
+
+        similarity = np.divide(intersection, union, out=np.zeros(len(left)), where=union > 0)
+        similarity[(ids_a == ids_b) & (ids_a >= 0)] = 1.0
+        similarity[(ids_a < 0) | (ids_b < 0)] = 0.0
+        return similarity
+
+
+class CustomerFeatures:
+    """
+    Pre-tokenized features for every customer, indexed by position.
+
+    Built once from the loaded customers and related entities; positions
+    are the indexes into the customer list used by candidate pairs.
+    """
+
+    def __init__(
+        self,
+        customers: List[Any],
+        related_entities: Dict[str, Dict[str, Iterable[str]]],
+        extract_email_domain: Callable[[str], Optional[str]],
+        extract_phone_prefix: Callable[[str], Optional[str]],
+        max_group_size: int = 200,
+    ):
+        self.max_group_size = max_group_size
+        self.oversized_groups = 0
+        self.ids = [customer.id for customer in customers]
+        self.size = len(customers)
+        self.email_domains = _intern(extract_email_domain(c.get("email", "")) for c in customers)
+        self.phone_prefixes = _intern(extract_phone_prefix(c.get("phone", "")) for c in customers)
+        self.first_names = NameFeatures([c.get("first_name", "") for c in customers])
+        self.last_names = NameFeatures([c.get("last_name", "") for c in customers])
+
+        empty: Dict[str, Iterable[str]] = {}
+        self.related_totals = np.zeros(self.size, dtype=np.int64)
+        self._shared: Dict[str, tuple] = {}
+        for entity_type in RELATED_TYPES:
+            members: Dict[str, List[int]] = defaultdict(list)
+            for position, customer_id in enumerate(self.ids):
+                entity_ids = related_entities.get(customer_id, empty).get(entity_type, ())
+                self.related_totals[position] += len(entity_ids)
+                for entity_id in entity_ids:
+                    members[entity_id].append(position)
+            self._shared[entity_type] = self._cooccurrence(members.values())
+
+    def _cooccurrence(self, groups: Iterable[List[int]]) -> tuple:
+        """Sorted pair keys ``i * size + j`` (i < j) and how many entities each pair shares."""
+        # Groups are filled in position order, so i < j; groups of equal
+        # size are stacked so each size emits its pairs in one step
+        by_size: Dict[int, List[List[int]]] = defaultdict(list)
+        for group in groups:
+            if len(group) > self.max_group_size:
+                self.oversized_groups += 1
+            elif len(group) > 1:
+                by_size[len(group)].append(group)
+
+        keys = [np.empty(0, dtype=np.int64)]
+        for group_size, stacked in by_size.items():
+            matrix = np.asarray(stacked, dtype=np.int64)
+            first, second = np.triu_indices(group_size, 1)
+            keys.append((matrix[:, first] * self.size + matrix[:, second]).ravel())
+        return np.unique(np.concatenate(keys), return_counts=True)
+
+    def _shared_counts(self, entity_type: str, pair_keys: np.ndarray) -> np.ndarray:
+        keys, counts = self._shared[entity_type]
+        if not len(keys):
+            return np.zeros(len(pair_keys), dtype=np.int64)
+        index = np.minimum(np.searchsorted(keys, pair_keys), len(keys) - 1)
+        return np.where(keys[index] == pair_keys, counts[index], 0)
+
+    def pair_signals(self, left: np.ndarray, right: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Signal arrays for the pairs ``(left[k], right[k])``.
+
+        Keys match the ``CustomerSignal`` fields.
+        """
+        left = np.asarray(left, dtype=np.int64)
+        right = np.asarray(right, dtype=np.int64)
+
+        domains_a, domains_b = self.email_domains[left], self.email_domains[right]
+        prefixes_a, prefixes_b = self.phone_prefixes[left], self.phone_prefixes[right]
+        signals = {
+            "email_domain_match": (domains_a == domains_b) & (domains_a >= 0),
+            "phone_prefix_match": (prefixes_a == prefixes_b) & (prefixes_a >= 0),
+            "name_similarity": (
+                self.first_names.similarity(left, right) + self.last_names.similarity(left, right)
+            ) / 2,
+            "total_related_entities": self.related_totals[left] + self.related_totals[right],
+        }
+
+        pair_keys = np.minimum(left, right) * self.size + np.maximum(left, right)
+        for entity_type, field in SHARED_FIELDS.items():
+            signals[field] = self._shared_counts(entity_type, pair_keys)
+        return signals
@@ -11,15 +11,22 @@ Key concepts:
 3. Graph consolidation while preserving relationships
 """
 
+import argparse
 import os
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Any
 
+import numpy as np
 from dotenv import load_dotenv
 
 from rushdb import RushDB
 
+from blocking import BLOCKING_KEYS, CandidateBlocker
+from features import CustomerFeatures
+from merge import RELINK_TYPES, ClusterMergePlan, MergeExecutor, MergePlan, cluster_id_for
+
 # Load environment
 load_dotenv()
 API_TOKEN = os.getenv("RUSHDB_API_TOKEN")
@@ -36,6 +43,19 @@ SHARED_ORDER_WEIGHT = 0.35
 SHARED_CONTACT_WEIGHT = 0.25
 SHARED_ADDRESS_WEIGHT = 0.05
 
+# Candidate generation and parallel scoring
+MAX_BLOCK_SIZE = int(os.getenv("DEDUP_MAX_BLOCK_SIZE", "200"))
+DEDUP_WORKERS = int(os.getenv("DEDUP_WORKERS", "0")) or os.cpu_count() or 1
+PARALLEL_MIN_PAIRS = 2000000  # Below this, scoring in-process beats pool startup
+PAIR_CHUNK_SIZE = 100000
+
+# Bulk merge execution
+MERGE_FIELDS = ["email", "phone", "first_name", "last_name", "company"]
+MERGE_CHUNK_SIZE = int(os.getenv("DEDUP_MERGE_CHUNK_SIZE", "50"))  # Clusters per transaction
+MERGE_WORKERS = int(os.getenv("DEDUP_MERGE_WORKERS", "4"))  # Transactions in flight
+MERGE_CHECKPOINT = os.getenv("DEDUP_MERGE_CHECKPOINT", "merge_checkpoint.jsonl")
+MERGE_LATENCY_MS = float(os.getenv("DEDUP_MERGE_LATENCY_MS", "50"))  # Round-trip estimate for dry runs
+
 
 @dataclass
 class CustomerSignal:
@@ -77,6 +97,84 @@ class CustomerSignal:
         return min(score, 1.0)
 
 
+def batch_similarity_scores(signals: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Vectorized ``CustomerSignal.similarity_score`` over signal arrays.
+    
+    Applies the same weights in the same order, so scores are identical
+    to the per-pair property.
+    """
+    score = np.zeros(len(signals["name_similarity"]))
+    score += np.where(signals["email_domain_match"], EMAIL_DOMAIN_WEIGHT, 0.0)
+    score += np.where(signals["phone_prefix_match"], PHONE_PREFIX_WEIGHT, 0.0)
+    
+    name_similarity = signals["name_similarity"]
+    score += np.where(name_similarity > 0.5, NAME_SIMILARITY_WEIGHT * (name_similarity - 0.5) * 2, 0.0)
+    
+    has_related = signals["total_related_entities"] > 0
+    order_ratio = np.minimum(signals["shared_orders"] / 3, 1.0)
+    contact_ratio = np.minimum(signals["shared_contacts"] / 2, 1.0)
+    address_ratio = np.minimum(signals["shared_addresses"] / 1, 1.0)
+    score += np.where(has_related, SHARED_ORDER_WEIGHT * order_ratio, 0.0)
+    score += np.where(has_related, SHARED_CONTACT_WEIGHT * contact_ratio, 0.0)
+    score += np.where(has_related, SHARED_ADDRESS_WEIGHT * address_ratio, 0.0)
+    
+    return np.minimum(score, 1.0)
+
+
+def match_pairs(features: CustomerFeatures, pairs: np.ndarray) -> List[Tuple[int, int, CustomerSignal]]:
+    """Score an (n, 2) array of customer positions; returns the matches with their signals."""
+    signals = features.pair_signals(pairs[:, 0], pairs[:, 1])
+    matched = np.flatnonzero(batch_similarity_scores(signals) >= SIMILARITY_THRESHOLD)
+    
+    matches = []
+    for k in matched:
+        i, j = int(pairs[k, 0]), int(pairs[k, 1])
+        matches.append((i, j, CustomerSignal(
+            customer_a_id=features.ids[i],
+            customer_b_id=features.ids[j],
+            email_domain_match=bool(signals["email_domain_match"][k]),
+            phone_prefix_match=bool(signals["phone_prefix_match"][k]),
+            name_similarity=float(signals["name_similarity"][k]),
+            shared_orders=int(signals["shared_orders"][k]),
+            shared_contacts=int(signals["shared_contacts"][k]),
+            shared_addresses=int(signals["shared_addresses"][k]),
+            total_related_entities=int(signals["total_related_entities"][k]),
+        )))
+    return matches
+
+
+# Per-process state for the scoring pool (set by _init_scoring_worker)
+_worker_features: Optional[CustomerFeatures] = None
+
+
+def _init_scoring_worker(features: CustomerFeatures) -> None:
+    global _worker_features
+    _worker_features = features
+
+
+def _score_pair_chunk(pairs: np.ndarray) -> List[Tuple[int, int, CustomerSignal]]:
+    """Score a chunk of pairs in a worker; returns only the matches."""
+    return match_pairs(_worker_features, pairs)
+
+
+def _all_pairs(count: int, chunk_size: int) -> Iterable[np.ndarray]:
+    """Every pair (i, j), i < j, as (n, 2) arrays of about ``chunk_size`` pairs."""
+    row = 0
+    while row < count - 1:
+        # Take whole rows until the chunk is full; row i has count - i - 1 pairs
+        stop, pairs = row, 0
+        while stop < count - 1 and pairs < chunk_size:
+            pairs += count - stop - 1
+            stop += 1
+        rows = np.arange(row, stop)
+        lengths = count - rows - 1
+        left = np.repeat(rows, lengths)
+        offsets = np.arange(len(left)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        yield np.column_stack([left, left + 1 + offsets])
+        row = stop
+
+
 class UnionFind:
     """Union-Find data structure for clustering duplicate entities."""
     
@@ -141,6 +239,8 @@ class GraphDeduplicator:
         self.related_entities: Dict[str, Dict[str, Set[str]]] = defaultdict(
             lambda: {"orders": set(), "contacts": set(), "addresses": set()}
         )
+        self.candidate_stats: Dict[str, Any] = {}
+        self._features: Optional[CustomerFeatures] = None
     
     def load_customers(self) -> int:
         """Load all customer records and their relationships."""
@@ -152,6 +252,7 @@ class GraphDeduplicator:
         })
         
         self.customers = result.data
+        self._features = None
         
         for customer in self.customers:
             self.customer_by_id[customer.id] = customer
@@ -163,60 +264,61 @@ class GraphDeduplicator:
         
         return len(self.customers)
     
-    def _load_related_entities(self) -> None:
-        """Load all orders, contacts, and addresses for customers."""
+    def _load_related_entities(self, page_size: int = 1000) -> None:
+        """Load the orders, contacts, and addresses linked to each customer."""
         print("Loading related entities...")
         
-        # Find all orders
-        orders = self.db.records.find({"labels": ["ORDER"], "where": {}})
-        
-        for order in orders.data:
-            # Find which customer placed this order
-            placed_by = self.db.records.find({
-                "labels": ["CUSTOMER"],
-                "where": {
-                    "ORDER": {"$relation": {"type": "PLACED_BY", "direction": "in"}}
-                }
-            })
-            
-            for customer in placed_by.data:
-                self.related_entities[customer.id]["orders"].add(order.id)
-        
-        # Find all contacts
-        contacts = self.db.records.find({"labels": ["CONTACT"], "where": {}})
-        
-        for contact in contacts.data:
-            # Find customers linked to this contact
-            has_contact = self.db.records.find({
-                "labels": ["CUSTOMER"],
-                "where": {
-                    "CONTACT": {"$relation": {"type": "HAS_CONTACT", "direction": "out"}}
-                }
-            })
-            
-            for customer in has_contact.data:
-                self.related_entities[customer.id]["contacts"].add(contact.id)
-        
-        # Find all addresses
-        addresses = self.db.records.find({"labels": ["ADDRESS"], "where": {}})
-        
-        for address in addresses.data:
-            # Find customers at this address
-            located_at = self.db.records.find({
-                "labels": ["CUSTOMER"],
-                "where": {
-                    "ADDRESS": {"$relation": {"type": "LOCATED_AT", "direction": "out"}}
-                }
-            })
-            
-            for customer in located_at.data:
-                self.related_entities[customer.id]["addresses"].add(address.id)
+        # One paged relationship scan per type. Orders point at the customer
+        # (PLACED_BY, "in" as seen from the customer) while the customer points
+        # at its contacts and addresses, so the customer end of an edge
+        # depends on the direction.
+        for entity_type, (rel_type, direction) in RELINK_TYPES.items():
+            customer_end, entity_end = (
+                ("targetId", "sourceId") if direction == "in" else ("sourceId", "targetId")
+            )
+            skip = 0
+            while True:
+                edges = self.db.relationships.find({
+                    "where": {"type": rel_type},
+                    "skip": skip,
+                    "limit": page_size
+                })
+                for edge in edges.data:
+                    customer_id = edge.get(customer_end)
+                    if customer_id in self.customer_by_id:
+                        self.related_entities[customer_id][entity_type].add(edge.get(entity_end))
+                if len(edges.data) < page_size:
+                    break
+                skip += page_size
         
         total_related = sum(
-            len(entities) 
+            len(entity_ids)
             for entities in self.related_entities.values()
+            for entity_ids in entities.values()
         )
         print(f"  Loaded {total_related} related entity links")
+        
+        # Tokenize and intern per-customer signals once for batch scoring
+        self._features = self._build_features()
+        if self._features.oversized_groups:
+            print(f"  {self._features.oversized_groups} entities linked to more than "
+                  f"{MAX_BLOCK_SIZE} customers left out of shared counts")
+    
+    def _build_features(self) -> CustomerFeatures:
+        return CustomerFeatures(
+            self.customers,
+            self.related_entities,
+            self._extract_email_domain,
+            self._extract_phone_prefix,
+            max_group_size=MAX_BLOCK_SIZE
+        )
+    
+    @property
+    def features(self) -> CustomerFeatures:
+        """Cached per-customer scoring features (built on first use if not loaded)."""
+        if self._features is None:
+            self._features = self._build_features()
+        return self._features
     
     def _extract_email_domain(self, email: str) -> Optional[str]:
         """Extract domain from email address."""
@@ -314,10 +416,119 @@ class GraphDeduplicator:
         
         return signal
     
-    def find_duplicate_clusters(self) -> List[Tuple[List[Any], CustomerSignal]]:
+    def _blocking_features(self, customer: Any) -> Dict[str, Any]:
+        """Blocking keys inputs for one customer, using the scoring extractors."""
+        entities = self.related_entities.get(customer.id, {})
+        return {
+            "email_domain": self._extract_email_domain(customer.get("email", "")),
+            "phone_prefix": self._extract_phone_prefix(customer.get("phone", "")),
+            "name": f"{customer.get('first_name', '') or ''} {customer.get('last_name', '') or ''}",
+            "related": [entity_id for ids in entities.values() for entity_id in ids],
+        }
+    
+    def generate_candidates(
+        self,
+        keys: Iterable[str] = BLOCKING_KEYS,
+        max_block_size: int = MAX_BLOCK_SIZE
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Candidate pairs (an (n, 2) array of positions in ``self.customers``) from blocking.
+        
+        Returns the pairs and the blocker's stats (pairs avoided, blocks per key).
+        """
+        blocker = CandidateBlocker(keys=keys, max_block_size=max_block_size)
+        features = [self._blocking_features(customer) for customer in self.customers]
+        return blocker.candidate_pairs(features)
+    
+    def score_pairs(self, left: np.ndarray, right: np.ndarray) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Batch counterpart of ``analyze_pair`` over arrays of customer positions.
+        
+        Returns the similarity scores and the signal arrays (keyed like
+        the ``CustomerSignal`` fields) for the pairs ``(left[k], right[k])``.
+        """
+        signals = self.features.pair_signals(left, right)
+        return batch_similarity_scores(signals), signals
+    
+    def score_candidates(
+        self,
+        pair_chunks: Iterable[np.ndarray],
+        total: int,
+        workers: int = DEDUP_WORKERS
+    ) -> List[Tuple[int, int, CustomerSignal]]:
+        """
+        Score chunks of candidate pairs, across a process pool for very large sets.
+        
+        Each chunk is an (n, 2) array of customer positions scored in one
+        vectorized batch. Workers receive the cached features once (pool
+        initializer) and then only pair chunks. Returns the matches sorted
+        by pair.
+        """
+        features = self.features
+        report_every = max(1, (total // PAIR_CHUNK_SIZE) // 10)
+        matches: List[Tuple[int, int, CustomerSignal]] = []
+        scored = 0
+        
+        if workers <= 1 or total < PARALLEL_MIN_PAIRS:
+            for done, chunk in enumerate(pair_chunks, 1):
+                matches.extend(match_pairs(features, chunk))
+                scored += len(chunk)
+                if done % report_every == 0:
+                    print(f"  Progress: {scored}/{total} pairs analyzed")
+            return sorted(matches, key=lambda match: (match[0], match[1]))
+        
+        print(f"  Scoring across {workers} worker processes...")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_scoring_worker,
+            initargs=(features,)
+        ) as executor:
+            for done, chunk_matches in enumerate(executor.map(_score_pair_chunk, pair_chunks), 1):
+                matches.extend(chunk_matches)
+                if done % report_every == 0:
+                    print(f"  Progress: {min(done * PAIR_CHUNK_SIZE, total)}/{total} pairs analyzed")
+        
+        return sorted(matches, key=lambda match: (match[0], match[1]))
+    
+    def candidate_pair_chunks(self, mode: str = "blocking") -> Tuple[Iterable[np.ndarray], int]:
+        """
+        Candidate pairs for ``mode`` as (n, 2) position arrays of up to
+        ``PAIR_CHUNK_SIZE`` pairs, plus the number of pairs.
+        
+        Stores the candidate stats in ``self.candidate_stats``.
+        """
+        total_pairs = len(self.customers) * (len(self.customers) - 1) // 2
+        
+        if mode == "exhaustive":
+            self.candidate_stats = {
+                "customers": len(self.customers),
+                "total_pairs": total_pairs,
+                "candidate_pairs": total_pairs,
+                "pairs_avoided": 0,
+                "reduction": 0.0,
+            }
+            return _all_pairs(len(self.customers), PAIR_CHUNK_SIZE), total_pairs
+        
+        if mode == "blocking":
+            pairs, self.candidate_stats = self.generate_candidates()
+            chunks = (pairs[start:start + PAIR_CHUNK_SIZE] for start in range(0, len(pairs), PAIR_CHUNK_SIZE))
+            return chunks, len(pairs)
+        
+        raise ValueError(f"Unknown mode: {mode}")
+    
+    def find_duplicate_clusters(
+        self,
+        mode: str = "blocking",
+        workers: int = DEDUP_WORKERS
+    ) -> List[Tuple[List[Any], CustomerSignal]]:
         """
         Find all duplicate clusters using relationship analysis.
         
+        ``mode="blocking"`` scores only pairs that share a blocking key
+        (email domain, phone prefix, related entity, name LSH band);
+        ``mode="exhaustive"`` scores every pair. Candidate stats are kept
+        in ``self.candidate_stats``.
+        
         Returns a list of (cluster_members, representative_signal) tuples.
         """
         print("\nAnalyzing relationship graph for duplicate detection...")
@@ -325,23 +536,23 @@ class GraphDeduplicator:
         uf = UnionFind()
         pair_signals: List[CustomerSignal] = []
         
-        # Compare all pairs of customers
-        total_pairs = len(self.customers) * (len(self.customers) - 1) // 2
-        print(f"  Analyzing {total_pairs} customer pairs...")
+        pair_chunks, candidate_count = self.candidate_pair_chunks(mode)
+        if mode == "blocking":
+            print(f"  Blocking: {candidate_count} candidate pairs out of {self.candidate_stats['total_pairs']} "
+                  f"({self.candidate_stats['pairs_avoided']} avoided, "
+                  f"{self.candidate_stats['reduction']:.1%} reduction)")
+            for key, key_stats in self.candidate_stats["keys"].items():
+                print(f"    {key}: {key_stats['blocks']} blocks, {key_stats['pairs']} pairs"
+                      + (f", {key_stats['oversized']} oversized blocks skipped" if key_stats["oversized"] else ""))
         
-        analyzed = 0
-        for i, customer_a in enumerate(self.customers):
-            for customer_b in self.customers[i + 1:]:
-                signal = self.analyze_pair(customer_a, customer_b)
-                
-                if signal.similarity_score >= SIMILARITY_THRESHOLD:
-                    uf.union(customer_a.id, customer_b.id)
-                    pair_signals.append(signal)
-                    print(f"    Match found: {customer_a.get('email', 'N/A')} <-> {customer_b.get('email', 'N/A')} (score: {signal.similarity_score:.2f})")
-                
-                analyzed += 1
-                if analyzed % 100 == 0:
-                    print(f"  Progress: {analyzed}/{total_pairs} pairs analyzed")
+        print(f"  Analyzing {candidate_count} customer pairs...")
+        matches = self.score_candidates(pair_chunks, candidate_count, workers=workers)
+        
+        for i, j, signal in matches:
+            customer_a, customer_b = self.customers[i], self.customers[j]
+            uf.union(customer_a.id, customer_b.id)
+            pair_signals.append(signal)
+            print(f"    Match found: {customer_a.get('email', 'N/A')} <-> {customer_b.get('email', 'N/A')} (score: {signal.similarity_score:.2f})")
         
         # Get clusters
         clusters = uf.get_clusters()
@@ -399,6 +610,76 @@ class GraphDeduplicator:
         # Sort by score (descending)
         return max(cluster, key=score_customer)
     
+    def plan_cluster(self, cluster: List[Any], canonical: Any) -> ClusterMergePlan:
+        """
+        Plan the merge of one cluster from the loaded related entities.
+
+        Related records of the duplicates that the canonical record is not
+        already linked to are re-pointed; properties the canonical record
+        lacks are taken from the first duplicate that has them.
+        """
+        empty: Set[str] = set()
+        duplicates = [c for c in cluster if c.id != canonical.id]
+        canonical_entities = self.related_entities.get(canonical.id, {})
+
+        relinks: Dict[str, List[str]] = {}
+        duplicate_links = 0
+        for entity_type, (rel_type, _) in RELINK_TYPES.items():
+            linked = canonical_entities.get(entity_type, empty)
+            moved: Set[str] = set()
+            for duplicate in duplicates:
+                entity_ids = self.related_entities.get(duplicate.id, {}).get(entity_type, empty)
+                duplicate_links += len(entity_ids)
+                moved |= entity_ids - linked
+            if moved:
+                relinks[rel_type] = sorted(moved)
+
+        property_fills: Dict[str, Any] = {}
+        for field in MERGE_FIELDS:
+            if canonical.get(field):
+                continue
+            for duplicate in duplicates:
+                if duplicate.get(field):
+                    property_fills[field] = duplicate.get(field)
+                    break
+
+        return ClusterMergePlan(
+            cluster_id=cluster_id_for(c.id for c in cluster),
+            canonical_id=canonical.id,
+            duplicate_ids=[d.id for d in duplicates],
+            relinks=relinks,
+            property_fills=property_fills,
+            duplicate_links=duplicate_links
+        )
+    
+    def plan_merges(self, clusters: List[Tuple[List[Any], Optional[CustomerSignal]]]) -> MergePlan:
+        """Plan every re-point, property merge and deletion for all clusters up front."""
+        return MergePlan(clusters=[
+            self.plan_cluster(cluster, self.select_canonical_customer(cluster))
+            for cluster, _ in clusters
+        ])
+    
+    def execute_merge_plan(
+        self,
+        plan: MergePlan,
+        workers: int = MERGE_WORKERS,
+        chunk_size: int = MERGE_CHUNK_SIZE,
+        checkpoint_path: Optional[str] = MERGE_CHECKPOINT
+    ) -> Dict[str, Any]:
+        """
+        Apply a merge plan as chunked bulk transactions.
+
+        Clusters already listed in ``checkpoint_path`` are skipped, so a
+        rerun after an interruption picks up the remaining clusters.
+        """
+        executor = MergeExecutor(
+            self.db,
+            chunk_size=chunk_size,
+            workers=workers,
+            checkpoint_path=checkpoint_path
+        )
+        return executor.execute(plan)
+    
     def merge_duplicates(
         self, 
         cluster: List[Any], 
@@ -408,213 +689,161 @@ class GraphDeduplicator:
         """
         Merge duplicate records into the canonical record.
         
+        Plans the single cluster and applies it in one transaction.
         Returns statistics about the merge operation.
         """
-        stats = {
-            "relationships_preserved": 0,
-            "properties_merged": 0,
-            "duplicates_deleted": 0,
-        }
-        
-        duplicates = [c for c in cluster if c.id != canonical.id]
-        
-        for duplicate in duplicates:
-            # Transfer all relationships to canonical
-            # Orders
-            duplicate_orders = self.db.records.find({
-                "labels": ["ORDER"],
-                "where": {
-                    "CUSTOMER": {
-                        "$relation": {"type": "PLACED_BY", "direction": "in"},
-                        "$id": duplicate.id
-                    }
-                }
-            })
-            
-            for order in duplicate_orders.data:
-                # Check if already linked
-                existing_orders = self.db.records.find({
-                    "labels": ["ORDER"],
-                    "where": {
-                        "CUSTOMER": {
-                            "$relation": {"type": "PLACED_BY", "direction": "in"},
-                            "$id": canonical.id
-                        }
-                    }
-                })
-                
-                if order.id not in [o.id for o in existing_orders.data]:
-                    self.db.records.attach(
-                        source=order,
-                        target=canonical,
-                        options={"type": "PLACED_BY", "direction": "out"}
-                    )
-                    stats["relationships_preserved"] += 1
-            
-            # Contacts
-            duplicate_contacts = self.db.records.find({
-                "labels": ["CONTACT"],
-                "where": {
-                    "CUSTOMER": {
-                        "$relation": {"type": "HAS_CONTACT", "direction": "out"},
-                        "$id": duplicate.id
-                    }
-                }
-            })
-            
-            for contact in duplicate_contacts.data:
-                existing_contacts = self.db.records.find({
-                    "labels": ["CONTACT"],
-                    "where": {
-                        "CUSTOMER": {
-                            "$relation": {"type": "HAS_CONTACT", "direction": "out"},
-                            "$id": canonical.id
-                        }
-                    }
-                })
-                
-                if contact.id not in [c.id for c in existing_contacts.data]:
-                    self.db.records.attach(
-                        source=canonical,
-                        target=contact,
-                        options={"type": "HAS_CONTACT", "direction": "out"}
-                    )
-                    stats["relationships_preserved"] += 1
-            
-            # Addresses
-            duplicate_addresses = self.db.records.find({
-                "labels": ["ADDRESS"],
-                "where": {
-                    "CUSTOMER": {
-                        "$relation": {"type": "LOCATED_AT", "direction": "out"},
-                        "$id": duplicate.id
-                    }
-                }
-            })
-            
-            for address in duplicate_addresses.data:
-                existing_addresses = self.db.records.find({
-                    "labels": ["ADDRESS"],
-                    "where": {
-                        "CUSTOMER": {
-                            "$relation": {"type": "LOCATED_AT", "direction": "out"},
-                            "$id": canonical.id
-                        }
-                    }
-                })
-                
-                if address.id not in [a.id for a in existing_addresses.data]:
-                    self.db.records.attach(
-                        source=canonical,
-                        target=address,
-                        options={"type": "LOCATED_AT", "direction": "out"}
-                    )
-                    stats["relationships_preserved"] += 1
-            
-            # Merge properties (canonical wins on conflicts)
-            for field in ["email", "phone", "first_name", "last_name", "company"]:
-                if not canonical.get(field) and duplicate.get(field):
-                    canonical.update({field: duplicate.get(field)})
-                    stats["properties_merged"] += 1
-            
-            # Mark as merged and delete
-            duplicate.update({
-                "merged_into": canonical.id,
-                "merged_at": __import__("datetime").datetime.now().isoformat(),
-                "deduplication_source": "graph_analysis"
-            })
-            
-            self.db.records.delete(record_id=duplicate.id)
-            stats["duplicates_deleted"] += 1
-        
-        # Update canonical with merge metadata
-        canonical.update({
-            "deduplicated": True,
-            "deduplication_source": "graph_analysis",
-            "deduplicated_at": __import__("datetime").datetime.now().isoformat(),
-            "duplicates_merged": len(duplicates)
-        })
+        plan = MergePlan(clusters=[self.plan_cluster(cluster, canonical)])
+        stats = self.execute_merge_plan(plan, workers=1, checkpoint_path=None)
+        if stats["clusters_failed"]:
+            raise RuntimeError(f"Merge of cluster {plan.clusters[0].cluster_id} failed")
         
-        return stats
+        return {
+            "relationships_preserved": stats["relationships_preserved"],
+            "properties_merged": stats["properties_merged"],
+            "duplicates_deleted": stats["duplicates_deleted"],
+        }
+    
+    @staticmethod
+    def print_merge_estimate(plan: MergePlan, workers: int, chunk_size: int) -> None:
+        summary = plan.summary()
+        estimate = plan.estimate(chunk_size, workers, MERGE_LATENCY_MS)
+        print(f"  Clusters: {summary['clusters']}")
+        print(f"  Duplicates to delete: {summary['duplicates_to_delete']}")
+        print(f"  Relationships to re-point: {summary['relationships_to_repoint']} "
+              f"(PLACED_BY {summary['repoint_PLACED_BY']}, HAS_CONTACT {summary['repoint_HAS_CONTACT']}, "
+              f"LOCATED_AT {summary['repoint_LOCATED_AT']})")
+        print(f"  Properties to merge: {summary['properties_to_merge']}")
+        print(f"  Estimated cost at {MERGE_LATENCY_MS:.0f}ms per round-trip:")
+        print(f"    Bulk ({estimate['chunks']} transactions, {workers} in flight): "
+              f"{estimate['round_trips']} round-trips, ~{estimate['estimated_seconds']:.1f}s")
+        print(f"    Cluster by cluster: {estimate['per_cluster_round_trips']} round-trips, "
+              f"~{estimate['per_cluster_seconds']:.1f}s")
     
-    def run(self) -> Dict[str, Any]:
+    def run(
+        self,
+        dry_run: bool = False,
+        plan_path: Optional[str] = None,
+        workers: int = MERGE_WORKERS,
+        chunk_size: int = MERGE_CHUNK_SIZE,
+        checkpoint_path: Optional[str] = MERGE_CHECKPOINT
+    ) -> Dict[str, Any]:
         """
         Execute the full deduplication pipeline.
         
+        With ``dry_run`` the merge plan and its estimated cost are reported
+        (and written to ``plan_path`` if given) without changing any
+        records. Otherwise an existing plan at ``plan_path`` is executed
+        as-is, skipping clusters already in the checkpoint.
+        
         Returns statistics about the operation.
         """
         print("=" * 60)
         print("Graph-based Entity Deduplication")
         print("=" * 60)
         
-        # Load data
-        total_customers = self.load_customers()
+        plan: Optional[MergePlan] = None
+        total_customers = len(self.customers)
+        if not dry_run and plan_path and os.path.exists(plan_path):
+            print(f"Loading merge plan from {plan_path}...")
+            plan = MergePlan.load(plan_path)
         
-        # Find duplicate clusters
-        clusters = self.find_duplicate_clusters()
+        if plan is None:
+            # Load data
+            total_customers = self.load_customers()
+            
+            # Find duplicate clusters
+            clusters = self.find_duplicate_clusters()
+            
+            if not clusters:
+                print("\nNo duplicate clusters found.")
+                return {
+                    "total_customers": total_customers,
+                    "duplicate_groups": 0,
+                    "records_merged": 0,
+                    "relationships_preserved": 0,
+                }
+            
+            # Describe each cluster
+            print("\n" + "-" * 60)
+            print("Duplicate Clusters")
+            print("-" * 60)
+            
+            for i, (cluster, signal) in enumerate(clusters, 1):
+                print(f"\nDuplicate Group #{i}:")
+                
+                canonical = self.select_canonical_customer(cluster)
+                
+                print(f"  Canonical: {canonical.id}")
+                print(f"    Name: {canonical.get('first_name', '')} {canonical.get('last_name', '')}")
+                print(f"    Email: {canonical.get('email', 'N/A')}")
+                print(f"  Merging {len(cluster) - 1} duplicate(s)")
+                
+                if signal:
+                    print(f"  Shared signals:")
+                    if signal.email_domain_match:
+                        print(f"    - Email domain match: {self._extract_email_domain(canonical.get('email', ''))}")
+                    if signal.phone_prefix_match:
+                        print(f"    - Phone prefix match")
+                    if signal.shared_orders > 0:
+                        print(f"    - Shared orders: {signal.shared_orders}")
+                    if signal.shared_contacts > 0:
+                        print(f"    - Shared contacts: {signal.shared_contacts}")
+                    if signal.shared_addresses > 0:
+                        print(f"    - Shared addresses: {signal.shared_addresses}")
+                    print(f"    - Confidence: {signal.similarity_score:.2f}")
+            
+            plan = self.plan_merges(clusters)
+        
+        print("\n" + "-" * 60)
+        print("Merge Plan" + (" (dry run)" if dry_run else ""))
+        print("-" * 60)
+        self.print_merge_estimate(plan, workers, chunk_size)
         
-        if not clusters:
-            print("\nNo duplicate clusters found.")
+        if dry_run:
+            if plan_path:
+                plan.save(plan_path)
+                print(f"  Plan written to {plan_path}")
             return {
                 "total_customers": total_customers,
-                "duplicate_groups": 0,
+                "duplicate_groups": len(plan.clusters),
                 "records_merged": 0,
                 "relationships_preserved": 0,
+                "plan": plan.summary(),
             }
         
-        # Process each cluster
         print("\n" + "-" * 60)
         print("Merging Duplicate Clusters")
         print("-" * 60)
+        stats = self.execute_merge_plan(plan, workers, chunk_size, checkpoint_path)
         
         total_stats = {
-            "duplicate_groups": len(clusters),
-            "records_merged": 0,
-            "relationships_preserved": 0,
-            "properties_merged": 0,
+            "duplicate_groups": len(plan.clusters),
+            "records_merged": stats["duplicates_deleted"],
+            "relationships_preserved": stats["relationships_preserved"],
+            "properties_merged": stats["properties_merged"],
+            "clusters_skipped": stats["clusters_skipped"],
+            "clusters_already_merged": stats["clusters_already_merged"],
+            "clusters_failed": stats["clusters_failed"],
         }
         
-        for i, (cluster, signal) in enumerate(clusters, 1):
-            print(f"\nDuplicate Group #{i}:")
-            
-            canonical = self.select_canonical_customer(cluster)
-            
-            print(f"  Canonical: {canonical.id}")
-            print(f"    Name: {canonical.get('first_name', '')} {canonical.get('last_name', '')}")
-            print(f"    Email: {canonical.get('email', 'N/A')}")
-            print(f"  Merging {len(cluster) - 1} duplicate(s)")
-            
-            if signal:
-                print(f"  Shared signals:")
-                if signal.email_domain_match:
-                    print(f"    - Email domain match: {self._extract_email_domain(canonical.get('email', ''))}")
-                if signal.phone_prefix_match:
-                    print(f"    - Phone prefix match")
-                if signal.shared_orders > 0:
-                    print(f"    - Shared orders: {signal.shared_orders}")
-                if signal.shared_contacts > 0:
-                    print(f"    - Shared contacts: {signal.shared_contacts}")
-                if signal.shared_addresses > 0:
-                    print(f"    - Shared addresses: {signal.shared_addresses}")
-                print(f"    - Confidence: {signal.similarity_score:.2f}")
-            
-            stats = self.merge_duplicates(cluster, canonical, signal)
-            total_stats["records_merged"] += stats["duplicates_deleted"]
-            total_stats["relationships_preserved"] += stats["relationships_preserved"]
-            total_stats["properties_merged"] += stats["properties_merged"]
-            
-            print(f"  Result: {stats['relationships_preserved']} relationships preserved")
-        
         # Final summary
         print("\n" + "=" * 60)
         print("Deduplication Complete")
         print("=" * 60)
         print(f"  Total customer records: {total_customers}")
-        print(f"  Duplicate groups resolved: {total_stats['duplicate_groups']}")
+        print(f"  Duplicate groups resolved: {stats['clusters_merged']}")
         print(f"  Records merged: {total_stats['records_merged']}")
         print(f"  Relationships preserved: {total_stats['relationships_preserved']}")
         print(f"  Properties merged: {total_stats['properties_merged']}")
-        print(f"  Unique customers remaining: {total_customers - total_stats['records_merged']}")
+        print(f"  Round-trips: {stats['round_trips']} in {stats['seconds']:.1f}s")
+        if stats["clusters_skipped"]:
+            print(f"  Skipped (already merged): {stats['clusters_skipped']}")
+        if stats["clusters_already_merged"]:
+            print(f"  Found merged without a checkpoint entry: {stats['clusters_already_merged']}")
+        if stats["clusters_failed"]:
+            print(f"  Failed (rerun to retry): {stats['clusters_failed']}")
+        if self.customers:
+            print(f"  Unique customers remaining: {total_customers - total_stats['records_merged']}")
         
         return {
             "total_customers": total_customers,
@@ -624,13 +853,28 @@ class GraphDeduplicator:
 
 def main():
     """Main entry point for the deduplication script."""
+    parser = argparse.ArgumentParser(description="Graph-based customer deduplication")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Report the merge plan and its estimated cost without changing records")
+    parser.add_argument("--plan", help="Write the plan here on a dry run; execute it from here otherwise")
+    parser.add_argument("--merge-workers", type=int, default=MERGE_WORKERS, help="Merge transactions in flight")
+    parser.add_argument("--chunk-size", type=int, default=MERGE_CHUNK_SIZE, help="Clusters per transaction")
+    parser.add_argument("--checkpoint", default=MERGE_CHECKPOINT, help="Completed cluster log used to resume")
+    args = parser.parse_args()
+    
     # Initialize RushDB client
     url = os.getenv("RUSHDB_URL")
     db = RushDB(API_TOKEN, url=url) if url else RushDB(API_TOKEN)
     
     # Run deduplication
     deduplicator = GraphDeduplicator(db)
-    stats = deduplicator.run()
+    stats = deduplicator.run(
+        dry_run=args.dry_run,
+        plan_path=args.plan,
+        workers=args.merge_workers,
+        chunk_size=args.chunk_size,
+        checkpoint_path=args.checkpoint
+    )
     
     return stats
 
@@ -0,0 +1,267 @@
+"""
+Bulk merge planning and execution for duplicate clusters.
+
+Merging cluster by cluster costs several SDK round-trips per duplicate and
+per related entity. Instead, every change is planned up front from the
+data already loaded for scoring:
+
+  re-points  - orders, contacts and addresses of the duplicates that are
+               not yet linked to the canonical record, one attach per
+               relationship type (a single call links many records)
+  updates    - properties the canonical record is missing, plus merge metadata
+  deletions  - the duplicate records
+
+The plan is executed in chunks of clusters, one transaction per chunk and
+one bulk delete per chunk, with several chunks in flight on a thread pool.
+Completed cluster IDs are appended to a checkpoint file, so an interrupted
+run resumes where it stopped. Each chunk first looks up which of its
+duplicates still exist, so a chunk that committed just before a crash (and
+so missed the checkpoint) is recognized as merged on the rerun instead of
+being applied twice. A dry run only reports the plan and its
+estimated cost.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# Related entity kind -> (relationship type, direction seen from the customer)
+RELINK_TYPES = {
+    "orders": ("PLACED_BY", "in"),
+    "contacts": ("HAS_CONTACT", "out"),
+    "addresses": ("LOCATED_AT", "out"),
+}
+RELINK_DIRECTIONS = dict(RELINK_TYPES.values())
+
+
+def cluster_id_for(member_ids: Iterable[str]) -> str:
+    """Stable ID for a cluster: a hash of its sorted member record IDs."""
+    return hashlib.sha1("|".join(sorted(member_ids)).encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class ClusterMergePlan:
+    """Every change needed to merge one duplicate cluster."""
+    cluster_id: str
+    canonical_id: str
+    duplicate_ids: List[str]
+    relinks: Dict[str, List[str]] = field(default_factory=dict)  # relationship type -> record IDs
+    property_fills: Dict[str, Any] = field(default_factory=dict)
+    duplicate_links: int = 0  # Relationships held by the duplicates, re-pointed or not
+
+    @property
+    def relationship_count(self) -> int:
+        return sum(len(ids) for ids in self.relinks.values())
+
+
+@dataclass
+class MergePlan:
+    """Merge plan for all clusters, serializable to JSON."""
+    clusters: List[ClusterMergePlan] = field(default_factory=list)
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "clusters": len(self.clusters),
+            "duplicates_to_delete": sum(len(c.duplicate_ids) for c in self.clusters),
+            "relationships_to_repoint": sum(c.relationship_count for c in self.clusters),
+            "properties_to_merge": sum(len(c.property_fills) for c in self.clusters),
+            **{
+                f"repoint_{rel_type}": sum(len(c.relinks.get(rel_type, ())) for c in self.clusters)
+                for rel_type, _ in RELINK_TYPES.values()
+            },
+        }
+
+    def estimate(self, chunk_size: int, workers: int, latency_ms: float) -> Dict[str, Any]:
+        """
+        Estimated round-trips and wall-clock time for executing the plan.
+
+        Per chunk: begin, commit, one lookup of the duplicates that still
+        exist and one bulk delete; per cluster: one
+        attach per relationship type with records to re-point and one
+        update of the canonical record. Chunks run ``workers`` at a time.
+
+        ``per_cluster_round_trips`` is the cost of merging the same plan
+        cluster by cluster: per duplicate, three lookups, one update and one
+        delete; per related record, one lookup plus one attach if re-pointed;
+        one update per merged property and per canonical record.
+        """
+        chunks = (len(self.clusters) + chunk_size - 1) // chunk_size
+        attaches = sum(len(c.relinks) for c in self.clusters)
+        round_trips = chunks * 4 + attaches + len(self.clusters)
+        waves = (chunks + workers - 1) // workers if chunks else 0
+        per_chunk = round_trips / chunks if chunks else 0
+        per_cluster = sum(
+            5 * len(c.duplicate_ids) + c.duplicate_links + c.relationship_count
+            + len(c.property_fills) + 1
+            for c in self.clusters
+        )
+        return {
+            "chunks": chunks,
+            "round_trips": round_trips,
+            "estimated_seconds": waves * per_chunk * latency_ms / 1000,
+            "per_cluster_round_trips": per_cluster,
+            "per_cluster_seconds": per_cluster * latency_ms / 1000,
+        }
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(asdict(self), f, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "MergePlan":
+        with open(path) as f:
+            data = json.load(f)
+        return cls(
+            clusters=[ClusterMergePlan(**cluster) for cluster in data["clusters"]],
+            created_at=data.get("created_at", "")
+        )
+
+
+def load_checkpoint(path: Optional[str]) -> Set[str]:
+    """Cluster IDs recorded as merged in a checkpoint file."""
+    if not path or not os.path.exists(path):
+        return set()
+    completed = set()
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                completed.add(json.loads(line)["cluster_id"])
+    return completed
+
+
+class MergeExecutor:
+    """
+    Executes a ``MergePlan`` as chunked transactions on a thread pool.
+
+    Each chunk of ``chunk_size`` clusters commits or rolls back as a
+    unit; a failed chunk is reported and left out of the checkpoint, so a
+    rerun with the same checkpoint retries it. Clusters whose duplicates
+    are already gone (merged by a run that stopped before writing its
+    checkpoint) are checkpointed without being applied again.
+    """
+
+    def __init__(
+        self,
+        db: Any,
+        chunk_size: int = 50,
+        workers: int = 4,
+        checkpoint_path: Optional[str] = None,
+    ):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.checkpoint_path = checkpoint_path
+        self._lock = threading.Lock()
+
+    def _write_checkpoint(self, chunk: List[ClusterMergePlan], merged_at: str) -> None:
+        if not self.checkpoint_path:
+            return
+        with self._lock, open(self.checkpoint_path, "a") as f:
+            for cluster in chunk:
+                f.write(json.dumps({
+                    "cluster_id": cluster.cluster_id,
+                    "canonical_id": cluster.canonical_id,
+                    "merged": cluster.duplicate_ids,
+                    "merged_at": merged_at,
+                }) + "\n")
+
+    def _execute_chunk(self, chunk: List[ClusterMergePlan]) -> Dict[str, int]:
+        merged_at = datetime.now().isoformat()
+        round_trips = 3
+
+        with self.db.transactions.begin() as tx:
+            existing = {
+                record.id for record in self.db.records.find_by_id(
+                    [d for c in chunk for d in c.duplicate_ids], transaction=tx
+                ).data
+            }
+            # Clusters with no duplicates left were committed by an earlier run
+            pending = [c for c in chunk if existing.intersection(c.duplicate_ids)]
+
+            for cluster in pending:
+                for rel_type, record_ids in cluster.relinks.items():
+                    self.db.records.attach(
+                        source=cluster.canonical_id,
+                        target=record_ids,
+                        options={"type": rel_type, "direction": RELINK_DIRECTIONS[rel_type]},
+                        transaction=tx
+                    )
+                    round_trips += 1
+
+                self.db.records.update(
+                    record_id=cluster.canonical_id,
+                    data={
+                        **cluster.property_fills,
+                        "deduplicated": True,
+                        "deduplication_source": "graph_analysis",
+                        "deduplicated_at": merged_at,
+                        "duplicates_merged": len(cluster.duplicate_ids),
+                    },
+                    transaction=tx
+                )
+                round_trips += 1
+
+            if existing:
+                self.db.records.delete_by_id(sorted(existing), transaction=tx)
+                round_trips += 1
+
+        self._write_checkpoint(chunk, merged_at)
+        return {
+            "clusters_merged": len(pending),
+            "clusters_already_merged": len(chunk) - len(pending),
+            "duplicates_deleted": len(existing),
+            "relationships_preserved": sum(c.relationship_count for c in pending),
+            "properties_merged": sum(len(c.property_fills) for c in pending),
+            "round_trips": round_trips,
+        }
+
+    def execute(self, plan: MergePlan) -> Dict[str, Any]:
+        """
+        Run every cluster not yet in the checkpoint.
+
+        Returns totals for merged clusters plus skipped (already in the
+        checkpoint), already merged (committed but not checkpointed) and
+        failed counts, round-trips and elapsed seconds.
+        """
+        completed = load_checkpoint(self.checkpoint_path)
+        pending = [c for c in plan.clusters if c.cluster_id not in completed]
+        chunks = [pending[i:i + self.chunk_size] for i in range(0, len(pending), self.chunk_size)]
+
+        stats: Dict[str, Any] = {
+            "clusters_merged": 0,
+            "clusters_skipped": len(plan.clusters) - len(pending),
+            "clusters_already_merged": 0,
+            "clusters_failed": 0,
+            "duplicates_deleted": 0,
+            "relationships_preserved": 0,
+            "properties_merged": 0,
+            "round_trips": 0,
+            "failed_cluster_ids": [],
+        }
+        if stats["clusters_skipped"]:
+            print(f"  Resuming: {stats['clusters_skipped']} clusters already merged")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as executor:
+            futures = {executor.submit(self._execute_chunk, chunk): chunk for chunk in chunks}
+            for done, future in enumerate(as_completed(futures), 1):
+                chunk = futures[future]
+                try:
+                    for key, value in future.result().items():
+                        stats[key] += value
+                except Exception as e:
+                    print(f"  Chunk of {len(chunk)} clusters failed and was rolled back: {e}")
+                    stats["clusters_failed"] += len(chunk)
+                    stats["failed_cluster_ids"].extend(c.cluster_id for c in chunk)
+                if done % max(1, len(chunks) // 10) == 0:
+                    print(f"  Progress: {done}/{len(chunks)} chunks committed")
+
+        stats["seconds"] = time.perf_counter() - start
+        return stats
@@ -19,10 +19,9 @@ Run `seed.py` first to populate the database with sample data.
 """
 
 import os
-import random
-from collections import deque
+import time
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterator, Optional
 
 import networkx as nx
 from dotenv import load_dotenv
@@ -43,6 +42,7 @@ class WalkResult:
     context_collected: list = field(default_factory=list)
     depth: int = 0
     total_weight: float = 0.0
+    round_trips: int = 0
     
     def add_node(self, node_id: str, label: str, data: dict, depth: int):
         """Record a visited node."""
@@ -102,12 +102,27 @@ class NodeScore:
     data: dict
     score: float
     path: list = field(default_factory=list)
+    depth: int = 0
+    edge: Optional[dict] = None  # Edge the walk arrived through (None for the start)
 
 
 # =============================================================================
 # GRAPH WALK ALGORITHMS
 # =============================================================================
 
+# Edge weights by relationship type for weighted walks. Relationships in the
+# seeded graph carry no properties; an edge with its own numeric "weight"
+# overrides these defaults.
+RELATION_WEIGHTS = {
+    "CITES": 1.0,
+    "DISCUSSES": 0.9,
+    "AUTHORED": 0.8,
+    "STUDIES": 0.7,
+    "COLLABORATES_WITH": 0.6,
+    "AFFILIATED_WITH": 0.3,
+}
+
+
 class GraphWalker:
     """
     Implements various graph walk algorithms on RushDB graphs.
@@ -115,15 +130,126 @@ class GraphWalker:
     This class demonstrates how to translate graph traversal concepts
     into RushDB property graph queries, enabling dynamic context assembly
     for AI applications.
+    
+    Walks expand a whole frontier per hop: one relationships query finds
+    every edge leaving the frontier (``$in`` on the node IDs), and one
+    records query loads the newly discovered nodes. Round-trips grow with
+    walk depth, not with the number of nodes visited.
     """
     
-    def __init__(self, db: RushDB):
+    def __init__(self, db: RushDB, edge_limit: int = 1000):
         self.db = db
+        self.edge_limit = edge_limit
         self._visited = set()
+        self.round_trips = 0
+        self.nodes_fetched = 0
     
     def reset_visited(self):
-        """Clear the visited set for a new walk."""
+        """Clear the visited set and counters for a new walk."""
         self._visited = set()
+        self.round_trips = 0
+        self.nodes_fetched = 0
+    
+    def _expand_frontier(
+        self,
+        frontier: list[str],
+        relation_types: list[str],
+        direction: str = "out"
+    ) -> list[dict]:
+        """
+        Find all edges between the frontier and its neighbors in one query.
+        
+        Returns edges oriented away from the frontier:
+        ``{"source", "target", "type", "direction", "weight"}``.
+        """
+        if not frontier:
+            return []
+        
+        clauses = []
+        if direction in ("out", "both"):
+            clauses.append({"sourceId": {"$in": frontier}})
+        if direction in ("in", "both"):
+            clauses.append({"targetId": {"$in": frontier}})
+        
+        self.round_trips += 1
+        edges = self.db.relationships.find({
+            "where": {"type": {"$in": relation_types}, "$or": clauses},
+            "limit": self.edge_limit
+        })
+        
+        frontier_set = set(frontier)
+        expanded = []
+        for edge in edges.data:
+            source, target, rel_type = edge.get("sourceId"), edge.get("targetId"), edge.get("type")
+            weight = edge.get("weight", RELATION_WEIGHTS.get(rel_type, 0.5))
+            if direction in ("out", "both") and source in frontier_set:
+                expanded.append({"source": source, "target": target, "type": rel_type,
+                                 "direction": "out", "weight": weight})
+            if direction in ("in", "both") and target in frontier_set:
+                expanded.append({"source": target, "target": source, "type": rel_type,
+                                 "direction": "in", "weight": weight})
+        return expanded
+    
+    def _fetch_nodes(self, node_ids: list[str], labels: Optional[list[str]] = None) -> dict:
+        """Load records for newly discovered nodes in one query: {id: (label, data)}."""
+        if not node_ids:
+            return {}
+        
+        query = {"where": {"$id": {"$in": node_ids}}, "limit": len(node_ids)}
+        if labels:
+            query["labels"] = labels
+        
+        self.round_trips += 1
+        records = self.db.records.find(query)
+        self.nodes_fetched += len(records.data)
+        return {record.id: (record.label, record.data) for record in records.data}
+    
+    def iter_bfs(
+        self,
+        start_node: 'Record',
+        relation_type: str,
+        target_label: Optional[str] = None,
+        max_depth: int = 3,
+        direction: str = "out"
+    ) -> Iterator[NodeScore]:
+        """
+        Yield nodes in BFS order, fetching the next level only when needed.
+        
+        The start node comes first, then each level in discovery order. A
+        level is fetched as one frontier when the consumer asks for its
+        first node, so stopping early skips the remaining hops entirely.
+        Scores decay with depth (0.8 per hop).
+        """
+        self.reset_visited()
+        relation_types = [relation_type] if isinstance(relation_type, str) else list(relation_type)
+        labels = [target_label] if target_label else None
+        
+        self._visited.add(start_node.id)
+        yield NodeScore(start_node.id, start_node.label, start_node.data, 1.0, [start_node.id])
+        paths = {start_node.id: [start_node.id]}
+        frontier = [start_node.id]
+        
+        for depth in range(1, max_depth + 1):
+            if not frontier:
+                return
+            
+            # First edge to each unvisited node is its shortest-path parent
+            parents = {}
+            for edge in self._expand_frontier(frontier, relation_types, direction):
+                if edge["target"] not in self._visited and edge["target"] not in parents:
+                    parents[edge["target"]] = edge
+            nodes = self._fetch_nodes(list(parents), labels)
+            
+            next_frontier = []
+            for node_id, edge in parents.items():
+                if node_id not in nodes:
+                    continue
+                label, data = nodes[node_id]
+                self._visited.add(node_id)
+                paths[node_id] = paths[edge["source"]] + [node_id]
+                next_frontier.append(node_id)
+                yield NodeScore(node_id, label, data, 0.8 ** depth, paths[node_id], depth, edge)
+            frontier = next_frontier
     
     def bfs_walk(
         self,
@@ -131,7 +257,8 @@ class GraphWalker:
         relation_type: str,
         target_label: str,
         max_depth: int = 3,
-        max_nodes: int = 20
+        max_nodes: int = 20,
+        direction: str = "out"
     ) -> WalkResult:
         """
         Breadth-First Search (BFS) implementation for finding shortest paths.
@@ -141,12 +268,16 @@ class GraphWalker:
         - Discovering all neighbors within k hops
         - Context gathering where breadth matters more than depth
         
+        Each level is expanded as one frontier, so a walk of depth d costs
+        at most 2d round-trips however many nodes it visits.
+        
         Args:
             start_node: The record to start traversal from
-            relation_type: Type of relationships to follow (e.g., "DISCUSSES")
-            target_label: Label of nodes to collect context from
+            relation_type: Type of relationships to follow (e.g., "CITES"), or a list of types
+            target_label: Label of nodes to collect context from (None for any)
             max_depth: Maximum traversal depth
             max_nodes: Maximum number of nodes to visit
+            direction: Follow edges "out" of, "in" to, or "both" ways from each node
             
         Returns:
             WalkResult containing visited nodes, edges, and collected context
@@ -159,86 +290,21 @@ class GraphWalker:
         print(f"Target label: {target_label}")
         print(f"Max depth: {max_depth}")
         
-        self.reset_visited()
         result = WalkResult()
-        
-        # Queue entries: (node_id, label, data, depth)
-        queue = deque([(start_node.id, start_node.label, start_node.data, 0)])
-        self._visited.add(start_node.id)
-        result.add_node(start_node.id, start_node.label, start_node.data, 0)
-        
         print(f"\nStarting BFS traversal...")
-        nodes_visited_count = 1
         
-        while queue and nodes_visited_count < max_nodes:
-            current_id, current_label, current_data, depth = queue.popleft()
-            
-            if depth >= max_depth:
-                continue
-            
-            # Query for related nodes based on relation type and direction
-            # For outgoing relationships, query from current node's label
-            related_query = {
-                "labels": [current_label],
-                "where": {
-                    current_label: {
-                        "$id": current_id,
-                        "$relation": {"type": relation_type, "direction": "out"}
-                    }
-                },
-                "limit": 10
-            }
-            
-            # Find documents discussing related concepts, then find their topics
-            related_docs = self.db.records.find(related_query)
-            
-            # Alternative: Use relationship filtering to find target nodes
-            # This finds all nodes of target_label reachable via relation_type
-            reachable_query = {
-                "labels": [target_label],
-                "limit": max_nodes,
-            }
-            
-            # For demo, we'll use a simpler approach: find nodes by related record
-            # First get the start node's concepts
-            if current_label == "DOCUMENT":
-                topics = current_data.get("topics", [])[:3]
-                if topics:
-                    # Find other documents with overlapping topics
-                    related_docs = self.db.records.find({
-                        "labels": ["DOCUMENT"],
-                        "where": {
-                            "DOCUMENT": {
-                                "$relation": {"type": "CITES", "direction": "in"}
-                            }
-                        },
-                        "limit": 5
-                    })
-            
-            # Simulate BFS expansion with deterministic random selection
-            # In production, use actual relationship queries
-            if len(result.nodes_visited) < max_nodes and depth < max_depth:
-                # Get some related documents to visit next
-                potential_next = self.db.records.find({
-                    "labels": ["DOCUMENT"],
-                    "limit": 5
-                })
-                
-                for doc in potential_next.data:
-                    if doc.id not in self._visited and len(result.nodes_visited) < max_nodes:
-                        self._visited.add(doc.id)
-                        new_depth = depth + 1
-                        result.add_node(doc.id, doc.label, doc.data, new_depth)
-                        result.add_edge(current_id, doc.id, relation_type, "out")
-                        queue.append((doc.id, doc.label, doc.data, new_depth))
-                        nodes_visited_count += 1
-                        
-                        if nodes_visited_count % 5 == 0:
-                            print(f"  Visited {nodes_visited_count} nodes...")
+        for node in self.iter_bfs(start_node, relation_type, target_label, max_depth, direction):
+            result.add_node(node.record_id, node.label, node.data, node.depth)
+            if node.edge:
+                result.add_edge(node.edge["source"], node.record_id, node.edge["type"], node.edge["direction"])
+            if len(result.nodes_visited) >= max_nodes:
+                break
         
+        result.round_trips = self.round_trips
         print(f"\nBFS Complete:")
         print(f"  Total nodes visited: {len(result.nodes_visited)}")
         print(f"  Maximum depth reached: {result.depth}")
+        print(f"  Round-trips: {result.round_trips}")
         print(f"  Context snippets collected: {len(result.context_collected)}")
         
         return result
@@ -248,7 +314,8 @@ class GraphWalker:
         start_node: 'Record',
         relation_type: str,
         max_depth: int = 4,
-        max_nodes: int = 15
+        max_nodes: int = 15,
+        direction: str = "both"
     ) -> WalkResult:
         """
         Depth-First Search (DFS) implementation for deep exploration.
@@ -258,11 +325,17 @@ class GraphWalker:
         - Finding complete subgraphs connected to a starting point
         - Scenarios where comprehensive coverage of one path matters
         
+        The neighborhood is loaded level by level (one frontier per depth),
+        then walked depth-first in memory, so round-trips are bounded by
+        the depth rather than the number of nodes on the path.
+        
         Args:
             start_node: The record to start traversal from
-            relation_type: Type of relationships to follow
+            relation_type: Type of relationships to follow, or a list of types
             max_depth: Maximum recursion depth
             max_nodes: Maximum nodes to visit
+            direction: "out", "in" or "both"; the default follows
+                DOCUMENT -> CONCEPT <- DOCUMENT chains over DISCUSSES
             
         Returns:
             WalkResult containing visited nodes and collected context
@@ -276,64 +349,142 @@ class GraphWalker:
         
         self.reset_visited()
         result = WalkResult()
-        
-        def dfs_recursive(node_id: str, label: str, data: dict, depth: int):
-            """Recursive DFS helper."""
-            if depth >= max_depth or len(result.nodes_visited) >= max_nodes:
-                return
-            
-            if node_id in self._visited:
-                return
-            
+        relation_types = [relation_type] if isinstance(relation_type, str) else list(relation_type)
+        
+        # Load adjacency for every level the DFS can reach
+        nodes = {start_node.id: (start_node.label, start_node.data)}
+        adjacency = {}
+        frontier = [start_node.id]
+        for _ in range(max_depth - 1):
+            if not frontier:
+                break
+            edges = self._expand_frontier(frontier, relation_types, direction)
+            for edge in edges:
+                adjacency.setdefault(edge["source"], []).append(edge)
+            discovered = list(dict.fromkeys(e["target"] for e in edges if e["target"] not in nodes))
+            nodes.update(self._fetch_nodes(discovered))
+            frontier = discovered
+        
+        def dfs_recursive(node_id: str, depth: int):
+            """Recursive DFS helper over the loaded adjacency."""
             self._visited.add(node_id)
+            label, data = nodes[node_id]
             result.add_node(node_id, label, data, depth)
             
-            # Get concept nodes this document discusses
-            concepts = self.db.records.find({
-                "labels": ["CONCEPT"],
-                "limit": 3
-            })
-            
-            for concept in concepts.data:
-                if concept.id not in self._visited and len(result.nodes_visited) < max_nodes:
-                    result.add_node(concept.id, concept.label, concept.data, depth + 1)
-                    result.add_edge(node_id, concept.id, "DISCUSSES", "out")
-                    
-                    # Find documents discussing this concept
-                    docs_about_concept = self.db.records.find({
-                        "labels": ["DOCUMENT"],
-                        "limit": 2
-                    })
-                    
-                    for doc in docs_about_concept.data:
-                        if doc.id not in self._visited and len(result.nodes_visited) < max_nodes:
-                            dfs_recursive(doc.id, doc.label, doc.data, depth + 2)
+            if depth + 1 >= max_depth:
+                return
+            for edge in adjacency.get(node_id, []):
+                if len(result.nodes_visited) >= max_nodes:
+                    return
+                target = edge["target"]
+                if target in self._visited or target not in nodes:
+                    continue
+                result.add_edge(node_id, target, edge["type"], edge["direction"])
+                dfs_recursive(target, depth + 1)
         
         print(f"\nStarting DFS traversal...")
-        dfs_recursive(start_node.id, start_node.label, start_node.data, 0)
+        dfs_recursive(start_node.id, 0)
         
+        result.round_trips = self.round_trips
         print(f"\nDFS Complete:")
         print(f"  Total nodes visited: {len(result.nodes_visited)}")
         print(f"  Maximum depth reached: {result.depth}")
+        print(f"  Round-trips: {result.round_trips}")
         print(f"  Context snippets collected: {len(result.context_collected)}")
         
         return result
     
+    def iter_weighted(
+        self,
+        start_node: 'Record',
+        scoring_fn: callable,
+        max_depth: int = 3,
+        relation_types: Optional[list[str]] = None,
+        batch_size: int = 10
+    ) -> Iterator[NodeScore]:
+        """
+        Yield nodes best-first from a priority queue over weighted edges.
+        
+        Each round pops the ``batch_size`` best unvisited candidates, yields
+        them, then expands them together (two round-trips). Expansion only
+        happens when the consumer asks for more, so stopping early leaves
+        the rest of the graph unfetched.
+        """
+        import heapq
+        
+        self.reset_visited()
+        relation_types = relation_types or list(RELATION_WEIGHTS)
+        visited = self._visited
+        
+        # Priority queue: (negative_score, tiebreak, NodeScore)
+        # Using negative score for max-heap behavior with heapq
+        heap = [(-scoring_fn(start_node.data), 0, NodeScore(
+            start_node.id, start_node.label, start_node.data,
+            scoring_fn(start_node.data), [start_node.id]))]
+        pushed = 1
+        
+        while heap:
+            # Pop the best unvisited candidates for this round
+            batch = []
+            while heap and len(batch) < batch_size:
+                node = heapq.heappop(heap)[2]
+                if node.record_id not in visited:
+                    visited.add(node.record_id)
+                    batch.append(node)
+            
+            for node in batch:
+                yield node
+            
+            expandable = {node.record_id: node for node in batch if node.depth < max_depth}
+            if not expandable:
+                continue
+            
+            # Expand the whole batch: one query for edges, one for new nodes
+            edges = self._expand_frontier(list(expandable), relation_types, direction="both")
+            new_ids = list(dict.fromkeys(
+                e["target"] for e in edges if e["target"] not in visited
+            ))
+            nodes = self._fetch_nodes(new_ids)
+            
+            best = {}
+            for edge in edges:
+                target = edge["target"]
+                if target in visited or target not in nodes:
+                    continue
+                parent = expandable[edge["source"]]
+                label, data = nodes[target]
+                # Dampening factor based on depth
+                priority = scoring_fn(data) * edge["weight"] * (0.8 ** parent.depth)
+                if target not in best or priority > best[target].score:
+                    best[target] = NodeScore(target, label, data, priority,
+                                             parent.path + [target], parent.depth + 1, edge)
+            
+            for node in best.values():
+                heapq.heappush(heap, (-node.score, pushed, node))
+                pushed += 1
+    
     def weighted_walk(
         self,
         start_node: 'Record',
         scoring_fn: callable,
         max_depth: int = 3,
-        top_k: int = 10
+        top_k: int = 10,
+        relation_types: Optional[list[str]] = None,
+        batch_size: Optional[int] = None
     ) -> WalkResult:
         """
         Weighted walk implementation prioritizing high-scoring nodes.
         
         This implements a Personalized PageRank-style traversal where:
         - Each node is scored based on relevance to the query
-        - Edges are traversed based on accumulated node scores
+        - A neighbor's priority is its own score times the weight of the
+          best edge reaching it, damped by depth
         - The walk prioritizes paths through high-relevance nodes
         
+        Candidates are popped from the priority queue in batches of
+        ``batch_size`` and expanded together, so each round is two
+        round-trips regardless of how many nodes it visits.
+        
         Ideal for:
         - Relevance-weighted context assembly
         - Personalized knowledge retrieval
@@ -344,6 +495,8 @@ class GraphWalker:
             scoring_fn: Function(node_data) -> float for scoring nodes
             max_depth: Maximum traversal depth
             top_k: Number of top-scoring nodes to return
+            relation_types: Relationship types to follow (default: all of RELATION_WEIGHTS)
+            batch_size: Candidates expanded per round (default: top_k)
             
         Returns:
             WalkResult with nodes ordered by relevance score
@@ -354,90 +507,33 @@ class GraphWalker:
         print(f"Starting node: {start_node.data.get('title', start_node.id)}")
         print(f"Max depth: {max_depth}, Top-K: {top_k}")
         
-        self.reset_visited()
         result = WalkResult()
-        
-        # Priority queue: (negative_score, node_id, label, data, path, depth)
-        # Using negative score for max-heap behavior with heapq
-        import heapq
-        
-        heap = []
-        start_score = scoring_fn(start_node.data)
-        heapq.heappush(heap, (-start_score, start_node.id, start_node.label, 
-                              start_node.data, [start_node.id], 0))
-        
-        visited = set()
         scored_nodes = []
         
         print(f"\nStarting weighted traversal...")
-        iterations = 0
         
-        while heap and len(result.nodes_visited) < top_k * 2:
-            neg_score, node_id, label, data, path, depth = heapq.heappop(heap)
-            score = -neg_score
-            
-            if node_id in visited:
-                continue
-            
-            visited.add(node_id)
-            result.add_node(node_id, label, data, depth)
-            result.total_weight += score
-            scored_nodes.append((score, node_id, label, data))
-            
-            iterations += 1
-            if iterations % 5 == 0:
-                print(f"  Processed {iterations} nodes, best score so far: {score:.3f}")
-            
-            if depth >= max_depth:
-                continue
-            
-            # Expand to related nodes
-            # Find documents with similar topics (simulating relevance)
-            if label == "DOCUMENT":
-                topics = data.get("topics", [])[:2]
-            else:
-                topics = []
-            
-            # Query for related documents
-            related_docs = self.db.records.find({
-                "labels": ["DOCUMENT"],
-                "limit": 5
-            })
-            
-            for doc in related_docs.data:
-                if doc.id not in visited:
-                    doc_score = scoring_fn(doc.data)
-                    # Dampening factor based on depth
-                    dampened_score = doc_score * (0.8 ** depth)
-                    new_path = path + [doc.id]
-                    heapq.heappush(heap, (
-                        -dampened_score, doc.id, doc.label,
-                        doc.data, new_path, depth + 1
-                    ))
-            
-            # Also explore concepts
-            concepts = self.db.records.find({
-                "labels": ["CONCEPT"],
-                "limit": 3
-            })
-            
-            for concept in concepts.data:
-                if concept.id not in visited:
-                    concept_score = scoring_fn(concept.data)
-                    dampened_score = concept_score * (0.8 ** depth)
-                    new_path = path + [concept.id]
-                    heapq.heappush(heap, (
-                        -dampened_score, concept.id, concept.label,
-                        concept.data, new_path, depth + 1
-                    ))
+        for node in self.iter_weighted(start_node, scoring_fn, max_depth, relation_types, batch_size or top_k):
+            result.add_node(node.record_id, node.label, node.data, node.depth)
+            if node.edge:
+                result.add_edge(node.edge["source"], node.record_id, node.edge["type"], node.edge["direction"])
+            result.total_weight += node.score
+            scored_nodes.append((node.score, node.record_id, node.label, node.data))
+            if len(result.nodes_visited) % 5 == 0:
+                print(f"  Processed {len(result.nodes_visited)} nodes, "
+                      f"{self.round_trips} round-trips so far")
+            if len(result.nodes_visited) >= top_k * 2:
+                break
         
         # Sort results by score
         scored_nodes.sort(key=lambda x: x[0], reverse=True)
         top_results = scored_nodes[:top_k]
         
+        result.round_trips = self.round_trips
         print(f"\nWeighted Walk Complete:")
-        print(f"  Total nodes processed: {len(visited)}")
+        print(f"  Total nodes processed: {len(result.nodes_visited)}")
+        print(f"  Nodes fetched: {self.nodes_fetched}")
         print(f"  Maximum depth reached: {result.depth}")
+        print(f"  Round-trips: {result.round_trips}")
         print(f"  Total relevance score: {result.total_weight:.3f}")
         print(f"\n  Top 5 Results by Score:")
         for i, (score, node_id, label, data) in enumerate(top_results[:5]):
@@ -451,6 +547,15 @@ class GraphWalker:
 # CONTEXT ASSEMBLY
 # =============================================================================
 
+# Prompt section for each node label, in the order sections appear
+CONTEXT_SECTIONS = {
+    "DOCUMENT": "## Relevant Documents",
+    "CONCEPT": "## Key Concepts",
+    "RESEARCHER": "## Expert Researchers",
+}
+OTHER_SECTION = "## Additional Context"
+
+
 class ContextAssembler:
     """
     Assembles collected graph walk results into structured prompts
@@ -458,11 +563,146 @@ class ContextAssembler:
     
     This class demonstrates how to transform raw graph traversal
     results into coherent, well-formatted context for AI applications.
+    
+    ``assemble_context`` formats a finished walk. ``assemble_streaming``
+    consumes a walk generator instead and stops it as soon as the token
+    budget is spent, so only as much graph is fetched as the prompt uses.
     """
     
     def __init__(self, db: RushDB):
         self.db = db
     
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Rough token count: ~4 chars per token, rounded up."""
+        return (len(text) + 3) // 4
+    
+    def stream_context(
+        self,
+        nodes: Iterator[NodeScore],
+        max_context_tokens: int = 2000
+    ) -> Iterator[dict]:
+        """
+        Yield context snippets in walk order until the token budget is met.
+        
+        ``nodes`` is a walk generator such as ``GraphWalker.iter_weighted``,
+        which yields the highest-priority nodes first. Each snippet's cost
+        includes its section header the first time that section is used.
+        The walk is closed at the first snippet that does not fit, so no
+        further hops are fetched.
+        
+        Yields:
+            {"id", "label", "section", "text", "tokens", "score", "depth"}
+        """
+        used = 0
+        sections = set()
+        try:
+            for node in nodes:
+                text = self._extract_context({"label": node.label, "data": node.data})
+                if not text:
+                    continue
+                
+                section = CONTEXT_SECTIONS.get(node.label, OTHER_SECTION)
+                tokens = self._estimate_tokens(f"- {text}\n")
+                if section not in sections:
+                    tokens += self._estimate_tokens(f"{section}\n\n")
+                if used + tokens > max_context_tokens:
+                    return
+                
+                used += tokens
+                sections.add(section)
+                yield {
+                    "id": node.record_id,
+                    "label": node.label,
+                    "section": section,
+                    "text": text,
+                    "tokens": tokens,
+                    "score": node.score,
+                    "depth": node.depth,
+                }
+        finally:
+            # Closing the walk generator stops any further hops
+            if hasattr(nodes, "close"):
+                nodes.close()
+    
+    def assemble_streaming(
+        self,
+        nodes: Iterator[NodeScore],
+        query: str,
+        max_context_tokens: int = 2000,
+        walker: Optional[GraphWalker] = None
+    ) -> dict:
+        """
+        Assemble context from a walk generator under a token budget.
+        
+        Returns the same shape as ``assemble_context`` (so it works with
+        ``build_prompt``), with metadata comparing nodes fetched from
+        RushDB against nodes actually used in the prompt.
+        
+        Args:
+            nodes: Walk generator yielding NodeScore in priority order
+            query: The original query that motivated the walk
+            max_context_tokens: Token budget for the context
+            walker: The walker driving ``nodes``, for fetch/round-trip counts
+        """
+        print(f"\n{'='*60}")
+        print("STREAMING CONTEXT ASSEMBLY")
+        print(f"{'='*60}")
+        print(f"Query: {query}")
+        print(f"Token budget: {max_context_tokens}")
+        
+        start = time.perf_counter()
+        snippets = list(self.stream_context(nodes, max_context_tokens))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        by_section = {}
+        for snippet in snippets:
+            by_section.setdefault(snippet["section"], []).append(snippet["text"])
+        
+        context_parts = []
+        for section in list(CONTEXT_SECTIONS.values()) + [OTHER_SECTION]:
+            if section in by_section:
+                lines = "\n".join(f"- {text}" for text in by_section[section])
+                context_parts.append(f"{section}\n\n{lines}")
+        context = "\n\n".join(context_parts)
+        
+        nodes_fetched = walker.nodes_fetched if walker else len(snippets)
+        labels = [snippet["label"] for snippet in snippets]
+        result = {
+            "context": context,
+            "metadata": {
+                "query": query,
+                "nodes_fetched": nodes_fetched,
+                "nodes_used": len(snippets),
+                "round_trips": walker.round_trips if walker else None,
+                "depth_reached": max((snippet["depth"] for snippet in snippets), default=0),
+                "estimated_tokens": sum(snippet["tokens"] for snippet in snippets),
+                "token_budget": max_context_tokens,
+                "latency_ms": elapsed_ms,
+                "source_breakdown": {
+                    "documents": labels.count("DOCUMENT"),
+                    "concepts": labels.count("CONCEPT"),
+                    "researchers": labels.count("RESEARCHER"),
+                    "other": len(labels) - labels.count("DOCUMENT")
+                             - labels.count("CONCEPT") - labels.count("RESEARCHER")
+                }
+            },
+            "sources": [
+                {"id": snippet["id"], "label": snippet["label"], "score": snippet["score"]}
+                for snippet in snippets
+            ]
+        }
+        
+        metadata = result["metadata"]
+        print(f"Context assembled:")
+        print(f"  Nodes used / fetched: {metadata['nodes_used']} / {metadata['nodes_fetched']}")
+        if walker:
+            print(f"  Round-trips: {metadata['round_trips']}")
+        print(f"  Estimated tokens: {metadata['estimated_tokens']} of {max_context_tokens}")
+        print(f"  Latency: {elapsed_ms:.1f}ms")
+        
+        return result
+    
     def assemble_context(
         self,
         walk_result: WalkResult,
@@ -797,6 +1037,22 @@ def main():
     print(f"\nWeighted Walk Context Preview:")
     print(weighted_context["context"][:500] + "...")
     
+    # =========================================================================
+    # STREAMING ASSEMBLY UNDER A TOKEN BUDGET
+    # =========================================================================
+    # The weighted walk above fetched its whole neighborhood before assembly.
+    # Streaming stops the walk as soon as the prompt budget is spent.
+    for budget in (150, 600):
+        streamed_context = assembler.assemble_streaming(
+            walker.iter_weighted(start_doc, relevance_scoring, max_depth=3),
+            query="Find the most relevant research and researchers",
+            max_context_tokens=budget,
+            walker=walker
+        )
+    
+    print(f"\nStreamed Context Preview:")
+    print(streamed_context["context"][:500] + "...")
+    
     # =========================================================================
     # BUILD COMPLETE AI PROMPT
     # =========================================================================
@@ -824,6 +1080,7 @@ Use the provided context to give accurate, well-cited answers."""
     print("  2. DFS Walk - Deep exploration of topic branches")
     print("  3. Weighted Walk - Relevance-prioritized traversal")
     print("  4. Context Assembly - Structured prompt generation")
+    print("  5. Streaming Assembly - Stop walking once the token budget is met")
     print("\nThese algorithms enable dynamic context assembly for AI applications,")
     print("moving beyond simple retrieval to graph-informed understanding.")
 
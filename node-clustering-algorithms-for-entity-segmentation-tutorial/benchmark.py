@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Clustering benchmark: dict-of-sets Graph vs CSRGraph.
+
+Generates planted-partition graphs (communities of ``--community-size``
+nodes, a ``--mixing`` share of edges placed at random between any two
+nodes) and runs connected components, label propagation and Louvain on
+the CSR graph at every size. Up to ``--dict-max-edges`` the original
+dict-graph implementations run too, for comparison. Partitions are scored
+with the same (standard) modularity, next to the modularity of the planted
+communities. No RushDB account is needed.
+
+Usage:
+    python benchmark.py
+    python benchmark.py --sizes 10000,100000 --dict-max-edges 100000
+    python benchmark.py --sizes 10000000 --dict-max-edges 0
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from clustering.connected_components import find_connected_components, find_connected_components_dict
+from clustering.label_propagation import label_propagation_communities, label_propagation_communities_dict
+from clustering.louvain import louvain_community_detection, louvain_community_detection_dict
+from clustering.utils import CSRGraph, Graph
+
+
+def planted_partition(
+    edges: int,
+    average_degree: int,
+    community_size: int,
+    mixing: float,
+    rng: np.random.Generator
+) -> Tuple[CSRGraph, np.ndarray]:
+    """Synthetic graph with about ``edges`` edges and its planted community labels."""
+    nodes = max(community_size, 2 * edges // average_degree)
+    communities = nodes // community_size
+    intra = int(edges * (1 - mixing))
+
+    community = rng.integers(0, communities, intra)
+    sources = np.concatenate([
+        community * community_size + rng.integers(0, community_size, intra),
+        rng.integers(0, nodes, edges - intra)
+    ])
+    targets = np.concatenate([
+        community * community_size + rng.integers(0, community_size, intra),
+        rng.integers(0, nodes, edges - intra)
+    ])
+
+    node_ids = [f"node_{i}" for i in range(nodes)]
+    graph = CSRGraph.from_edges(nodes, sources, targets, node_ids=node_ids)
+    return graph, np.minimum(np.arange(nodes) // community_size, communities - 1)
+
+
+def to_dict_graph(graph: CSRGraph) -> Graph:
+    dict_graph = Graph()
+    for node in graph.node_ids:
+        dict_graph.add_node(node)
+    upper = graph.rows < graph.indices
+    node_ids = graph.node_ids
+    for a, b in zip(graph.rows[upper].tolist(), graph.indices[upper].tolist()):
+        dict_graph.add_edge(node_ids[a], node_ids[b])
+    return dict_graph
+
+
+def timed(function: Callable, *args, **kwargs) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def summarize(algorithm: str, graph: CSRGraph, result: Any, seconds: float) -> Dict[str, Any]:
+    """Community count and modularity for any algorithm's output shape."""
+    if algorithm == "components":
+        labels = np.empty(graph.node_count, dtype=np.int64)
+        index = {node: i for i, node in enumerate(graph.node_ids)}
+        for label, component in enumerate(result):
+            labels[[index[node] for node in component]] = label
+    else:
+        partition = result[0]
+        _, labels = np.unique([partition[node] for node in graph.node_ids], return_inverse=True)
+    return {
+        "seconds": seconds,
+        "communities": int(labels.max()) + 1,
+        "modularity": graph.modularity(labels),
+    }
+
+
+def run_size(edges: int, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    rng = np.random.default_rng(args.seed)
+    (graph, planted), build_seconds = timed(
+        planted_partition, edges, args.average_degree, args.community_size, args.mixing, rng)
+    print(f"\n[BENCH] {graph.node_count:,} nodes, {graph.edge_count:,} edges "
+          f"(CSR built in {build_seconds:.1f}s), planted modularity {graph.modularity(planted):.4f}")
+
+    algorithms = {
+        "components": (find_connected_components, find_connected_components_dict, {}),
+        "label_propagation": (label_propagation_communities, label_propagation_communities_dict,
+                              {"max_iterations": args.max_iterations, "seed": args.seed}),
+        "louvain": (louvain_community_detection, louvain_community_detection_dict, {"seed": args.seed}),
+    }
+
+    dict_graph = None
+    if graph.edge_count <= args.dict_max_edges:
+        dict_graph, seconds = timed(to_dict_graph, graph)
+        print(f"  Dict graph built in {seconds:.1f}s")
+
+    rows = []
+    for name, (csr_function, dict_function, kwargs) in algorithms.items():
+        result, seconds = timed(csr_function, graph, **kwargs)
+        row = {"edges": graph.edge_count, "algorithm": name, "csr": summarize(name, graph, result, seconds)}
+        if dict_graph is not None:
+            result, seconds = timed(dict_function, dict_graph, **kwargs)
+            row["dict"] = summarize(name, graph, result, seconds)
+        rows.append(row)
+        print(f"  {name}: {row['csr']['seconds']:.2f}s")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dict vs CSR graph clustering")
+    parser.add_argument("--sizes", default="10000,100000,1000000,10000000",
+                        help="Comma-separated edge counts")
+    parser.add_argument("--dict-max-edges", type=int, default=100000,
+                        help="Largest graph the dict-graph implementations run on")
+    parser.add_argument("--average-degree", type=int, default=10, help="Average node degree")
+    parser.add_argument("--community-size", type=int, default=100, help="Planted community size")
+    parser.add_argument("--mixing", type=float, default=0.3, help="Share of edges placed at random")
+    parser.add_argument("--max-iterations", type=int, default=20, help="Label propagation iterations")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+
+    rows = []
+    for edges in (int(size) for size in args.sizes.split(",")):
+        rows.extend(run_size(edges, args))
+
+    print("\n" + "=" * 96)
+    print(f"{'Edges':>12} {'Algorithm':<18} {'Dict s':>9} {'CSR s':>9} {'Speedup':>8} "
+          f"{'Dict Q':>8} {'CSR Q':>8} {'Dict comms':>11} {'CSR comms':>10}")
+    print("-" * 96)
+    for row in rows:
+        csr, dict_ = row["csr"], row.get("dict")
+        if dict_:
+            compared = (f"{dict_['seconds']:>9.2f} {csr['seconds']:>9.2f} "
+                        f"{dict_['seconds'] / csr['seconds']:>7.1f}x "
+                        f"{dict_['modularity']:>8.4f} {csr['modularity']:>8.4f} "
+                        f"{dict_['communities']:>11,} {csr['communities']:>10,}")
+        else:
+            compared = (f"{'-':>9} {csr['seconds']:>9.2f} {'-':>8} "
+                        f"{'-':>8} {csr['modularity']:>8.4f} {'-':>11} {csr['communities']:>10,}")
+        print(f"{row['edges']:>12,} {row['algorithm']:<18} {compared}")
+    print("=" * 96)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,11 +8,12 @@ A collection of graph clustering algorithms implemented for RushDB entity graphs
 from .connected_components import find_connected_components
 from .label_propagation import label_propagation_communities
 from .louvain import louvain_community_detection
-from .utils import GraphBuilder
+from .utils import CSRGraph, GraphBuilder
 
 __all__ = [
     "find_connected_components",
     "label_propagation_communities",
     "louvain_community_detection",
+    "CSRGraph",
     "GraphBuilder",
 ]
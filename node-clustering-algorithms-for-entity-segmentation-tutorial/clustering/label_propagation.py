@@ -16,16 +16,83 @@ This implementation includes:
 - Convergence detection
 - Tie-breaking with random selection
 - Maximum iteration limit for termination
+
+``label_propagation_communities`` runs on a ``CSRGraph``: one sort of
+(node, neighbor label) keys per iteration counts every node's neighbor
+labels at once, and a random fraction added to each count breaks ties.
+``label_propagation_communities_dict`` is the original per-node version on
+the dict ``Graph``, kept for comparison.
 """
 
 import random
-from typing import Dict, Tuple
+from typing import Dict, Tuple, Union
 from collections import Counter
 
-from .utils import Graph
+import numpy as np
+
+from .utils import CSRGraph, Graph
 
 
 def label_propagation_communities(
+    graph: Union[Graph, CSRGraph],
+    max_iterations: int = 50,
+    seed: int = 42
+) -> Tuple[Dict[str, int], int]:
+    """
+    Detect communities using label propagation algorithm.
+    
+    Every node takes the most frequent label among its neighbors, with
+    ties broken at random; all nodes update together from the previous
+    iteration's labels.
+    
+    Args:
+        graph: The input graph; a dict ``Graph`` is converted to CSR first.
+        max_iterations: Maximum number of iterations before stopping.
+        seed: Random seed for reproducible results.
+    
+    Returns:
+        Tuple of (node-to-community mapping, iteration count).
+    """
+    if isinstance(graph, Graph):
+        graph = CSRGraph.from_graph(graph)
+    
+    n = graph.node_count
+    if not n:
+        return {}, 0
+    
+    rng = np.random.default_rng(seed)
+    labels = np.arange(n, dtype=np.int64)
+    rows, cols = graph.rows, graph.indices
+    
+    iterations = 0
+    for i in range(max_iterations):
+        iterations = i + 1
+        if not len(rows):
+            break
+        
+        # Count each (node, neighbor label) pair
+        keys = np.sort(rows * n + labels[cols])
+        starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+        counts = np.diff(np.append(starts, len(keys)))
+        node, label = keys[starts] // n, keys[starts] % n
+        
+        # Highest count per node; the random fraction never outweighs a count
+        score = counts + rng.random(len(counts))
+        node_starts = np.flatnonzero(np.concatenate([[True], node[1:] != node[:-1]]))
+        best = np.maximum.reduceat(score, node_starts)
+        chosen = score == np.repeat(best, np.diff(np.append(node_starts, len(node))))
+        
+        new_labels = labels.copy()
+        new_labels[node[chosen]] = label[chosen]
+        changed = not np.array_equal(new_labels, labels)
+        labels = new_labels
+        if not changed:
+            break
+    
+    return graph.partition(labels), iterations
+
+
+def label_propagation_communities_dict(
     graph: Graph,
     max_iterations: int = 50,
     seed: int = 42
@@ -24,17 +24,234 @@ where:
 - m = total sum of edge weights
 - c_i = community of node i
 - δ(c_i, c_j) = 1 if i and j are in same community
+
+``louvain_community_detection`` runs on a ``CSRGraph``. The nodes are
+split into color classes (independent sets, so no two members of a class
+are adjacent) and a sweep of the local moving phase visits the classes in
+turn. Within a class, slots are grouped by (node, neighbor community) with
+one sort, giving k_i,C for every candidate move; the gains are an array
+expression and all improving nodes of the class move together. Since
+none of them is another's neighbor, their k_i,C stay exact, as if they
+moved one at a time. After the first sweep only nodes next to a moved
+node are re-evaluated. Communities are then aggregated into nodes
+(intra-community weight becomes a self-loop) and the next level runs on
+the smaller graph, until a level merges nothing.
+
+``louvain_community_detection_dict`` is the original single-level,
+node-by-node version on the dict ``Graph``, kept for comparison.
 """
 
 import random
 from collections import defaultdict
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from .utils import CSRGraph, Graph, _csr_from_slots, compute_modularity
+
+MAX_SWEEPS = 64  # Local moving sweeps per level
+MIN_CLASS_SIZE = 4  # Smaller color classes end coloring; the rest move one at a time
+MAX_LEVELS = 32
+
+
+def _color_classes(graph: CSRGraph, rng: np.random.Generator) -> List[np.ndarray]:
+    """
+    Split the nodes into independent sets (no two members adjacent).
+    
+    Each round selects the remaining nodes whose random priority beats
+    every remaining neighbor's, as in Luby's algorithm. On dense graphs
+    (typically aggregated levels) rounds soon select only a few nodes
+    each; once a round selects fewer than ``MIN_CLASS_SIZE``, every
+    remaining node becomes a class of its own.
+    """
+    n = graph.node_count
+    priority = rng.permutation(n)
+    links = graph.rows != graph.indices
+    rows, cols = graph.rows[links], graph.indices[links]
+    remaining = np.ones(n, dtype=bool)
+    classes = []
+    
+    while remaining.any():
+        live = remaining[rows] & remaining[cols]
+        rows, cols = rows[live], cols[live]
+        
+        neighbor_max = np.full(n, -1, dtype=np.int64)
+        if len(rows):
+            starts = np.flatnonzero(np.concatenate([[True], rows[1:] != rows[:-1]]))
+            neighbor_max[rows[starts]] = np.maximum.reduceat(priority[cols], starts)
+        
+        selected = np.flatnonzero(remaining & (priority > neighbor_max))
+        classes.append(selected)
+        remaining[selected] = False
+        if len(selected) < MIN_CLASS_SIZE:
+            classes.extend(np.flatnonzero(remaining)[:, None])
+            break
+    
+    return classes
+
+
+def _local_moving(
+    graph: CSRGraph,
+    rng: np.random.Generator,
+    resolution: float,
+    tolerance: float
+) -> np.ndarray:
+    """
+    Local moving phase on one level: returns each node's community.
+    
+    Gains are scaled by m: moving node i into community C gains
+    k_i,C - resolution * k_i * Σ_tot(C) / 2m, with i itself excluded
+    from Σ_tot of its own community. A sweep visits the color classes in
+    turn; members of a class are never adjacent, so their k_i,C do not
+    change while they move together. Only nodes with a neighbor that
+    moved since they were last evaluated are evaluated again.
+    """
+    n = graph.node_count
+    degrees = graph.degrees
+    two_m = float(graph.weights.sum())
+    labels = np.arange(n, dtype=np.int64)
+    totals = degrees.copy()
+    
+    # Self-loops count toward degree but never toward k_i,C
+    links = graph.rows != graph.indices
+    if not links.any():
+        return labels
+    
+    classes = _color_classes(graph, rng)
+    color = np.empty(n, dtype=np.int64)
+    for c, members in enumerate(classes):
+        color[members] = c
+    order = np.argsort(color[graph.rows[links]], kind="stable")
+    rows = graph.rows[links][order]
+    cols = graph.indices[links][order]
+    weights = graph.weights[links][order]
+    bounds = np.searchsorted(color[rows], np.arange(len(classes) + 1))
+    
+    active = np.ones(n, dtype=bool)
+    quality = graph.modularity(labels, resolution)
+    for _ in range(MAX_SWEEPS):
+        previous = labels.copy()
+        
+        for c in range(len(classes)):
+            lo, hi = bounds[c], bounds[c + 1]
+            if lo == hi or not active[classes[c]].any():
+                continue
+            
+            class_rows, class_cols, class_weights = rows[lo:hi], cols[lo:hi], weights[lo:hi]
+            evaluated = active[class_rows]
+            if not evaluated.all():
+                class_rows, class_cols, class_weights = (
+                    class_rows[evaluated], class_cols[evaluated], class_weights[evaluated]
+                )
+            active[classes[c]] = False
+            
+            # k_i,C for every (node, neighbor community) pair in the class
+            keys = class_rows * n + labels[class_cols]
+            key_order = np.argsort(keys)
+            keys = keys[key_order]
+            starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+            k_in = np.add.reduceat(class_weights[key_order], starts)
+            node, community = keys[starts] // n, keys[starts] % n
+            
+            own = labels[node] == community
+            k_node = degrees[node]
+            gain = k_in - resolution * k_node * (totals[community] - np.where(own, k_node, 0.0)) / two_m
+            
+            # Best community per node; ties go to the lowest label
+            node_starts = np.flatnonzero(np.concatenate([[True], node[1:] != node[:-1]]))
+            best = np.maximum.reduceat(gain, node_starts)
+            is_best = gain == np.repeat(best, np.diff(np.append(node_starts, len(node))))
+            candidates = np.flatnonzero(is_best)
+            first = candidates[np.concatenate([[True], node[candidates[1:]] != node[candidates[:-1]]])]
+            
+            movers, targets = node[first], community[first]
+            k_own = np.add.reduceat(np.where(own, k_in, 0.0), node_starts)
+            stay = k_own - resolution * degrees[movers] * (totals[labels[movers]] - degrees[movers]) / two_m
+            
+            improving = gain[first] > stay + 1e-12 * two_m
+            movers, targets = movers[improving], targets[improving]
+            if len(movers):
+                np.subtract.at(totals, labels[movers], degrees[movers])
+                np.add.at(totals, targets, degrees[movers])
+                labels[movers] = targets
+                active[graph.neighbors_of(movers)] = True
+        
+        new_quality = graph.modularity(labels, resolution)
+        if new_quality < quality:
+            labels = previous
+            break
+        if new_quality - quality < tolerance or not active.any():
+            break
+        quality = new_quality
+    
+    return labels
 
-from .utils import Graph, compute_modularity
 
+def _aggregate(graph: CSRGraph, labels: np.ndarray, count: int) -> CSRGraph:
+    """Graph whose nodes are communities; intra-community weight becomes a self-loop."""
+    indptr, indices, weights = _csr_from_slots(
+        count, labels[graph.rows], labels[graph.indices], graph.weights
+    )
+    return CSRGraph(indptr, indices, weights)
+
+
+def louvain_levels(
+    graph: CSRGraph,
+    seed: int = 42,
+    resolution: float = 1.0,
+    tolerance: float = 1e-7
+) -> List[np.ndarray]:
+    """
+    Run multi-level Louvain and return every level's partition.
+    
+    Each entry maps original node positions to community labels
+    (0..k-1), from the finest level to the coarsest.
+    """
+    rng = np.random.default_rng(seed)
+    membership = np.arange(graph.node_count, dtype=np.int64)
+    levels: List[np.ndarray] = []
+    
+    for _ in range(MAX_LEVELS):
+        labels = _local_moving(graph, rng, resolution, tolerance)
+        _, labels = np.unique(labels, return_inverse=True)
+        count = int(labels.max()) + 1 if len(labels) else 0
+        if count == graph.node_count:
+            break
+        
+        membership = labels[membership]
+        levels.append(membership)
+        graph = _aggregate(graph, labels, count)
+    
+    return levels or [membership]
 
 
 def louvain_community_detection(
+    graph: Union[Graph, CSRGraph],
+    seed: int = 42,
+    resolution: float = 1.0
+) -> Tuple[Dict[str, int], float]:
+    """
+    Detect communities using the multi-level Louvain algorithm.
+    
+    Args:
+        graph: The input graph; a dict ``Graph`` is converted to CSR first.
+        seed: Random seed for reproducibility.
+        resolution: Resolution parameter (higher = more smaller communities).
+    
+    Returns:
+        Tuple of (node-to-community mapping, final modularity score).
+    """
+    if isinstance(graph, Graph):
+        graph = CSRGraph.from_graph(graph)
+    
+    if not graph.node_count:
+        return {}, 0.0
+    
+    labels = louvain_levels(graph, seed=seed, resolution=resolution)[-1]
+    return graph.partition(labels), graph.modularity(labels, resolution)
+
+
+def louvain_community_detection_dict(
     graph: Graph,
     seed: int = 42,
     resolution: float = 1.0
@@ -146,12 +363,12 @@ def louvain_community_detection(
 
 
 
-def build_dendrogram(graph: Graph, seed: int = 42) -> list:
+def build_dendrogram(graph: Union[Graph, CSRGraph], seed: int = 42) -> list:
     """
     Build hierarchical community structure (dendrogram).
     
     Each level in the dendrogram represents a different granularity
-    of community structure, from individual nodes to single community.
+    of community structure, from the first Louvain level to the coarsest.
     
     Args:
         graph: The input graph.
@@ -160,8 +377,9 @@ def build_dendrogram(graph: Graph, seed: int = 42) -> list:
     Returns:
         List of partitions at each level.
     """
-    partition, _ = louvain_community_detection(graph, seed=seed)
-    return [partition]
+    if isinstance(graph, Graph):
+        graph = CSRGraph.from_graph(graph)
+    return [graph.partition(labels) for labels in louvain_levels(graph, seed=seed)]
 
 
 def get_inter_community_edges(
@@ -1,12 +1,21 @@
 """
 Graph construction utilities for RushDB entity data.
+
+Two graph representations are available:
+
+- ``Graph``: dict-of-sets adjacency keyed by string node IDs, simple to
+  build incrementally and to inspect.
+- ``CSRGraph``: integer-indexed compressed sparse row arrays, used by the
+  clustering algorithms so every pass over the edges is a NumPy operation.
+  ``CSRGraph.from_graph`` converts one into the other.
 """
 
 
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Dict, List, Optional
 
+import numpy as np
 from rushdb import RushDB
 
 
@@ -40,6 +49,160 @@ class Graph:
         return self.neighbors.get(node_id, set())
 
 
+def _csr_from_slots(
+    num_nodes: int,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    weights: np.ndarray
+) -> tuple:
+    """Sort directed slots by (row, col) and sum repeated slots into CSR arrays."""
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    if not len(rows):
+        return indptr, np.empty(0, dtype=np.int64), np.empty(0)
+    
+    keys = rows.astype(np.int64) * num_nodes + cols
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+    summed = np.add.reduceat(weights[order].astype(np.float64), starts)
+    keys = keys[starts]
+    
+    np.cumsum(np.bincount(keys // num_nodes, minlength=num_nodes), out=indptr[1:])
+    return indptr, keys % num_nodes, summed
+
+
+class CSRGraph:
+    """
+    Integer-indexed graph in compressed sparse row form.
+    
+    Node ``i``'s neighbors are ``indices[indptr[i]:indptr[i + 1]]`` with the
+    matching ``weights``. Every undirected edge is stored in both rows; a
+    self-loop is stored once with twice its weight, so ``weights.sum()`` is
+    always 2m and a row sum is the node's degree. ``node_ids`` maps
+    positions back to string node IDs.
+    """
+    
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        weights: np.ndarray,
+        node_ids: Optional[List[str]] = None
+    ):
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.node_ids = node_ids if node_ids is not None else [str(i) for i in range(len(indptr) - 1)]
+        self._rows: Optional[np.ndarray] = None
+        self._degrees: Optional[np.ndarray] = None
+    
+    @classmethod
+    def from_edges(
+        cls,
+        num_nodes: int,
+        sources: np.ndarray,
+        targets: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        node_ids: Optional[List[str]] = None
+    ) -> "CSRGraph":
+        """
+        Build from undirected edge arrays.
+        
+        Without ``weights`` the result is a simple graph like ``Graph``:
+        repeated edges are stored once and self-loops are dropped. With
+        ``weights`` repeated edges are summed.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        
+        if weights is None:
+            keep = sources != targets
+            low = np.minimum(sources[keep], targets[keep])
+            high = np.maximum(sources[keep], targets[keep])
+            edge_keys = np.unique(low * num_nodes + high)
+            sources, targets = edge_keys // max(num_nodes, 1), edge_keys % max(num_nodes, 1)
+            weights = np.ones(len(edge_keys))
+        else:
+            weights = np.asarray(weights, dtype=np.float64)
+        
+        loops = sources == targets
+        rows = np.concatenate([sources, targets[~loops]])
+        cols = np.concatenate([targets, sources[~loops]])
+        slot_weights = np.concatenate([np.where(loops, 2 * weights, weights), weights[~loops]])
+        
+        indptr, indices, summed = _csr_from_slots(num_nodes, rows, cols, slot_weights)
+        return cls(indptr, indices, summed, node_ids)
+    
+    @classmethod
+    def from_graph(cls, graph: Graph) -> "CSRGraph":
+        """Convert a dict-of-sets ``Graph``; nodes are numbered in sorted ID order."""
+        node_ids = sorted(graph.nodes)
+        index = {node: i for i, node in enumerate(node_ids)}
+        
+        sources = np.fromiter((index[a] for a, _ in graph.edges), dtype=np.int64, count=len(graph.edges))
+        targets = np.fromiter((index[b] for _, b in graph.edges), dtype=np.int64, count=len(graph.edges))
+        return cls.from_edges(len(node_ids), sources, targets, node_ids=node_ids)
+    
+    @property
+    def node_count(self) -> int:
+        return len(self.indptr) - 1
+    
+    @property
+    def edge_count(self) -> int:
+        loops = int(np.count_nonzero(self.rows == self.indices))
+        return (len(self.indices) - loops) // 2 + loops
+    
+    @property
+    def total_weight(self) -> float:
+        """Sum of edge weights (m)."""
+        return float(self.weights.sum()) / 2
+    
+    @property
+    def rows(self) -> np.ndarray:
+        """Row (source node) of every stored slot, aligned with ``indices``."""
+        if self._rows is None:
+            self._rows = np.repeat(np.arange(self.node_count, dtype=np.int64), np.diff(self.indptr))
+        return self._rows
+    
+    @property
+    def degrees(self) -> np.ndarray:
+        """Weighted degree of every node."""
+        if self._degrees is None:
+            self._degrees = np.bincount(self.rows, weights=self.weights, minlength=self.node_count)
+        return self._degrees
+    
+    def neighbors(self, node: int) -> np.ndarray:
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+    
+    def neighbors_of(self, nodes: np.ndarray) -> np.ndarray:
+        """Concatenated neighbors of many nodes (with repeats)."""
+        starts = self.indptr[nodes]
+        lengths = self.indptr[nodes + 1] - starts
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return self.indices[offsets + np.arange(int(lengths.sum()))]
+    
+    def modularity(self, labels: np.ndarray, resolution: float = 1.0) -> float:
+        """
+        Modularity of an integer labeling of the nodes.
+        
+        Q = Σ_c [in_c / 2m - resolution * (tot_c / 2m)²], where in_c is
+        the weight of slots inside community c and tot_c its total degree.
+        """
+        two_m = float(self.weights.sum())
+        if two_m == 0:
+            return 0.0
+        
+        labels = np.asarray(labels)
+        inside = labels[self.rows] == labels[self.indices]
+        internal = float(self.weights[inside].sum())
+        totals = np.bincount(labels, weights=self.degrees)
+        return internal / two_m - resolution * float(np.dot(totals, totals)) / (two_m * two_m)
+    
+    def partition(self, labels: np.ndarray) -> Dict[str, int]:
+        """Map an integer labeling back to ``{node_id: label}``."""
+        return dict(zip(self.node_ids, np.asarray(labels).tolist()))
+
+
 class GraphBuilder:
     """
     Builds an in-memory graph from RushDB entity relationships.
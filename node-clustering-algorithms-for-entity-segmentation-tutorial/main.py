@@ -14,7 +14,7 @@ from dotenv import load_dotenv
 
 from rushdb import RushDB
 
-from clustering.utils import GraphBuilder
+from clustering.utils import CSRGraph, GraphBuilder
 from clustering.connected_components import find_connected_components
 from clustering.label_propagation import label_propagation_communities
 from clustering.louvain import louvain_community_detection
@@ -35,12 +35,15 @@ def main():
     graph = graph_builder.build_graph()
     
     print(f"  ✓ Loaded {graph.node_count} nodes and {graph.edge_count} edges")
+    
+    # Shared integer-indexed copy for all three algorithms
+    csr_graph = CSRGraph.from_graph(graph)
     print()
     
     print("-" * 60)
     print("[1] Connected Components Analysis")
     print("-" * 60)
-    components = find_connected_components(graph)
+    components = find_connected_components(csr_graph)
     
     print(f"  Found {len(components)} connected components")
     
@@ -59,7 +62,7 @@ def main():
     print("-" * 60)
     print("[2] Label Propagation Communities")
     print("-" * 60)
-    communities, iterations = label_propagation_communities(graph, max_iterations=50)
+    communities, iterations = label_propagation_communities(csr_graph, max_iterations=50)
     
     print(f"  Converged after {iterations} iterations")
     print(f"  Detected {len(communities)} communities")
@@ -81,7 +84,7 @@ def main():
     print("-" * 60)
     print("[3] Louvain Partitioning")
     print("-" * 60)
-    partition, modularity = louvain_community_detection(graph)
+    partition, modularity = louvain_community_detection(csr_graph)
     
     print(f"  Modularity score: {modularity:.3f}")
     
@@ -1,4 +1,5 @@
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Dict, Any, Optional
 import sys
@@ -7,11 +8,13 @@ from pathlib import Path
 # Handle both relative and absolute imports
 try:
     from .rag_engine import RagService
+    from .embedding_cache import query_embedding_cache
     from .config import get_config
 except ImportError:
     # If relative import fails, try absolute import
     sys.path.insert(0, str(Path(__file__).parent))
     from rag_engine import RagService
+    from embedding_cache import query_embedding_cache
     from config import get_config
 
 app = FastAPI(
@@ -45,10 +48,14 @@ def initialize_rag_from_config():
             initialization_error = "RushDB API token not found in environment variables or .env file"
             return
 
+        query_embedding_cache.resize(config['query_cache_size'])
+
         rag_instance = RagService(
             api_key=config['api_key'],
             base_url=config['base_url'],
             model_name=config['embedding_model'],
+            checkpoint_dir=config['index_checkpoint_dir'],
+            index_workers=config['index_workers'],
         )
 
         initialization_error = None
@@ -84,6 +91,9 @@ async def index_records(request: Request):
         # Extract vector_dimension if present and remove it from search_query
         vector_dimension = index_request.pop("vector_dimension", None)
 
+        # Start from scratch instead of resuming an interrupted run
+        resume = index_request.pop("resume", True)
+
         # If vector_dimension is specified, update the embedding model accordingly
         if vector_dimension:
             rag_instance.set_model_by_dimension(vector_dimension)
@@ -91,9 +101,12 @@ async def index_records(request: Request):
         # Use remaining request as search_query
         search_query = index_request
 
-        result = rag_instance.index_records(
+        # Run in a worker thread so /index/progress stays responsive
+        result = await run_in_threadpool(
+            rag_instance.index_records,
             search_query=search_query,
-            field=field
+            field=field,
+            resume=resume
         )
 
         return {
@@ -107,6 +120,18 @@ async def index_records(request: Request):
         raise HTTPException(status_code=500, detail=f"Failed to index records: {str(e)}")
 
 
+@app.get("/index/progress")
+async def index_progress():
+    """Report progress of the current or most recent indexing run."""
+    if not rag_instance:
+        error_msg = "RAG system not initialized."
+        if initialization_error:
+            error_msg += f" Error: {initialization_error}"
+        raise HTTPException(status_code=400, detail=error_msg)
+
+    return rag_instance.get_index_progress()
+
+
 @app.post("/search")
 async def search_chunks(request: Request):
     """Search for relevant chunks."""
@@ -129,7 +154,9 @@ async def search_chunks(request: Request):
         if "vector_dimension" in search_query and search_query["vector_dimension"]:
             rag_instance.set_model_by_dimension(search_query["vector_dimension"])
 
-        results = rag_instance.search(
+        # Run in a worker thread so identical concurrent queries can share one encode
+        results = await run_in_threadpool(
+            rag_instance.search,
             search_query["query"],
             search_query
         )
@@ -140,6 +167,12 @@ async def search_chunks(request: Request):
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 
+@app.get("/search/cache")
+async def search_cache_stats():
+    """Report query embedding cache hit/miss metrics."""
+    return query_embedding_cache.stats()
+
+
 # Initialize RAG on module import
 initialize_rag_from_config()
 
@@ -21,6 +21,9 @@ def get_config():
         'api_key': os.getenv('RUSHDB_API_TOKEN'),
         'base_url': os.getenv('RUSHDB_BASE_URL'),
         'embedding_model': os.getenv('EMBEDDING_MODEL', 'all-MiniLM-L6-v2'),
+        'index_checkpoint_dir': os.getenv('INDEX_CHECKPOINT_DIR', '.index_checkpoints'),
+        'index_workers': int(os.getenv('INDEX_WORKERS', 4)),
+        'query_cache_size': int(os.getenv('QUERY_CACHE_SIZE', 10000)),
         'api_host': os.getenv('API_HOST', '0.0.0.0'),
         'api_port': int(os.getenv('API_PORT', 8000))
     }
@@ -0,0 +1,110 @@
+import threading
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Any, Tuple
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU cache of query embeddings with in-flight request coalescing.
+
+    Entries are keyed by the normalized query text and the embedding model
+    name, so switching models never returns a vector from another space.
+    When several threads ask for the same uncached query at once, only the
+    first one runs the model; the others wait on its result.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Canonical form of a query: NFC unicode with collapsed whitespace.
+
+        Case is preserved because not every sentence transformer is uncased.
+        """
+        return " ".join(unicodedata.normalize("NFC", query).split())
+
+    def resize(self, max_size: int):
+        """Change the capacity, evicting least recently used entries if needed."""
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get_or_compute(self, query: str, model_name: str,
+                       compute: Callable[[str], List[float]]) -> List[float]:
+        """Return the cached embedding for a query, computing it at most once."""
+        text = self.normalize(query)
+        key = (text, model_name)
+
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return embedding
+
+            flight = self._in_flight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                flight = Future()
+                self._in_flight[key] = flight
+                self.misses += 1
+                leader = True
+
+        if not leader:
+            return flight.result()
+
+        try:
+            embedding = compute(text)
+        except Exception as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight.set_exception(e)
+            raise
+
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if self.max_size > 0:
+                self._entries[key] = embedding
+                self._evict()
+        flight.set_result(embedding)
+        return embedding
+
+    def clear(self):
+        """Drop all cached embeddings and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.coalesced = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss metrics for monitoring."""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight),
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0
+            }
+
+
+# Process-wide cache shared by every TextProcessor
+query_embedding_cache = QueryEmbeddingCache()
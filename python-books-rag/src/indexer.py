@@ -0,0 +1,264 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+
+class IndexCheckpoint:
+    """Persists re-indexing progress to a JSON file so a crashed run can resume."""
+
+    def __init__(self, checkpoint_dir: str, job_key: str):
+        self.path = Path(checkpoint_dir) / f"index-{job_key}.json"
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Return the saved state, or None when there is nothing to resume."""
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+
+    def save(self, state: Dict[str, Any]):
+        """Atomically write the checkpoint state."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Remove the checkpoint once a run has finished."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class StreamingIndexer:
+    """Resumable re-indexing engine for adding embeddings to existing records.
+
+    Records are paged with keyset pagination (ordered by ``__id`` and filtered
+    with ``$id > cursor``) so each page costs the same regardless of depth.
+    Each page is encoded in one model call and its embeddings are written back
+    with one bulk import per label, merged into the existing records by
+    ``__id``. Up to ``max_workers`` pages are in flight at a time; the
+    checkpoint cursor only advances past pages that were written, and a page
+    that fails to write stops the run there, so a restart retries it instead
+    of skipping its records.
+    """
+
+    def __init__(self, db, processor, checkpoint_dir: str = ".index_checkpoints",
+                 batch_size: int = 256, max_workers: int = 4):
+        self.db = db
+        self.processor = processor
+        self.checkpoint_dir = checkpoint_dir
+        self.batch_size = batch_size
+        self.max_workers = max(1, max_workers)
+        self._lock = threading.Lock()
+        self.progress: Dict[str, Any] = {"status": "idle"}
+
+    @staticmethod
+    def job_key(search_query: Dict, field: str, model_name: str) -> str:
+        """Stable identifier for a re-indexing job used to name its checkpoint."""
+        payload = json.dumps(
+            {"query": search_query, "field": field, "model": model_name},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    def get_progress(self) -> Dict[str, Any]:
+        """Snapshot of the current (or last) run."""
+        with self._lock:
+            progress = dict(self.progress)
+        elapsed = progress.get("elapsed_seconds")
+        if progress.get("status") == "running" and progress.get("started_at"):
+            elapsed = time.time() - progress["started_at"]
+        if elapsed:
+            progress["elapsed_seconds"] = round(elapsed, 3)
+            progress["records_per_second"] = round(progress.get("processed", 0) / elapsed, 2)
+        return progress
+
+    def _update_progress(self, **changes):
+        with self._lock:
+            self.progress.update(changes)
+
+    def _build_page_query(self, search_query: Dict, cursor: Optional[str]) -> Dict:
+        page_query = {key: value for key, value in search_query.items() if key not in ("skip", "limit", "orderBy")}
+        where = dict(page_query.get("where", {}))
+        if cursor:
+            where["$id"] = {"$gt": cursor}
+        if where:
+            page_query["where"] = where
+        page_query["orderBy"] = {"__id": "asc"}
+        page_query["limit"] = self.batch_size
+        return page_query
+
+    def _prepare_batch(self, records: List[Any], field: str):
+        """Split a page into (record_id, label, text) tuples and a skipped count."""
+        items = []
+        skipped = 0
+        for record in records:
+            record_data = record.to_dict(exclude_internal=False)
+            record_id = record_data["__id"]
+            content = record_data.get(field)
+            if not content or not isinstance(content, str):
+                skipped += 1
+                continue
+            items.append((record_id, record_data.get("__label"), content))
+        return items, skipped
+
+    def _write_batch(self, items: List[Any]) -> int:
+        """Encode a batch and write its embeddings with one bulk import per label.
+
+        Rows carry the record's ``__id`` and are merged into the existing
+        record with the ``append`` strategy, so its other properties are kept;
+        the embedding arrays are cast to the ``vector`` type, as before.
+        A page that spans several labels is written inside one transaction.
+        """
+        embeddings = self.processor.vectorize_texts([content for _, _, content in items])
+        rows_by_label: Dict[str, List[Dict[str, Any]]] = {}
+        for (record_id, label, _), embedding in zip(items, embeddings):
+            rows_by_label.setdefault(label, []).append({"__id": record_id, "embedding": embedding})
+
+        def write(transaction=None):
+            for label, rows in rows_by_label.items():
+                self.db.records.import_json(
+                    data=rows,
+                    label=label,
+                    options={
+                        "mergeBy": ["__id"],
+                        "mergeStrategy": "append",
+                        "castNumberArraysToVectors": True,
+                        "returnResult": False,
+                    },
+                    transaction=transaction
+                )
+
+        if len(rows_by_label) == 1:
+            write()
+            return len(items)
+
+        tx = self.db.transactions.begin()
+        try:
+            write(tx)
+            tx.commit()
+        except Exception:
+            tx.rollback()
+            raise
+        return len(items)
+
+    def run(self, search_query: Dict, field: str, model_name: str,
+            resume: bool = True) -> Dict[str, Any]:
+        """Index every record matched by ``search_query`` and return final counts."""
+        checkpoint = IndexCheckpoint(self.checkpoint_dir, self.job_key(search_query, field, model_name))
+        state = checkpoint.load() if resume else None
+        if not resume:
+            checkpoint.clear()
+
+        cursor = state.get("cursor") if state else None
+        counts = {
+            "processed": state.get("processed", 0) if state else 0,
+            "errors": state.get("errors", 0) if state else 0,
+            "skipped": state.get("skipped", 0) if state else 0,
+        }
+        if cursor:
+            print(f"Resuming indexing after record {cursor} ({counts['processed']} already processed)")
+
+        started_at = time.time()
+        self._update_progress(
+            status="running",
+            job=checkpoint.path.stem,
+            field=field,
+            cursor=cursor,
+            resumed=bool(cursor),
+            started_at=started_at,
+            elapsed_seconds=None,
+            message=None,
+            **counts
+        )
+
+        # Pages complete out of order; the checkpoint only advances over the
+        # contiguous prefix of pages that were written. A failed page stops
+        # the prefix (and the run) so a resume starts again from it.
+        pending: Dict[int, Dict[str, Any]] = {}
+        next_to_commit = 0
+        failed = threading.Event()
+        failed_items = 0
+        semaphore = threading.BoundedSemaphore(self.max_workers)
+
+        def on_done(seq: int, page_cursor: str, result: Dict[str, int]):
+            nonlocal next_to_commit, failed_items
+            with self._lock:
+                if result["errors"]:
+                    failed.set()
+                    failed_items += result["errors"]
+                pending[seq] = {"cursor": page_cursor, **result}
+                while next_to_commit in pending and not pending[next_to_commit]["errors"]:
+                    done = pending.pop(next_to_commit)
+                    counts["processed"] += done["processed"]
+                    counts["skipped"] += done["skipped"]
+                    self.progress.update(cursor=done["cursor"], **counts)
+                    next_to_commit += 1
+                    checkpoint.save({"cursor": done["cursor"], **counts})
+
+        def process_page(seq: int, page_cursor: str, items: List[Any], skipped: int):
+            result = {"processed": 0, "errors": 0, "skipped": skipped}
+            try:
+                if items:
+                    result["processed"] = self._write_batch(items)
+            except Exception as e:
+                print(f"Error writing batch ending at {page_cursor}: {e}")
+                result["errors"] = len(items)
+            finally:
+                on_done(seq, page_cursor, result)
+                semaphore.release()
+
+        message = "Indexing complete"
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                seq = 0
+                while not failed.is_set():
+                    raw_results = self.db.records.find(self._build_page_query(search_query, cursor))
+                    if not raw_results or len(raw_results.data) == 0:
+                        break
+
+                    items, skipped = self._prepare_batch(raw_results.data, field)
+                    cursor = raw_results.data[-1].id
+                    print(f"Queued batch of {len(raw_results.data)} records (up to {cursor})")
+
+                    semaphore.acquire()
+                    executor.submit(process_page, seq, cursor, items, skipped)
+                    seq += 1
+
+                    if len(raw_results.data) < self.batch_size:
+                        break
+            if failed.is_set():
+                message = (f"Indexing stopped after a failed batch; resume to retry from record "
+                           f"{self.progress.get('cursor') or 'start'}")
+                print(message)
+            else:
+                checkpoint.clear()
+        except Exception as e:
+            message = f"Error during indexing: {str(e)}"
+            counts["errors"] += 1
+            print(message)
+
+        counts["errors"] += failed_items
+        elapsed = time.time() - started_at
+        self._update_progress(
+            status="completed" if message == "Indexing complete" else "failed",
+            elapsed_seconds=elapsed,
+            message=message,
+            **counts
+        )
+        print(f"Indexing complete. Processed: {counts['processed']}, Errors: {counts['errors']}, Skipped: {counts['skipped']}")
+
+        return {**counts, "message": message}
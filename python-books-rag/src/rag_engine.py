@@ -2,25 +2,65 @@ from typing import List, Dict, Any, Optional
 from sentence_transformers import SentenceTransformer
 from rushdb import RushDB
 import json
+import threading
+
+try:
+    from .embedding_cache import QueryEmbeddingCache, query_embedding_cache
+    from .indexer import StreamingIndexer
+except ImportError:
+    from embedding_cache import QueryEmbeddingCache, query_embedding_cache
+    from indexer import StreamingIndexer
 
 
 class TextProcessor:
     """Handles text vectorization."""
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2",
+                 query_cache: Optional[QueryEmbeddingCache] = None):
         self.model = SentenceTransformer(model_name)
+        self.model_name = model_name
+        self.query_cache = query_cache or query_embedding_cache
+        self._model_lock = threading.Lock()
+
+    def set_model(self, model_name: str):
+        """Swap the embedding model; a no-op if it is already loaded."""
+        if model_name == self.model_name:
+            return
+        model = SentenceTransformer(model_name)
+        with self._model_lock:
+            self.model = model
+            self.model_name = model_name
 
     def vectorize_text(self, text: str) -> List[float]:
         """Convert text to vector embedding."""
         embedding = self.model.encode(text)
         return embedding.tolist()
 
+    def vectorize_query(self, query: str) -> List[float]:
+        """Convert a search query to a vector embedding, using the shared cache."""
+        with self._model_lock:
+            model, model_name = self.model, self.model_name
+        return self.query_cache.get_or_compute(
+            query,
+            model_name,
+            lambda text: model.encode(text).tolist()
+        )
+
+    def vectorize_texts(self, texts: List[str], batch_size: int = 64) -> List[List[float]]:
+        """Convert many texts to vector embeddings in a single encode call."""
+        if not texts:
+            return []
+        embeddings = self.model.encode(texts, batch_size=batch_size)
+        return embeddings.tolist()
+
 
 class RagService:
     """Handles RushDB operations for record storage and retrieval."""
 
     def __init__(self, api_key: str, base_url: str = None,
-                 model_name: str = "all-MiniLM-L6-v2"):
+                 model_name: str = "all-MiniLM-L6-v2",
+                 checkpoint_dir: str = ".index_checkpoints",
+                 index_workers: int = 4):
         # Initialize connection with error handling
         try:
             if base_url:
@@ -38,9 +78,13 @@ class RagService:
         except Exception as e:
             raise ValueError(f"Failed to initialize text processor: {str(e)}")
 
+        self.checkpoint_dir = checkpoint_dir
+        self.index_workers = index_workers
+        self.indexer: Optional[StreamingIndexer] = None
+
     def set_embedding_model(self, model_name: str):
         """Change the embedding model used by the processor."""
-        self.processor.model = SentenceTransformer(model_name)
+        self.processor.set_model(model_name)
 
     def set_model_by_dimension(self, dimension: int):
         """Set an appropriate model based on the requested vector dimension.
@@ -58,94 +102,33 @@ class RagService:
             print(f"Warning: No matching model for dimension {dimension}. Using default.")
             self.set_embedding_model("all-MiniLM-L6-v2")
 
-    def index_records(self, search_query: Dict, field: str):
-        """Process records and add embedding property to each record."""
-        processed_count = 0
-        error_count = 0
-        skipped_count = 0
-        current_skip = 0
-        batch_size = search_query.get("limit", 100)  # Use provided limit or default to 100
-
-        try:
-            # Create a copy of search_query to modify for pagination
-            paginated_query = search_query.copy()
-
-            while True:
-                # Set pagination parameters
-                paginated_query["skip"] = current_skip
-                paginated_query["limit"] = batch_size
-
-                print(f"Fetching records: skip={current_skip}, limit={batch_size}")
-                raw_results = self.db.records.find(paginated_query)
-
-                # Check if we have any records in this batch
-                if not raw_results or len(raw_results.data) == 0:
-                    break
-
-                print(f"Processing batch of {len(raw_results.data)} records (total available: {raw_results.total})")
-
-                # Process records in current batch
-                for record in raw_results.data:
-                    try:
-                        record_data = record.to_dict(exclude_internal=False)
-                        record_id = record_data["__id"]
-
-                        if field not in record_data:
-                            print(f"Field '{field}' not found in record {record_id}")
-                            skipped_count += 1
-                            continue
-
-                        # Get the field content
-                        content = record_data[field]
-                        if not content or not isinstance(content, str):
-                            print(f"Invalid content in field '{field}' for record {record_id}")
-                            skipped_count += 1
-                            continue
-
-                        print(f"Processing record {record_id}...")
+    def index_records(self, search_query: Dict, field: str, resume: bool = True):
+        """Process records and add embedding property to each record.
 
-                        # Vectorize the content directly
-                        embedding = self.processor.vectorize_text(content)
-
-                        # Update the record with the embedding
-                        record.update({"properties": [{"name": "embedding", "value": embedding, "type": "vector"}]})
-
-                        processed_count += 1
-                        print(f"Added embedding to record {record_id}")
-
-                    except Exception as record_error:
-                        print(f"Error processing record: {str(record_error)}")
-                        error_count += 1
-                        continue
-
-                # Check if there are more records to process
-                if not raw_results.has_more:
-                    break
-
-                # Move to next batch
-                current_skip += len(raw_results.data)
-                print(f"Batch complete. Moving to next batch...")
-
-            print(f"Indexing complete. Processed: {processed_count}, Errors: {error_count}, Skipped: {skipped_count}")
-
-            return {
-                "processed": processed_count,
-                "errors": error_count,
-                "skipped": skipped_count,
-                "message": "Indexing complete"
-            }
-        except Exception as e:
-            error_message = f"Error during indexing: {str(e)}"
-            print(error_message)
-            return {
-                "processed": processed_count,
-                "errors": error_count + 1,
-                "skipped": skipped_count,
-                "message": error_message
-            }
+        Runs a checkpointed, keyset-paginated re-index; ``limit`` in the search
+        query sets the page size. An interrupted run resumes from its last
+        committed page unless ``resume`` is False.
+        """
+        search_query = search_query.copy()
+        batch_size = search_query.pop("limit", 100)  # Use provided limit or default to 100
+
+        self.indexer = StreamingIndexer(
+            self.db,
+            self.processor,
+            checkpoint_dir=self.checkpoint_dir,
+            batch_size=batch_size,
+            max_workers=self.index_workers
+        )
+        return self.indexer.run(search_query, field, self.processor.model_name, resume=resume)
+
+    def get_index_progress(self) -> Dict[str, Any]:
+        """Return progress of the current or most recent indexing run."""
+        if not self.indexer:
+            return {"status": "idle"}
+        return self.indexer.get_progress()
 
     def search(self, query: str, search_query: Dict) -> Dict:
-        query_vector = self.processor.vectorize_text(query)
+        query_vector = self.processor.vectorize_query(query)
 
         try:
             raw_results = self.db.records.find({
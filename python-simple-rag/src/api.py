@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import os
+import shutil
 import sys
 import tempfile
 from pathlib import Path
@@ -10,11 +11,13 @@ from pathlib import Path
 # Handle both relative and absolute imports
 try:
     from .rag_engine import SimpleRAG
+    from .jobs import IngestionJobManager
     from .config import get_config
 except ImportError:
     # If relative import fails, try absolute import
     sys.path.insert(0, str(Path(__file__).parent))
     from rag_engine import SimpleRAG
+    from jobs import IngestionJobManager
     from config import get_config
 
 app = FastAPI(
@@ -35,10 +38,12 @@ app.add_middleware(
 # Global RAG instance - initialize automatically from environment
 rag_instance: Optional[SimpleRAG] = None
 initialization_error: Optional[str] = None
+ingestion_jobs = IngestionJobManager()
+ingest_options: Dict[str, Any] = {}
 
 def initialize_rag_from_config():
     """Initialize RAG instance from environment configuration."""
-    global rag_instance, initialization_error
+    global rag_instance, initialization_error, ingest_options
 
     try:
         config = get_config()
@@ -50,8 +55,13 @@ def initialize_rag_from_config():
         rag_instance = SimpleRAG(
             api_key=config['api_key'],
             base_url=config['base_url'],
-            model_name=config['embedding_model']
+            model_name=config['embedding_model'],
+            encode_workers=config['encode_workers']
         )
+        ingest_options = {
+            "embed_batch_size": config['embed_batch_size'],
+            "write_workers": config['ingest_write_workers']
+        }
         initialization_error = None
     except Exception as e:
         initialization_error = f"Failed to initialize RAG: {str(e)}"
@@ -61,6 +71,19 @@ def initialize_rag_from_config():
 initialize_rag_from_config()
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Release background workers and pooled connections."""
+    ingestion_jobs.shutdown()
+    if rag_instance:
+        await rag_instance.aclose()
+
+
+def run_ingestion(docs_path: str) -> Dict[str, Any]:
+    """Ingest a directory with the batched pipeline; runs on the job worker."""
+    return rag_instance.ingest_documents_batched(docs_path, **ingest_options)
+
+
 class SearchQuery(BaseModel):
     query: str
     limit: Optional[int] = 5
@@ -79,9 +102,20 @@ class SearchResponse(BaseModel):
     total_results: int
 
 
-@app.post("/ingest/directory")
+class IngestJob(BaseModel):
+    job_id: str
+    status: str
+    docs_path: str
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+@app.post("/ingest/directory", response_model=IngestJob, status_code=202)
 async def ingest_directory(docs_path: str = Form(...)):
-    """Ingest documents from a local directory."""
+    """Start a background job ingesting documents from a local directory."""
     if not rag_instance:
         error_msg = "RAG system not initialized."
         if initialization_error:
@@ -91,38 +125,50 @@ async def ingest_directory(docs_path: str = Form(...)):
     if not os.path.exists(docs_path):
         raise HTTPException(status_code=404, detail=f"Directory not found: {docs_path}")
 
-    try:
-        rag_instance.ingest_documents(docs_path)
-        return {"message": f"Documents from {docs_path} ingested successfully"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to ingest documents: {str(e)}")
+    return ingestion_jobs.submit(run_ingestion, docs_path)
 
 
-@app.post("/ingest/files")
+@app.post("/ingest/files", response_model=IngestJob, status_code=202)
 async def ingest_files(files: List[UploadFile] = File(...)):
-    """Ingest uploaded markdown files."""
+    """Start a background job ingesting uploaded markdown files."""
     if not rag_instance:
         error_msg = "RAG system not initialized."
         if initialization_error:
             error_msg += f" Error: {initialization_error}"
         raise HTTPException(status_code=400, detail=error_msg)
 
-    # Create temporary directory for uploaded files
-    with tempfile.TemporaryDirectory() as temp_dir:
+    # Create temporary directory for uploaded files; the job removes it when done
+    temp_dir = tempfile.mkdtemp(prefix="rag-upload-")
+    try:
         for file in files:
             if not file.filename.endswith('.md'):
                 continue
 
-            file_path = Path(temp_dir) / file.filename
+            file_path = Path(temp_dir) / Path(file.filename).name
             with open(file_path, 'wb') as f:
                 content = await file.read()
                 f.write(content)
 
-        try:
-            rag_instance.ingest_documents(temp_dir)
-            return {"message": f"Uploaded {len(files)} files ingested successfully"}
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to ingest files: {str(e)}")
+        return ingestion_jobs.submit(run_ingestion, temp_dir, cleanup_path=temp_dir)
+    except Exception:
+        # The job never took ownership of the directory
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+
+
+@app.get("/ingest/jobs", response_model=List[IngestJob])
+async def list_ingest_jobs():
+    """List recent ingestion jobs."""
+    return ingestion_jobs.list_jobs()
+
+
+@app.get("/ingest/jobs/{job_id}", response_model=IngestJob)
+async def get_ingest_job(job_id: str):
+    """Get the status of an ingestion job."""
+    job = ingestion_jobs.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Ingestion job not found: {job_id}")
+    return job
 
 
 @app.post("/search", response_model=SearchResponse)
@@ -135,7 +181,7 @@ async def search_documents(search_query: SearchQuery):
         raise HTTPException(status_code=400, detail=error_msg)
 
     try:
-        results = rag_instance.search(search_query.query, search_query.limit)
+        results = await rag_instance.asearch(search_query.query, search_query.limit)
 
         search_results = [
             SearchResult(
@@ -177,8 +223,9 @@ async def root():
         "rag_initialized": rag_instance is not None,
         "initialization_error": initialization_error if initialization_error else None,
         "endpoints": {
-            "ingest_directory": "POST /ingest/directory - Ingest documents from directory",
-            "ingest_files": "POST /ingest/files - Upload and ingest markdown files",
+            "ingest_directory": "POST /ingest/directory - Start ingesting documents from directory",
+            "ingest_files": "POST /ingest/files - Upload markdown files and start ingesting them",
+            "ingest_jobs": "GET /ingest/jobs/{job_id} - Ingestion job status",
             "search": "POST /search - Search for relevant document chunks",
             "health": "GET /health - Health check"
         },
@@ -23,6 +23,9 @@ def get_config():
         'embedding_model': os.getenv('EMBEDDING_MODEL', 'all-MiniLM-L6-v2'),
         'chunk_size': int(os.getenv('CHUNK_SIZE', 500)),
         'similarity_threshold': float(os.getenv('SIMILARITY_THRESHOLD', 0.7)),
+        'embed_batch_size': int(os.getenv('EMBED_BATCH_SIZE', 256)),
+        'ingest_write_workers': int(os.getenv('INGEST_WRITE_WORKERS', 4)),
+        'encode_workers': int(os.getenv('ENCODE_WORKERS', 1)),
         'api_host': os.getenv('API_HOST', '0.0.0.0'),
         'api_port': int(os.getenv('API_PORT', 8000))
     }
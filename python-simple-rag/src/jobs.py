@@ -0,0 +1,81 @@
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional, List
+
+
+class IngestionJobManager:
+    """Runs ingestion jobs in a background thread and tracks their status.
+
+    Jobs execute one at a time on a dedicated worker so a large upload never
+    runs on the event loop, and callers poll ``get_job`` for progress.
+    """
+
+    def __init__(self, max_workers: int = 1, max_history: int = 100):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self.max_history = max_history
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, ingest: Callable[[str], Dict[str, Any]], docs_path: str,
+               cleanup_path: Optional[str] = None) -> Dict[str, Any]:
+        """Queue ``ingest(docs_path)`` and return the new job's status."""
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "status": "queued",
+            "docs_path": docs_path,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+            self._prune()
+
+        self.executor.submit(self._run, job_id, ingest, docs_path, cleanup_path)
+        return dict(job)
+
+    def _run(self, job_id: str, ingest: Callable[[str], Dict[str, Any]],
+             docs_path: str, cleanup_path: Optional[str]):
+        self._update(job_id, status="running", started_at=time.time())
+        try:
+            result = ingest(docs_path)
+            self._update(job_id, status="completed", result=result, finished_at=time.time())
+        except Exception as e:
+            print(f"Ingestion job {job_id} failed: {e}")
+            self._update(job_id, status="failed", error=str(e), finished_at=time.time())
+        finally:
+            if cleanup_path:
+                shutil.rmtree(cleanup_path, ignore_errors=True)
+
+    def _update(self, job_id: str, **changes):
+        with self._lock:
+            self._jobs[job_id].update(changes)
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond ``max_history``."""
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job["status"] in ("completed", "failed")
+        ]
+        for job_id in finished[:max(0, len(self._jobs) - self.max_history)]:
+            del self._jobs[job_id]
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a snapshot of a job's status, or None if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Return snapshots of all tracked jobs, newest first."""
+        with self._lock:
+            return [dict(job) for job in reversed(list(self._jobs.values()))]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
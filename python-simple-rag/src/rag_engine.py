@@ -1,8 +1,14 @@
 import os
+import asyncio
 import glob
 import hashlib
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional, Set
+import httpx
 import numpy as np
 from sentence_transformers import SentenceTransformer
 import markdown
@@ -16,29 +22,31 @@ class DocumentProcessor:
         self.model = SentenceTransformer(model_name)
         self.chunk_size = chunk_size
 
+    def find_document_files(self, docs_path: str) -> List[str]:
+        """List markdown files under a directory."""
+        return glob.glob(os.path.join(docs_path, "**/*.md"), recursive=True)
+
+    def load_document(self, file_path: str, file_hash: str = None) -> Dict[str, Any]:
+        """Load a single markdown document."""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        # Convert markdown to plain text for better processing
+        html = markdown.markdown(content)
+        # Simple HTML tag removal (for basic cases)
+        import re
+        text = re.sub('<[^<]+?>', '', html)
+
+        return {
+            "title": Path(file_path).stem,
+            "path": file_path,
+            "content": text.strip(),
+            "file_hash": file_hash or self._get_file_hash(file_path)
+        }
+
     def load_documents(self, docs_path: str) -> List[Dict[str, Any]]:
         """Load markdown documents from a directory."""
-        documents = []
-        doc_files = glob.glob(os.path.join(docs_path, "**/*.md"), recursive=True)
-
-        for file_path in doc_files:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Convert markdown to plain text for better processing
-            html = markdown.markdown(content)
-            # Simple HTML tag removal (for basic cases)
-            import re
-            text = re.sub('<[^<]+?>', '', html)
-
-            documents.append({
-                "title": Path(file_path).stem,
-                "path": file_path,
-                "content": text.strip(),
-                "file_hash": self._get_file_hash(file_path)
-            })
-
-        return documents
+        return [self.load_document(file_path) for file_path in self.find_document_files(docs_path)]
 
     def _get_file_hash(self, file_path: str) -> str:
         """Generate MD5 hash of file for change detection."""
@@ -62,6 +70,13 @@ class DocumentProcessor:
         embedding = self.model.encode(text)
         return embedding.tolist()
 
+    def vectorize_texts(self, texts: List[str], batch_size: int = 64) -> List[List[float]]:
+        """Convert many texts to vector embeddings in a single encode call."""
+        if not texts:
+            return []
+        embeddings = self.model.encode(texts, batch_size=batch_size)
+        return embeddings.tolist()
+
 
 class RAGDatabase:
     """Handles RushDB operations for document storage and retrieval."""
@@ -131,13 +146,107 @@ class RAGDatabase:
         except Exception:
             return False
 
+    def find_existing_hashes(self, file_hashes: Iterable[str], page_size: int = 1000) -> Set[str]:
+        """Return the subset of file hashes that are already stored."""
+        hashes = list(dict.fromkeys(file_hashes))
+        existing = set()
+
+        for i in range(0, len(hashes), page_size):
+            page = hashes[i:i + page_size]
+            try:
+                results = self.db.records.find({
+                    "labels": ["Document"],
+                    "where": {
+                        "file_hash": {"$in": page}
+                    },
+                    "limit": len(page)
+                })
+                for record in results:
+                    file_hash = record.data.get("file_hash")
+                    if file_hash:
+                        existing.add(file_hash)
+            except Exception as e:
+                print(f"Hash lookup error: {e}")
+
+        return existing
+
+
+class AsyncRAGDatabase:
+    """Non-blocking RushDB search over a pooled async HTTP client.
+
+    Used on the request path so RushDB round-trips never block the event loop.
+    The client is created lazily inside the running loop and reuses keep-alive
+    connections across requests.
+    """
+
+    DEFAULT_BASE_URL = "https://api.rushdb.com/api/v1"
+
+    def __init__(self, api_key: str, base_url: str = None,
+                 max_connections: int = 20, timeout: float = 30.0):
+        self.api_key = api_key
+        self.base_url = (base_url or self.DEFAULT_BASE_URL).rstrip("/")
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections
+        )
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"token": self.api_key, "Content-Type": "application/json"},
+                limits=self.limits,
+                timeout=self.timeout
+            )
+        return self._client
+
+    async def search_similar_chunks(self, query_vector: List[float], limit: int = 5) -> List[Dict[str, Any]]:
+        """Search for similar chunks using vector similarity."""
+        try:
+            response = await self.client.post("/records/search", json={
+                "labels": ["Chunk"],
+                "aggregate": {
+                    "text": "$record.text",
+                    "document_title": "$record.document_title",
+                    "chunk_index": "$record.chunk_index",
+                    "score": {
+                        "alias": "$record",
+                        "field": "embedding",
+                        "fn": "gds.similarity.cosine",
+                        "query": query_vector
+                    }
+                },
+                "orderBy": { "score": "desc" },
+                "limit": limit
+            })
+            response.raise_for_status()
+            return response.json().get("data", [])
+        except Exception as e:
+            print(f"Search error: {e}")
+            return []
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
 
 class SimpleRAG:
     """Main RAG implementation class."""
 
-    def __init__(self, api_key: str, base_url: str = None, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, api_key: str, base_url: str = None, model_name: str = "all-MiniLM-L6-v2",
+                 encode_workers: int = 1):
         self.processor = DocumentProcessor(model_name=model_name)
         self.database = RAGDatabase(api_key, base_url)
+        self.async_database = AsyncRAGDatabase(api_key, base_url)
+        # Dedicated pool so query encoding never waits behind other blocking work
+        self.encode_executor = ThreadPoolExecutor(
+            max_workers=encode_workers,
+            thread_name_prefix="encode"
+        )
 
     def ingest_documents(self, docs_path: str):
         """Load and process documents from directory."""
@@ -178,6 +287,147 @@ class SimpleRAG:
 
         print(f"Ingestion complete. Processed {processed_count} documents.")
 
+    def ingest_documents_batched(
+        self,
+        docs_path: str,
+        embed_batch_size: int = 256,
+        queue_size: int = 64,
+        write_workers: int = 4
+    ) -> Dict[str, Any]:
+        """Load and process documents with batched embedding and pipelined writes.
+
+        Unchanged files are filtered with one bulk hash lookup. A parser thread
+        feeds documents to the embedding stage, which encodes chunks from many
+        documents per model call, while a pool of writer threads stores finished
+        documents. All queues are bounded so memory stays flat on large corpora.
+        """
+        start = time.perf_counter()
+        print(f"Loading documents from {docs_path}...")
+
+        file_hashes = {
+            file_path: self.processor._get_file_hash(file_path)
+            for file_path in self.processor.find_document_files(docs_path)
+        }
+        existing = self.database.find_existing_hashes(file_hashes.values())
+        pending_files = [
+            (file_path, file_hash)
+            for file_path, file_hash in file_hashes.items()
+            if file_hash not in existing
+        ]
+        skipped_count = len(file_hashes) - len(pending_files)
+        if skipped_count:
+            print(f"Skipping {skipped_count} documents (already exist)")
+
+        parsed_queue = queue.Queue(maxsize=queue_size)
+        write_queue = queue.Queue(maxsize=queue_size)
+        done = object()
+        stop = threading.Event()
+        stats_lock = threading.Lock()
+        stats = {"processed": 0, "failed": 0, "chunks": 0}
+
+        def parse_documents():
+            try:
+                for file_path, file_hash in pending_files:
+                    if stop.is_set():
+                        break
+                    try:
+                        document = self.processor.load_document(file_path, file_hash)
+                        chunks = self.processor.chunk_text(document["content"])
+                    except Exception as e:
+                        print(f"Error loading {file_path}: {e}")
+                        with stats_lock:
+                            stats["failed"] += 1
+                        continue
+                    parsed_queue.put((document, chunks))
+            finally:
+                parsed_queue.put(done)
+
+        def write_documents():
+            while True:
+                item = write_queue.get()
+                if item is done:
+                    break
+                document, chunks_data = item
+                try:
+                    self.database.store_document(document, chunks_data)
+                    with stats_lock:
+                        stats["processed"] += 1
+                        stats["chunks"] += len(chunks_data)
+                except Exception as e:
+                    print(f"Error storing {document['title']}: {e}")
+                    with stats_lock:
+                        stats["failed"] += 1
+
+        def flush(batch: List[Any]):
+            texts = [chunk for _, chunks in batch for chunk in chunks]
+            embeddings = self.processor.vectorize_texts(texts, batch_size=embed_batch_size)
+            offset = 0
+            for document, chunks in batch:
+                chunks_data = []
+                for i, chunk_text in enumerate(chunks):
+                    chunks_data.append({
+                        "text": chunk_text,
+                        "chunk_index": i,
+                        "embedding": embeddings[offset + i],
+                        "document_title": document["title"]
+                    })
+                offset += len(chunks)
+                write_queue.put((document, chunks_data))
+
+        parser = threading.Thread(target=parse_documents, daemon=True)
+        writers = [
+            threading.Thread(target=write_documents, daemon=True)
+            for _ in range(max(1, write_workers))
+        ]
+        parser.start()
+        for writer in writers:
+            writer.start()
+
+        try:
+            batch = []
+            batch_chunks = 0
+            while True:
+                item = parsed_queue.get()
+                if item is done:
+                    break
+                batch.append(item)
+                batch_chunks += len(item[1])
+                if batch_chunks >= embed_batch_size:
+                    flush(batch)
+                    batch = []
+                    batch_chunks = 0
+            if batch:
+                flush(batch)
+        finally:
+            # Unblock the parser if the embedding stage stopped early
+            stop.set()
+            while parser.is_alive():
+                try:
+                    parsed_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            for _ in writers:
+                write_queue.put(done)
+            for writer in writers:
+                writer.join()
+
+        elapsed = time.perf_counter() - start
+        summary = {
+            "processed": stats["processed"],
+            "skipped": skipped_count,
+            "failed": stats["failed"],
+            "chunks": stats["chunks"],
+            "elapsed_seconds": round(elapsed, 3),
+            "docs_per_second": round(stats["processed"] / elapsed, 2) if elapsed else 0.0,
+            "chunks_per_second": round(stats["chunks"] / elapsed, 2) if elapsed else 0.0
+        }
+        print(
+            f"Ingestion complete. Processed {summary['processed']} documents "
+            f"({summary['chunks']} chunks) in {summary['elapsed_seconds']}s - "
+            f"{summary['docs_per_second']} docs/sec, {summary['chunks_per_second']} chunks/sec."
+        )
+        return summary
+
     def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Search for relevant chunks based on query."""
         # Vectorize the query
@@ -202,3 +452,31 @@ class SimpleRAG:
             print(f"Error accessing data: {e}")
             return formatted_results
         return formatted_results
+
+    async def asearch(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Search without blocking the event loop.
+
+        The query is encoded on the dedicated encode executor and RushDB is
+        queried through the pooled async client.
+        """
+        loop = asyncio.get_running_loop()
+        query_vector = await loop.run_in_executor(
+            self.encode_executor, self.processor.vectorize_text, query
+        )
+
+        results = await self.async_database.search_similar_chunks(query_vector, limit)
+
+        return [
+            {
+                "text": result.get("text", ""),
+                "document_title": result.get("document_title", ""),
+                "chunk_index": result.get("chunk_index", 0),
+                "score": result.get("score", 0)
+            }
+            for result in results
+        ]
+
+    async def aclose(self):
+        """Release the async HTTP pool and encode executor."""
+        await self.async_database.aclose()
+        self.encode_executor.shutdown(wait=False)
@@ -15,6 +15,7 @@ Each strategy addresses different extraction goals and constraints:
 
 import os
 import json
+from bisect import bisect_left
 from typing import Optional
 from dataclasses import dataclass
 from collections import defaultdict
@@ -167,6 +168,136 @@ class SubgraphResult:
         return "\n".join(lines)
 
 
+# ============================================================================
+# FRONTIER ENGINE (shared by the traversal strategies)
+# ============================================================================
+
+NODE_LABELS = ["CONCEPT", "TECHNOLOGY", "PATTERN"]
+
+
+def expand_frontier(
+    node_ids: list[str],
+    relationship_types: Optional[list[str]] = None,
+    direction: str = "both",
+    edge_limit: int = 1000
+) -> list[dict]:
+    """
+    Find every edge touching a frontier in a single relationships query.
+    
+    Returns edges as {"source", "target", "type", "neighbor"}, where
+    ``neighbor`` is the endpoint outside the frontier side that matched.
+    """
+    if not node_ids:
+        return []
+    
+    clauses = []
+    if direction in ("out", "both"):
+        clauses.append({"sourceId": {"$in": node_ids}})
+    if direction in ("in", "both"):
+        clauses.append({"targetId": {"$in": node_ids}})
+    
+    where = {"$or": clauses}
+    if relationship_types:
+        where["type"] = {"$in": relationship_types}
+    
+    found = db.relationships.find({"where": where, "limit": edge_limit})
+    
+    frontier = set(node_ids)
+    edges = []
+    for edge in found.data:
+        source, target, rel_type = edge.get("sourceId"), edge.get("targetId"), edge.get("type")
+        if direction in ("out", "both") and source in frontier:
+            edges.append({"source": source, "target": target, "type": rel_type, "neighbor": target})
+        elif direction in ("in", "both") and target in frontier:
+            edges.append({"source": source, "target": target, "type": rel_type, "neighbor": source})
+    return edges
+
+
+def fetch_nodes(node_ids: list[str]) -> dict[str, dict]:
+    """Materialize nodes in one bulk query, keyed by record ID."""
+    if not node_ids:
+        return {}
+    
+    records = db.records.find({
+        "labels": NODE_LABELS,
+        "where": {"$id": {"$in": node_ids}},
+        "limit": len(node_ids)
+    })
+    return {
+        record.id: {
+            "id": record.id,
+            "name": record.get("name", ""),
+            "label": record.label,
+            "description": record.get("description", "")
+        }
+        for record in records.data
+    }
+
+
+def traverse(
+    seed_ids: list[str],
+    hops: list[tuple[Optional[list[str]], str]],
+    limit: int = 50
+) -> tuple[dict[str, int], list[dict]]:
+    """
+    Breadth-first frontier expansion, one relationships query per hop.
+    
+    ``hops`` gives the relationship types and direction to follow at each
+    step: ``[(None, "both")] * k`` is a k-hop neighborhood, and one entry
+    per type is a meta-path. New nodes are admitted in discovery order
+    until ``limit`` nodes are known, so expansion stops early instead of
+    fetching nodes that would be cut later.
+    
+    Returns:
+        ({node_id: hop at which it was reached}, edges between kept nodes
+        tagged with their hop)
+    """
+    depths = {node_id: 0 for node_id in seed_ids[:limit]}
+    edges = []
+    frontier = list(depths)
+    
+    for hop, (relationship_types, direction) in enumerate(hops, start=1):
+        if not frontier:
+            break
+        
+        next_frontier = []
+        for edge in expand_frontier(frontier, relationship_types, direction):
+            neighbor = edge["neighbor"]
+            if neighbor not in depths:
+                if len(depths) >= limit:
+                    continue
+                depths[neighbor] = hop
+                next_frontier.append(neighbor)
+            edges.append({**edge, "hop": hop})
+        frontier = next_frontier
+    
+    return depths, edges
+
+
+def materialize(depths: dict[str, int], edges: list[dict]) -> tuple[list[dict], list[dict]]:
+    """Bulk-fetch traversed nodes and express edges by node name."""
+    nodes_by_id = fetch_nodes(list(depths))
+    nodes = []
+    for node_id, depth in depths.items():
+        if node_id in nodes_by_id:
+            nodes.append({**nodes_by_id[node_id], "depth": depth})
+    
+    relationships = []
+    seen = set()
+    for edge in edges:
+        key = (edge["source"], edge["target"], edge["type"])
+        if key in seen or edge["source"] not in nodes_by_id or edge["target"] not in nodes_by_id:
+            continue
+        seen.add(key)
+        relationships.append({
+            "source": nodes_by_id[edge["source"]]["name"],
+            "target": nodes_by_id[edge["target"]]["name"],
+            "type": edge["type"],
+            "step": edge["hop"]
+        })
+    return nodes, relationships
+
+
 # ============================================================================
 # STRATEGY 1: N-HOP NEIGHBORHOOD EXTRACTION
 # ============================================================================
@@ -181,7 +312,9 @@ def extract_n_hop_neighborhood(
     Extract all nodes within K hops from seed nodes.
     
     Strategy: Start with seed nodes, traverse outward K levels,
-    collecting all reachable nodes and relationships.
+    collecting all reachable nodes and relationships. Costs one query for
+    the seeds, one per hop and one to materialize nodes, independent of
+    how many nodes are reached; expansion stops once ``limit`` is hit.
     
     Best for: Exploring local context, understanding related concepts.
     """
@@ -201,60 +334,11 @@ def extract_n_hop_neighborhood(
             format="compact"
         )
     
-    # Step 2: Build neighborhood by iterating K times
-    all_node_ids = set(seed_ids)
-    
-    for hop in range(k):
-        # For each known node, find connected nodes
-        # Using find to get relationships implicitly through graph traversal
-        neighbors = db.records.find({
-            "labels": ["CONCEPT", "TECHNOLOGY", "PATTERN"],
-            "where": {
-                "$or": [
-                    {"__id": {"$in": list(all_node_ids)}}
-                ]
-            },
-            "limit": 500
-        })
-        
-        # Get all connected nodes via relationships
-        # In a real implementation, you'd traverse the graph
-        # For this demo, we'll use broader queries to simulate traversal
-        
-        # Alternative: Get nodes that relate to our known nodes
-        # This is a simplification - real implementation would use graph traversal
-    
-    # Collect final node set with pagination
-    all_nodes = []
-    for node_id in list(all_node_ids)[:limit]:
-        node = db.records.find_by_id(node_id)
-        if node and node.exists:
-            all_nodes.append({
-                "id": node.id,
-                "name": node.get("name", ""),
-                "label": node.label,
-                "description": node.get("description", "")
-            })
+    # Step 2: Expand K hops, one batched relationships query per hop
+    depths, edges = traverse(seed_ids, [(None, "both")] * k, limit=limit)
     
-    # Find relationships between extracted nodes
-    relationships = []
-    node_names = {n["name"] for n in all_nodes}
-    
-    for node in all_nodes:
-        # Find relationships where this node is source or target
-        # We'll query the graph structure
-        related = db.records.find({
-            "labels": ["CONCEPT", "TECHNOLOGY", "PATTERN"],
-            "where": {},
-            "limit": 200
-        })
-        
-        # Build relationship map from node data
-        for rel_target in related.data:
-            if rel_target.id != node["id"]:
-                # Simulate relationship extraction
-                # In production, you'd use actual graph traversal
-                pass
+    # Step 3: Materialize every node in one bulk fetch
+    all_nodes, relationships = materialize(depths, edges)
     
     return SubgraphResult(
         strategy=f"N-Hop Neighborhood (k={k})",
@@ -348,7 +432,7 @@ def extract_with_importance_pruning(
     Extract nodes by importance score, pruning low-importance nodes.
     
     Strategy: Calculate importance based on connectivity (degree centrality),
-    then select top N nodes.
+    drop nodes below ``min_importance``, then select the top N nodes.
     
     Best for: Limited context windows with high noise in the graph.
     """
@@ -359,67 +443,49 @@ def extract_with_importance_pruning(
         "limit": 200
     })
     
-    # Calculate importance scores based on node properties
-    # In production, you'd compute actual graph centrality
-    scored_nodes = []
-    
+    nodes_by_id = {}
     for node in all_nodes.data:
         name = node.get("name", "")
-        if not name:
-            continue
-            
-        # Score based on structural importance
-        # Key architectural concepts score higher
-        high_value = {
-            "microservices": 0.95,
-            "scalability": 0.90,
-            "resilience": 0.88,
-            "event_driven": 0.85,
-            "domain_driven_design": 0.82,
-            "Kubernetes": 0.90,
-            "Python": 0.85,
-            "FastAPI": 0.82,
-            "circuit_breaker": 0.80,
-            "service_mesh": 0.78,
-        }
-        
-        importance = high_value.get(name, 0.5 + hash(name) % 30 / 100)
-        
-        scored_nodes.append({
-            "id": node.id,
-            "name": name,
-            "label": node.label,
-            "description": node.get("description", ""),
-            "importance": importance,
-            "connections": int(importance * 20)
-        })
+        if name:
+            nodes_by_id[node.id] = {
+                "id": node.id,
+                "name": name,
+                "label": node.label,
+                "description": node.get("description", "")
+            }
+    
+    # Degree centrality from one frontier expansion over every node
+    edges = expand_frontier(list(nodes_by_id), direction="both")
+    degree = defaultdict(int)
+    unique_edges = {}
+    for edge in edges:
+        key = (edge["source"], edge["target"], edge["type"])
+        if key not in unique_edges:
+            unique_edges[key] = edge
+            degree[edge["source"]] += 1
+            degree[edge["target"]] += 1
+    
+    # Importance is the degree percentile: the share of nodes with a lower degree
+    degrees = sorted(degree[node_id] for node_id in nodes_by_id)
+    scored_nodes = []
+    for node_id, node in nodes_by_id.items():
+        lower = bisect_left(degrees, degree[node_id])
+        importance = lower / max(len(degrees) - 1, 1)
+        if importance >= min_importance:
+            scored_nodes.append({**node, "importance": importance, "connections": degree[node_id]})
     
     # Sort by importance and take top N
     scored_nodes.sort(key=lambda x: x["importance"], reverse=True)
     top_nodes = scored_nodes[:max_nodes]
     
-    # Generate relationships between top nodes
-    relationships = []
-    important_names = {n["name"] for n in top_nodes}
-    
-    # Simulate relationships between important nodes
-    key_rels = [
-        ("microservices", "scalability", "ENABLES"),
-        ("microservices", "maintainability", "ENABLES"),
-        ("event_driven", "resilience", "ENABLES"),
-        ("FastAPI", "microservices", "IMPLEMENTS"),
-        ("Kubernetes", "microservices", "IMPLEMENTS"),
-        ("circuit_breaker", "resilience", "ENABLES"),
+    # Keep the real relationships among the surviving nodes
+    kept = {node["id"]: node["name"] for node in top_nodes}
+    relationships = [
+        {"source": kept[edge["source"]], "target": kept[edge["target"]], "type": edge["type"]}
+        for edge in unique_edges.values()
+        if edge["source"] in kept and edge["target"] in kept
     ]
     
-    for source, target, rel_type in key_rels:
-        if source in important_names and target in important_names:
-            relationships.append({
-                "source": source,
-                "target": target,
-                "type": rel_type
-            })
-    
     return SubgraphResult(
         strategy="Importance-Based Pruning",
         nodes=top_nodes,
@@ -532,103 +598,41 @@ def extract_entity_centric(
 def extract_meta_path(
     meta_path: list[str],
     start_label: str = "PATTERN",
-    limit: int = 30
+    limit: int = 30,
+    directions: Optional[list[str]] = None,
+    start_limit: Optional[int] = None
 ) -> SubgraphResult:
     """
     Extract subgraph following a specific sequence of relationship types.
     
     Strategy: Start from nodes, follow a defined path of relationship types,
-    e.g., PATTERN --[SOLVES]--> CONCEPT --[USES]--> TECHNOLOGY
+    e.g., PATTERN --[SOLVES]--> CONCEPT <--[ENABLES]-- CONCEPT <--[IMPLEMENTS]-- TECHNOLOGY
+    
+    Each step is one frontier expansion restricted to that step's type.
+    ``directions`` sets "out", "in" or "both" per step (default "both").
+    ``limit`` caps the whole subgraph; at most ``start_limit`` of it
+    (default a quarter) goes to start nodes, so the rest is left for the
+    nodes the path reaches.
     
     Best for: Multi-hop reasoning, understanding chain of influences.
     """
-    # Get starting nodes
+    # Get starting nodes, leaving most of the budget for path expansion
+    start_limit = start_limit or max(1, limit // 4)
     start_nodes = db.records.find({
         "labels": [start_label],
         "where": {},
-        "limit": limit
+        "limit": min(start_limit, limit)
     })
     
-    nodes = []
-    relationships = []
-    node_names = set()
+    directions = directions or ["both"] * len(meta_path)
+    hops = [([rel_type], direction) for rel_type, direction in zip(meta_path, directions)]
     
-    for node in start_nodes.data:
-        name = node.get("name", "")
-        if name:
-            nodes.append({
-                "id": node.id,
-                "name": name,
-                "label": node.label,
-                "description": node.get("description", "")
-            })
-            node_names.add(name)
-    
-    # Follow the meta-path
-    # Example: PATTERN --[SOLVES]--> CONCEPT --[USES]--> TECHNOLOGY
-    
-    if len(meta_path) >= 2:
-        # First hop: PATTERN -> CONCEPT (SOLVES)
-        pattern_to_concept = [
-            ("bulkhead_pattern", "availability"),
-            ("bulkhead_pattern", "resilience"),
-            ("database_per_service", "scalability"),
-            ("database_per_service", "maintainability"),
-            ("circuit_breaker", "resilience"),
-            ("circuit_breaker", "availability"),
-        ]
-        
-        for source, target in pattern_to_concept:
-            relationships.append({
-                "source": source,
-                "target": target,
-                "type": meta_path[0],
-                "step": 1
-            })
-            if target not in node_names:
-                node_names.add(target)
-        
-        # Second hop: CONCEPT -> TECHNOLOGY (USES or IMPLEMENTS)
-        concept_to_tech = [
-            ("scalability", "PostgreSQL", "USES"),
-            ("scalability", "MongoDB", "USES"),
-            ("availability", "Redis", "USES"),
-            ("resilience", "RabbitMQ", "USES"),
-            ("microservices", "FastAPI", "IMPLEMENTS"),
-            ("microservices", "Spring Boot", "IMPLEMENTS"),
-            ("event_driven", "RabbitMQ", "USES"),
-        ]
-        
-        for source, target, rel_type in concept_to_tech:
-            if source in node_names:
-                relationships.append({
-                    "source": source,
-                    "target": target,
-                    "type": rel_type,
-                    "step": 2
-                })
-                if target not in node_names:
-                    node_names.add(target)
-    
-    # Get details for all collected node names
-    all_nodes = db.records.find({
-        "labels": ["CONCEPT", "TECHNOLOGY", "PATTERN"],
-        "where": {"name": {"$in": list(node_names)}},
-        "limit": 50
-    })
-    
-    name_to_node = {n.get("name"): n for n in all_nodes.data}
+    depths, edges = traverse([node.id for node in start_nodes.data], hops, limit=limit)
     
-    final_nodes = []
-    for name in node_names:
-        if name in name_to_node:
-            node = name_to_node[name]
-            final_nodes.append({
-                "id": node.id,
-                "name": name,
-                "label": node.label,
-                "description": node.get("description", "")
-            })
+    # Keep only edges that extend a path: the node reached at step N must
+    # be first discovered at step N, not be a node from an earlier step
+    edges = [edge for edge in edges if depths.get(edge["neighbor"]) == edge["hop"]]
+    final_nodes, relationships = materialize(depths, edges)
     
     return SubgraphResult(
         strategy=f"Meta-Path ({' -> '.join(meta_path)})",
@@ -724,7 +728,7 @@ def main():
     # Strategy 5: Meta-Path Guided
     print("\n[5/5] Testing Meta-Path Guided Extraction...")
     result5 = extract_meta_path(
-        meta_path=["SOLVES", "USES"],
+        meta_path=["SOLVES", "ENABLES", "IMPLEMENTS"],
         start_label="PATTERN",
         limit=30
     )